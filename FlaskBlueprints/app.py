@@ -1,22 +1,71 @@
-from flask import Flask
+from flask import Flask, jsonify
 from backend.blueprints.autor_blueprint import autor_blueprint
 from backend.blueprints.libro_blueprint import libro_blueprint
-from dotenv import load_dotenv
-import os
+from backend.config import Config
+from backend.models.migrations import migrate
+from backend.models.postgresql_connection_pool import PostgreSQLConnectionPool
+import threading
+import time
 
-# Cargar variables de entorno
-load_dotenv()
+_migrated = threading.Event()
+_migrate_lock = threading.Lock()
+_failed_at = None
 
-app = Flask(__name__)
+def warm_up():
+    """
+    Abre el pool y aplica las migraciones pendientes. Devuelve False si la
+    base no respondió, si otro hilo ya lo está intentando o si el último
+    intento falló hace menos de INIT_RETRY_SECONDS, sin hacer esperar a
+    la solicitud.
+    """
+    global _failed_at
+    if _migrated.is_set():
+        return True
+    if _failed_at is not None and time.monotonic() - _failed_at < Config.INIT_RETRY_SECONDS:
+        return False
+    if not _migrate_lock.acquire(blocking=False):
+        return False
+    try:
+        if not _migrated.is_set():
+            try:
+                migrate()
+            except Exception as e:
+                print(f"Error al migrar la base: {e}")
+                _failed_at = time.monotonic()
+                return False
+            _failed_at = None
+            _migrated.set()
+        return True
+    finally:
+        _migrate_lock.release()
 
-# Registrar blueprints
-app.register_blueprint(autor_blueprint)
-app.register_blueprint(libro_blueprint)
+def create_app(config=Config):
+    # No toca la base: el pool se conecta en la primera solicitud o en warm_up()
+    app = Flask(__name__)
+    app.config.from_object(config)
+    PostgreSQLConnectionPool.get_instance().configure(config)
 
-# Ruta de prueba
-@app.route('/')
-def index():
-    return {"message": "API de gestión de libros y autores"}
+    # Registrar blueprints
+    app.register_blueprint(autor_blueprint)
+    app.register_blueprint(libro_blueprint)
+
+    @app.before_request
+    def ensure_schema():
+        if not _migrated.is_set() and not warm_up():
+            response = jsonify({"message": "Base de datos no disponible"})
+            response.headers['Retry-After'] = '5'
+            return response, 503
+
+    # Ruta de prueba
+    @app.route('/')
+    def index():
+        return {"message": "API de gestión de libros y autores"}
+
+    return app
+
+app = create_app()
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    if Config.WARM_UP:
+        warm_up()
+    app.run(debug=True)
@@ -0,0 +1,20 @@
+import os
+from dotenv import load_dotenv
+
+# Único lugar donde se lee el .env
+load_dotenv()
+
+class Config:
+    """
+    Configuración leída del entorno una sola vez; create_app la carga en
+    app.config y se la pasa al pool
+    """
+    DATABASE_URL = os.getenv("DATABASE_URL")
+    POOL_MIN = int(os.getenv("POOL_MIN", "1"))
+    POOL_MAX = int(os.getenv("POOL_MAX", "10"))
+    # Segundos máximos para abrir una conexión, así un worker no se cuelga si la base no responde
+    DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "3"))
+    # Con true app.py crea el pool y migra antes de aceptar solicitudes
+    WARM_UP = os.getenv("WARM_UP", "true").lower() in ("1", "true", "yes")
+    # Tras un intento fallido de migrar, las solicitudes responden 503 sin reintentar durante este tiempo
+    INIT_RETRY_SECONDS = float(os.getenv("INIT_RETRY_SECONDS", "5"))
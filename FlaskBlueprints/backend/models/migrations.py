@@ -0,0 +1,56 @@
+import os
+import sys
+
+# El ejecutor de migraciones vive en db_comun, en la raíz del repositorio
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+
+from db_comun import run_migrations
+from backend.models.postgresql_connection_pool import PostgreSQLConnectionPool
+
+# Clave del advisory lock que serializa las migraciones entre procesos
+MIGRATION_LOCK = 4031202
+# Versiones aplicadas de esta aplicación, separadas de las de lab03 si comparten la base
+MIGRATION_TABLE = "schema_migrations_blueprints"
+
+MIGRATIONS = [
+    (1, "esquema inicial", [
+        """
+        CREATE TABLE IF NOT EXISTS autores (
+            id SERIAL PRIMARY KEY,
+            nombre VARCHAR(100) NOT NULL,
+            apellido VARCHAR(100) NOT NULL,
+            fecha_nacimiento DATE,
+            nacionalidad VARCHAR(100),
+            biografia TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS libros (
+            id SERIAL PRIMARY KEY,
+            titulo VARCHAR(200) NOT NULL,
+            autor_id INTEGER REFERENCES autores(id),
+            anio_publicacion INTEGER,
+            genero VARCHAR(100),
+            isbn VARCHAR(20) UNIQUE,
+            descripcion TEXT,
+            num_paginas INTEGER
+        )
+        """,
+    ]),
+    # Borrar un autor verifica la FK recorriendo libros por autor_id
+    (2, "indice de libros por autor", [
+        "CREATE INDEX IF NOT EXISTS idx_libros_autor_id ON libros (autor_id)",
+    ]),
+]
+
+def migrate():
+    """
+    Aplica una sola vez, en orden, las migraciones que falten y devuelve
+    cuántas aplicó. Con la base al día solo consulta la versión.
+    """
+    connection_pool = PostgreSQLConnectionPool.get_instance()
+    connection = connection_pool.get_connection()
+    try:
+        return run_migrations(connection, MIGRATIONS, MIGRATION_LOCK, MIGRATION_TABLE)
+    finally:
+        connection_pool.release_connection(connection)
@@ -4,25 +4,6 @@ import json
 class AutorModel:
     def __init__(self):
         self.connection_pool = PostgreSQLConnectionPool.get_instance()
-        self.__create_table()
-
-    def __create_table(self):
-        query = """
-        CREATE TABLE IF NOT EXISTS autores (
-            id SERIAL PRIMARY KEY,
-            nombre VARCHAR(100) NOT NULL,
-            apellido VARCHAR(100) NOT NULL,
-            fecha_nacimiento DATE,
-            nacionalidad VARCHAR(100),
-            biografia TEXT
-        )
-        """
-        connection = self.connection_pool.get_connection()
-        cursor = connection.cursor()
-        cursor.execute(query)
-        connection.commit()
-        cursor.close()
-        self.connection_pool.release_connection(connection)
 
     def get_all_autores(self):
         query = "SELECT * FROM autores"
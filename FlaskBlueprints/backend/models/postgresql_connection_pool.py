@@ -1,11 +1,14 @@
 import psycopg2
 from psycopg2 import pool
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
+import threading
+from backend.config import Config
 
 class PostgreSQLConnectionPool:
+    """
+    Pool de conexiones que no se conecta hasta el primer get_connection. Si
+    la base no está disponible get_connection lanza la excepción de psycopg2
+    y la siguiente llamada vuelve a intentarlo.
+    """
     __instance = None
     __connection_pool = None
 
@@ -20,29 +23,44 @@ class PostgreSQLConnectionPool:
             raise Exception("Esta clase es un Singleton!")
         else:
             PostgreSQLConnectionPool.__instance = self
-            self.__connection_pool = self.__create_connection_pool()
+            self.__lock = threading.Lock()
+            self.configure(Config)
+
+    def configure(self, config):
+        """
+        Toma la URL y los límites de config; se aplica al abrir el pool
+        """
+        self.dsn = config.DATABASE_URL
+        self.minconn = config.POOL_MIN
+        self.maxconn = config.POOL_MAX
+        self.connect_timeout = config.DB_CONNECT_TIMEOUT
 
     def __create_connection_pool(self):
         try:
-            # Usar URL de conexión
-            db_url = os.getenv("DATABASE_URL")
-            
             # Crear un pool de conexiones
-            connection_pool = pool.ThreadedConnectionPool(
-                minconn=1,
-                maxconn=10,
-                dsn=db_url
+            return pool.ThreadedConnectionPool(
+                minconn=self.minconn,
+                maxconn=self.maxconn,
+                dsn=self.dsn,
+                connect_timeout=self.connect_timeout
             )
-            return connection_pool
         except Exception as e:
             print(f"Error al crear el pool de conexiones: {e}")
-            return None
+            raise
+
+    def __get_pool(self):
+        if self.__connection_pool is None:
+            with self.__lock:
+                if self.__connection_pool is None:
+                    self.__connection_pool = self.__create_connection_pool()
+        return self.__connection_pool
 
     def get_connection(self):
-        return self.__connection_pool.getconn()
+        return self.__get_pool().getconn()
 
     def release_connection(self, connection):
         self.__connection_pool.putconn(connection)
 
     def close_all_connections(self):
-        self.__connection_pool.closeall()
\ No newline at end of file
+        if self.__connection_pool is not None:
+            self.__connection_pool.closeall()
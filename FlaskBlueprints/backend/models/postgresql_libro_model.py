@@ -4,27 +4,6 @@ import json
 class LibroModel:
     def __init__(self):
         self.connection_pool = PostgreSQLConnectionPool.get_instance()
-        self.__create_table()
-
-    def __create_table(self):
-        query = """
-        CREATE TABLE IF NOT EXISTS libros (
-            id SERIAL PRIMARY KEY,
-            titulo VARCHAR(200) NOT NULL,
-            autor_id INTEGER REFERENCES autores(id),
-            anio_publicacion INTEGER,
-            genero VARCHAR(100),
-            isbn VARCHAR(20) UNIQUE,
-            descripcion TEXT,
-            num_paginas INTEGER
-        )
-        """
-        connection = self.connection_pool.get_connection()
-        cursor = connection.cursor()
-        cursor.execute(query)
-        connection.commit()
-        cursor.close()
-        self.connection_pool.release_connection(connection)
 
     def get_all_libros(self):
         query = """
@@ -1,14 +1,20 @@
 from flask import Flask, request, jsonify
-import jwt
-import datetime
-import uuid
+import os
+import sys
+
+# Paquete de autenticación compartido en la raíz del repositorio
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from auth_comun import KeyRing, emitir_token
 
 app = Flask(__name__)
 
 # En una aplicación real, almacenar estos datos de forma segura
 CLIENT_ID = "test_client"
 CLIENT_SECRET = "test_secret"
-JWT_SECRET = "mi_clave_super_secreta"
+
+# Claves de firma cargadas una sola vez (JWT_KEYS_DIR para RS256/EdDSA, si no HS256)
+keyring = KeyRing.from_env()
 
 @app.route('/token', methods=['POST'])
 def token():
@@ -19,14 +25,8 @@ def token():
         return jsonify({"error": "cliente_invalido"}), 401
     
     # Crear token JWT
-    expiration = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
-    payload = {
-        "sub": CLIENT_ID,
-        "exp": expiration,
-        "jti": str(uuid.uuid4())
-    }
-    
-    token = jwt.encode(payload, JWT_SECRET, algorithm="HS256")
+    token = emitir_token(keyring, CLIENT_ID, 3600,
+                         issuer=os.getenv("JWT_ISSUER"), audience=os.getenv("JWT_AUDIENCE"))
     
     return jsonify({
         "token_acceso": token,
@@ -34,5 +34,9 @@ def token():
         "expira_en": 3600
     })
 
+@app.route('/jwks', methods=['GET'])
+def jwks():
+    return jsonify(keyring.to_jwks())
+
 if __name__ == '__main__':
     app.run(port=5000, debug=True)
\ No newline at end of file
@@ -1,85 +1,149 @@
 from flask import Flask, request, jsonify
-from functools import wraps
-import jwt
-import psycopg2
+from psycopg2 import extensions, pool
 from psycopg2.extras import RealDictCursor
+from contextlib import contextmanager
 import os
+import sys
+import threading
+
+# Paquete de autenticación compartido en la raíz del repositorio
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from auth_comun import KeyRing, TokenCache, TokenRequired
 
 app = Flask(__name__)
 
-# URL de la base de datos (configurar en el entorno o reemplazar directamente)
-DATABASE_URL = "XDDDDDDDDDDDDDDDDDDDDDDDDDDDDDDDDDDDDDDDDDD"
+# URL de la base de datos (configurar en el entorno)
+DATABASE_URL = os.getenv("DATABASE_URL")
+POOL_MIN = int(os.getenv("POOL_MIN", "1"))
+POOL_MAX = int(os.getenv("POOL_MAX", "10"))
+
+# Paginación de GET /api/productos
+LIMITE_POR_DEFECTO = 50
+LIMITE_MAXIMO = 200
+
+# Claves públicas del servidor de autenticación (JWKS_FILE); sin JWKS se usa
+# la misma clave secreta HS256 que el servidor de autenticación
+keyring = KeyRing.from_env()
+token_cache = TokenCache()
+
+# Sentencias preparadas en el servidor; cada conexión las prepara la primera vez que las usa
+SENTENCIAS = {
+    "productos_listar": "SELECT * FROM productos WHERE id > $1 ORDER BY id LIMIT $2",
+    "productos_obtener": "SELECT * FROM productos WHERE id = $1",
+    "productos_crear": "INSERT INTO productos (nombre, descripcion) VALUES ($1, $2) RETURNING *",
+    "productos_actualizar": (
+        "UPDATE productos SET nombre = COALESCE($1, nombre), "
+        "descripcion = COALESCE($2, descripcion) WHERE id = $3 RETURNING *"
+    ),
+    "productos_eliminar": "DELETE FROM productos WHERE id = $1 RETURNING id"
+}
+
+class ConexionPreparada(extensions.connection):
+    """
+    Conexión en autocommit que recuerda qué sentencias ya preparó. Una
+    conexión nueva (p. ej. tras reconectar) empieza sin ninguna.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.autocommit = True
+        self.preparadas = set()
+
+    def ejecutar(self, cur, nombre, params=()):
+        if nombre not in self.preparadas:
+            cur.execute(f"PREPARE {nombre} AS {SENTENCIAS[nombre]}")
+            self.preparadas.add(nombre)
+        if params:
+            cur.execute(f"EXECUTE {nombre} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cur.execute(f"EXECUTE {nombre}")
+
+_pool = None
+_pool_lock = threading.Lock()
 
-# La misma clave secreta que el servidor de autenticación
-JWT_SECRET = "mi_clave_super_secreta"
+def obtener_pool():
+    # Dos hilos en la primera solicitud no deben crear dos pools
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = pool.ThreadedConnectionPool(
+                    POOL_MIN, POOL_MAX, DATABASE_URL, connection_factory=ConexionPreparada
+                )
+    return _pool
 
-# Conexión a la base de datos
-def obtener_conexion_db():
-    conn = psycopg2.connect(DATABASE_URL)
-    conn.autocommit = True
-    return conn
+# Conexión a la base de datos, prestada por el pool y devuelta al salir del bloque
+@contextmanager
+def conexion_db():
+    pool_db = obtener_pool()
+    conn = pool_db.getconn()
+    try:
+        yield conn
+    finally:
+        pool_db.putconn(conn, close=bool(conn.closed))
 
 # Crear tabla si no existe
 def inicializar_db():
-    conn = obtener_conexion_db()
-    cur = conn.cursor()
-    cur.execute('''
-        CREATE TABLE IF NOT EXISTS productos (
-            id SERIAL PRIMARY KEY,
-            nombre VARCHAR(100) NOT NULL,
-            descripcion TEXT,
-            fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    conn.commit()
-    cur.close()
-    conn.close()
-
-# Decorador para validación de token
-def token_requerido(f):
-    @wraps(f)
-    def decorada(*args, **kwargs):
-        token = None
-        
-        # Extraer token del encabezado de Autorización
-        auth_header = request.headers.get('Authorization')
-        if auth_header and auth_header.startswith('Bearer '):
-            token = auth_header.split(' ')[1]
-        
-        if not token:
-            return jsonify({"error": "token_faltante"}), 401
-        
-        # Verificar token
-        try:
-            jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
-        except:
-            return jsonify({"error": "token_invalido"}), 401
-        
-        return f(*args, **kwargs)
-    
-    return decorada
+    with conexion_db() as conn:
+        with conn.cursor() as cur:
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS productos (
+                    id SERIAL PRIMARY KEY,
+                    nombre VARCHAR(100) NOT NULL,
+                    descripcion TEXT,
+                    fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+@app.errorhandler(pool.PoolError)
+def pool_agotado(e):
+    return jsonify({"error": "Servicio saturado, intente nuevamente"}), 503
+
+# Decorador para validación de token (una regla precompilada por ruta)
+token_requerido = TokenRequired(
+    lambda: keyring,
+    cache=lambda: token_cache,
+    issuer=os.getenv("JWT_ISSUER"),
+    audience=os.getenv("JWT_AUDIENCE"),
+    errors={
+        "missing": "token_faltante",
+        "expired": "token_invalido",
+        "revoked": "token_invalido",
+        "invalid": "token_invalido",
+        "scope": "alcance_insuficiente"
+    }
+)
 
 # Endpoints CRUD
 @app.route('/api/productos', methods=['GET'])
 @token_requerido
 def obtener_productos():
-    conn = obtener_conexion_db()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute('SELECT * FROM productos')
-    productos = cur.fetchall()
-    cur.close()
-    conn.close()
-    return jsonify(productos)
+    # Paginación por id: ?limite=N&despues_de=<último id de la página anterior>
+    try:
+        limite = min(int(request.args.get('limite', LIMITE_POR_DEFECTO)), LIMITE_MAXIMO)
+        despues_de = int(request.args.get('despues_de', 0))
+    except ValueError:
+        return jsonify({"error": "limite y despues_de deben ser enteros"}), 400
+    if limite < 1:
+        return jsonify({"error": "limite debe ser mayor a 0"}), 400
+
+    with conexion_db() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            conn.ejecutar(cur, "productos_listar", (despues_de, limite))
+            productos = cur.fetchall()
+
+    respuesta = jsonify(productos)
+    if len(productos) == limite:
+        respuesta.headers['X-Siguiente-Cursor'] = str(productos[-1]['id'])
+    return respuesta
 
 @app.route('/api/productos/<int:id>', methods=['GET'])
 @token_requerido
 def obtener_producto(id):
-    conn = obtener_conexion_db()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute('SELECT * FROM productos WHERE id = %s', (id,))
-    producto = cur.fetchone()
-    cur.close()
-    conn.close()
+    with conexion_db() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            conn.ejecutar(cur, "productos_obtener", (id,))
+            producto = cur.fetchone()
     
     if producto is None:
         return jsonify({"error": "Producto no encontrado"}), 404
@@ -94,15 +158,10 @@ def crear_producto():
     if not data or not data.get('nombre'):
         return jsonify({"error": "El nombre es obligatorio"}), 400
     
-    conn = obtener_conexion_db()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute(
-        'INSERT INTO productos (nombre, descripcion) VALUES (%s, %s) RETURNING *',
-        (data['nombre'], data.get('descripcion', ''))
-    )
-    nuevo_producto = cur.fetchone()
-    cur.close()
-    conn.close()
+    with conexion_db() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            conn.ejecutar(cur, "productos_crear", (data['nombre'], data.get('descripcion', '')))
+            nuevo_producto = cur.fetchone()
     
     return jsonify(nuevo_producto), 201
 
@@ -114,45 +173,28 @@ def actualizar_producto(id):
     if not data:
         return jsonify({"error": "No se proporcionaron datos"}), 400
     
-    conn = obtener_conexion_db()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
+    # Un solo viaje: si no se actualizó ninguna fila el producto no existe
+    with conexion_db() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            conn.ejecutar(cur, "productos_actualizar", (data.get('nombre'), data.get('descripcion'), id))
+            producto_actualizado = cur.fetchone()
     
-    # Verificar si el producto existe
-    cur.execute('SELECT * FROM productos WHERE id = %s', (id,))
-    if cur.fetchone() is None:
-        cur.close()
-        conn.close()
+    if producto_actualizado is None:
         return jsonify({"error": "Producto no encontrado"}), 404
     
-    # Actualizar producto
-    cur.execute(
-        'UPDATE productos SET nombre = %s, descripcion = %s WHERE id = %s RETURNING *',
-        (data.get('nombre'), data.get('descripcion'), id)
-    )
-    producto_actualizado = cur.fetchone()
-    cur.close()
-    conn.close()
-    
     return jsonify(producto_actualizado)
 
 @app.route('/api/productos/<int:id>', methods=['DELETE'])
 @token_requerido
 def eliminar_producto(id):
-    conn = obtener_conexion_db()
-    cur = conn.cursor()
+    with conexion_db() as conn:
+        with conn.cursor() as cur:
+            conn.ejecutar(cur, "productos_eliminar", (id,))
+            eliminado = cur.fetchone()
     
-    # Verificar si el producto existe
-    cur.execute('SELECT * FROM productos WHERE id = %s', (id,))
-    if cur.fetchone() is None:
-        cur.close()
-        conn.close()
+    if eliminado is None:
         return jsonify({"error": "Producto no encontrado"}), 404
     
-    # Eliminar producto
-    cur.execute('DELETE FROM productos WHERE id = %s', (id,))
-    cur.close()
-    conn.close()
-    
     return jsonify({"mensaje": f"Producto {id} eliminado con éxito"})
 
 if __name__ == '__main__':
@@ -0,0 +1,12 @@
+"""
+Autenticación JWT compartida por lab03_OauthFlask y los servidores de OAuth.
+
+Las aplicaciones agregan la raíz del repositorio a sys.path y crean su propio
+token_required con TokenRequired.
+"""
+from auth_comun.keyring import KeyRing, generate_key
+from auth_comun.token_cache import TokenCache
+from auth_comun.validator import TokenValidator, TokenRevokedError
+from auth_comun.scopes import ScopeSet, Claims, InsufficientScopeError
+from auth_comun.decorators import TokenRequired, bearer_token
+from auth_comun.tokens import emitir_token
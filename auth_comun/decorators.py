@@ -0,0 +1,109 @@
+from flask import request, jsonify, g
+from functools import wraps
+import jwt
+from auth_comun.validator import TokenValidator, TokenRevokedError
+from auth_comun.scopes import InsufficientScopeError
+
+DEFAULT_ERRORS = {
+    "missing": "Token is missing",
+    "expired": "Token has expired",
+    "revoked": "Token has been revoked",
+    "invalid": "Invalid token",
+    "scope": "Insufficient scope"
+}
+
+
+def bearer_token(auth_header):
+    """
+    Extrae el token de una cabecera 'Authorization: Bearer <token>'
+    """
+    if auth_header:
+        parts = auth_header.split()
+        if len(parts) == 2 and parts[0].lower() == 'bearer':
+            return parts[1]
+    return None
+
+
+class TokenRequired:
+    """
+    Fábrica del decorador token_required de cada aplicación.
+
+    Se configura una vez con el keyring, cache, revocación y reglas por
+    defecto. Cada ruta decorada (@token_required o
+    @token_required(scopes=[...])) obtiene su propio TokenValidator
+    construido al registrarla, de modo que por solicitud solo queda leer la
+    cabecera y validar.
+
+    after_validation(payload) puede devolver una respuesta para cortar la
+    solicitud (p. ej. un 429); si devuelve None se ejecuta la vista. El
+    payload queda disponible en flask.g.token_payload.
+
+    En las rutas, revocation_check se consulta después de after_validation:
+    puede ir a la base, y un cliente limitado no debe llegar hasta ahí.
+    """
+    def __init__(self, keyring, errors=None, after_validation=None, **defaults):
+        self.keyring = keyring
+        self.errors = {**DEFAULT_ERRORS, **(errors or {})}
+        self.after_validation = after_validation
+        self.defaults = defaults
+
+    def validator(self, **overrides):
+        return TokenValidator(self.keyring, **{**self.defaults, **overrides})
+
+    def _route_validator(self, **overrides):
+        # La revocación queda fuera del validador; la comprueba el decorador
+        options = {**self.defaults, **overrides}
+        validator = TokenValidator(self.keyring, **{**options, 'revocation_check': None})
+        validator.revocation_check = options.get('revocation_check')
+        return validator
+
+    def __call__(self, f=None, **overrides):
+        if f is None:
+            return lambda view: self._decorate(view, self._route_validator(**overrides))
+        return self._decorate(f, self._route_validator(**overrides))
+
+    def check(self, validator, auth_header):
+        """
+        Valida la cabecera Authorization. Devuelve (payload, None) o
+        (None, (tipo_de_error, status)).
+        """
+        token = bearer_token(auth_header)
+        if not token:
+            return None, ("missing", 401)
+
+        try:
+            return validator.validate(token), None
+        except jwt.ExpiredSignatureError:
+            return None, ("expired", 401)
+        except TokenRevokedError:
+            return None, ("revoked", 401)
+        except InsufficientScopeError:
+            return None, ("scope", 403)
+        except jwt.InvalidTokenError:
+            return None, ("invalid", 401)
+
+    def _error(self, kind, status=401):
+        return jsonify({'error': self.errors[kind]}), status
+
+    def _decorate(self, f, validator):
+        after_validation = self.after_validation
+        revocation_check = validator.revocation_check
+
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            payload, error = self.check(validator, request.headers.get('Authorization'))
+            if error:
+                return self._error(*error)
+
+            g.token_payload = payload
+            if after_validation is not None:
+                response = after_validation(payload)
+                if response is not None:
+                    return response
+            if revocation_check is not None and revocation_check(payload.get('jti')):
+                return self._error("revoked")
+
+            return f(*args, **kwargs)
+
+        decorated.validator = validator
+        return decorated
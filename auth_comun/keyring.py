@@ -0,0 +1,188 @@
+import glob
+import json
+import threading
+import os
+import sys
+import jwt
+from jwt.algorithms import RSAAlgorithm, OKPAlgorithm
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa, ed25519
+
+LEGACY_KID = "default"
+
+
+def _algorithm_for(key):
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "RS256"
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+    raise ValueError(f"Tipo de clave no soportado: {type(key).__name__}")
+
+
+class KeyRing:
+    """
+    Claves de firma y verificación indexadas por kid.
+
+    Las claves se parsean una sola vez al cargarlas y se reutilizan los objetos
+    en cada firma o verificación. Con JWT_KEYS_DIR se firma con RS256/EdDSA
+    (un archivo <kid>.pem por clave privada); con JWKS_FILE solo se verifica.
+    Sin ninguno de los dos se usa HS256 con JWT_SECRET como antes.
+    """
+    __instance = None
+    __instance_lock = threading.Lock()
+
+    @staticmethod
+    def get_instance():
+        if KeyRing.__instance is None:
+            with KeyRing.__instance_lock:
+                if KeyRing.__instance is None:
+                    KeyRing.__instance = KeyRing.from_env()
+        return KeyRing.__instance
+
+    @staticmethod
+    def set_instance(instance):
+        KeyRing.__instance = instance
+
+    @staticmethod
+    def from_env():
+        """
+        Construye el keyring con JWT_KEYS_DIR, JWT_ACTIVE_KID, JWKS_FILE y
+        JWT_SECRET, leídas en el momento de la llamada
+        """
+        keyring = KeyRing()
+        if os.getenv("JWT_KEYS_DIR"):
+            keyring.load_private_keys(os.getenv("JWT_KEYS_DIR"), os.getenv("JWT_ACTIVE_KID"))
+        if os.getenv("JWKS_FILE"):
+            keyring.load_jwks(os.getenv("JWKS_FILE"))
+        if not keyring.kids():
+            keyring.add_secret(os.getenv("JWT_SECRET", "mi_clave_super_secreta"))
+        return keyring
+
+    def __init__(self):
+        # kid -> (clave, algoritmo); se reemplaza entero al recargar
+        self.__signing = {}
+        self.__verifying = {}
+        self.active_kid = None
+
+    def kids(self):
+        return list(self.__verifying)
+
+    @property
+    def algorithm(self):
+        if self.active_kid is None:
+            return None
+        return self.__signing[self.active_kid][1]
+
+    def add_secret(self, secret, kid=LEGACY_KID):
+        signing = dict(self.__signing)
+        verifying = dict(self.__verifying)
+        signing[kid] = (secret, "HS256")
+        verifying[kid] = (secret, "HS256")
+        self.__signing, self.__verifying = signing, verifying
+        if self.active_kid is None:
+            self.active_kid = kid
+
+    def add_private_key(self, kid, private_key):
+        algorithm = _algorithm_for(private_key)
+        signing = dict(self.__signing)
+        verifying = dict(self.__verifying)
+        signing[kid] = (private_key, algorithm)
+        verifying[kid] = (private_key.public_key(), algorithm)
+        self.__signing, self.__verifying = signing, verifying
+
+    def load_private_keys(self, directory, active_kid=None):
+        """
+        Carga cada <kid>.pem del directorio. La clave activa es active_kid o,
+        si no se indica, la modificada más recientemente (la última rotada).
+        """
+        paths = sorted(glob.glob(os.path.join(directory, "*.pem")), key=os.path.getmtime)
+        for path in paths:
+            kid = os.path.splitext(os.path.basename(path))[0]
+            with open(path, "rb") as f:
+                self.add_private_key(kid, serialization.load_pem_private_key(f.read(), password=None))
+
+        if active_kid:
+            if active_kid not in self.__signing:
+                raise ValueError(f"No existe la clave activa '{active_kid}' en {directory}")
+            self.active_kid = active_kid
+        elif paths:
+            self.active_kid = os.path.splitext(os.path.basename(paths[-1]))[0]
+
+    def load_jwks(self, path):
+        """
+        Carga claves públicas de verificación desde un archivo JWKS local
+        """
+        with open(path) as f:
+            jwks = json.load(f)
+
+        verifying = dict(self.__verifying)
+        for jwk in jwks.get("keys", []):
+            key = jwt.PyJWK(jwk)
+            verifying[key.key_id] = (key.key, jwk.get("alg") or _algorithm_for(key.key))
+        self.__verifying = verifying
+
+    def sign(self, payload):
+        if self.active_kid is None:
+            raise ValueError("No hay clave de firma configurada")
+        key, algorithm = self.__signing[self.active_kid]
+        headers = None if self.active_kid == LEGACY_KID else {"kid": self.active_kid}
+        return jwt.encode(payload, key, algorithm=algorithm, headers=headers)
+
+    def decode(self, token, algorithms=None, **kwargs):
+        """
+        Verifica la firma con la clave del kid de la cabecera y devuelve el
+        payload. Lanza las mismas excepciones que jwt.decode.
+        """
+        kid = jwt.get_unverified_header(token).get("kid") or LEGACY_KID
+        entry = self.__verifying.get(kid) if isinstance(kid, str) else None
+        if entry is None:
+            raise jwt.InvalidTokenError("kid desconocido")
+        key, algorithm = entry
+        if algorithms is not None and algorithm not in algorithms:
+            raise jwt.InvalidAlgorithmError("Algoritmo no permitido")
+        return jwt.decode(token, key, algorithms=[algorithm], **kwargs)
+
+    def to_jwks(self):
+        """
+        JWKS público con todas las claves asimétricas conocidas
+        """
+        keys = []
+        for kid, (key, algorithm) in self.__verifying.items():
+            if algorithm == "RS256":
+                jwk = RSAAlgorithm.to_jwk(key, as_dict=True)
+            elif algorithm == "EdDSA":
+                jwk = OKPAlgorithm.to_jwk(key, as_dict=True)
+            else:
+                continue
+            jwk.update({"kid": kid, "alg": algorithm, "use": "sig"})
+            keys.append(jwk)
+        return {"keys": keys}
+
+
+def generate_key(directory, kid, kind="rsa"):
+    if kind == "ed25519":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{kid}.pem")
+    with open(path, "wb") as f:
+        f.write(private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption()
+        ))
+    os.chmod(path, 0o600)
+    return path
+
+
+if __name__ == "__main__":
+    # python -m auth_comun.keyring generate <kid> [rsa|ed25519]
+    # python -m auth_comun.keyring jwks > jwks.json
+    if len(sys.argv) >= 3 and sys.argv[1] == "generate":
+        print(generate_key(os.getenv("JWT_KEYS_DIR") or "keys", sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else "rsa"))
+    elif len(sys.argv) == 2 and sys.argv[1] == "jwks":
+        print(json.dumps(KeyRing.from_env().to_jwks(), indent=2))
+    else:
+        print("Uso: python -m auth_comun.keyring generate <kid> [rsa|ed25519] | jwks")
@@ -0,0 +1,49 @@
+from quart import request, jsonify, g
+from functools import wraps
+import inspect
+from auth_comun.decorators import TokenRequired
+
+
+class AsyncTokenRequired(TokenRequired):
+    """
+    token_required para vistas async de Quart.
+
+    Se configura igual que TokenRequired y valida con el mismo
+    TokenValidator, todo en memoria. revocation_check y after_validation
+    pueden ser funciones o corutinas; como en TokenRequired, la revocación
+    se comprueba después de after_validation, y si es una corutina se
+    espera, así la consulta a la base no bloquea el loop.
+    """
+    def _error(self, kind, status=401):
+        return jsonify({'error': self.errors[kind]}), status
+
+    def _decorate(self, f, validator):
+        after_validation = self.after_validation
+        after_is_async = inspect.iscoroutinefunction(after_validation)
+        revocation_check = validator.revocation_check
+        revocation_is_async = inspect.iscoroutinefunction(revocation_check)
+
+        @wraps(f)
+        async def decorated(*args, **kwargs):
+            payload, error = self.check(validator, request.headers.get('Authorization'))
+            if error:
+                return self._error(*error)
+
+            g.token_payload = payload
+            if after_validation is not None:
+                response = after_validation(payload)
+                if after_is_async:
+                    response = await response
+                if response is not None:
+                    return response
+            if revocation_check is not None:
+                revoked = revocation_check(payload.get('jti'))
+                if revocation_is_async:
+                    revoked = await revoked
+                if revoked:
+                    return self._error("revoked")
+
+            return await f(*args, **kwargs)
+
+        decorated.validator = validator
+        return decorated
@@ -0,0 +1,65 @@
+import jwt
+
+
+class InsufficientScopeError(jwt.InvalidTokenError):
+    pass
+
+
+class ScopeSet:
+    """
+    Asigna un bit a cada scope conocido. Los scopes requeridos por una ruta se
+    convierten en máscara al registrarla y los del token al verificarlo, así
+    la autorización es un AND de enteros.
+    """
+    def __init__(self, names):
+        self.__bits = {name: 1 << i for i, name in enumerate(names)}
+
+    def names(self):
+        return list(self.__bits)
+
+    def mask(self, names):
+        """
+        Máscara de scopes requeridos. Un nombre desconocido es un error de
+        programación y falla al registrar la ruta.
+        """
+        mask = 0
+        for name in names:
+            if name not in self.__bits:
+                raise ValueError(f"Scope desconocido: {name}")
+            mask |= self.__bits[name]
+        return mask
+
+    def parse(self, claim):
+        """
+        Máscara de un claim 'scope' separado por espacios; ignora los
+        scopes que no conoce
+        """
+        if not isinstance(claim, str):
+            return 0
+        bits = self.__bits
+        mask = 0
+        for name in claim.split():
+            mask |= bits.get(name, 0)
+        return mask
+
+    def grant(self, requested, allowed):
+        """
+        Scopes a otorgar: los pedidos si todos están permitidos, todos los
+        permitidos si no se pidió ninguno, o None si se pidió alguno no
+        permitido
+        """
+        allowed_names = allowed.split() if allowed else []
+        if not requested:
+            return " ".join(allowed_names)
+        requested_names = requested.split()
+        if any(name not in allowed_names for name in requested_names):
+            return None
+        return " ".join(requested_names)
+
+
+class Claims(dict):
+    """
+    Payload verificado con la máscara de scopes ya calculada, para que el
+    cache la guarde junto al token
+    """
+    scope_mask = 0
@@ -0,0 +1,112 @@
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+import os
+
+
+class TokenCache:
+    """
+    Cache LRU acotado de tokens ya verificados.
+
+    La clave es el digest de todo el token (cabecera, payload y firma), por lo
+    que un token alterado nunca coincide con una entrada existente y vuelve a
+    pasar por la verificación completa. Un índice secundario por jti permite
+    invalidar entradas sin conocer el token original.
+    """
+    __instance = None
+
+    @staticmethod
+    def get_instance():
+        if TokenCache.__instance is None:
+            TokenCache.__instance = TokenCache(int(os.getenv("TOKEN_CACHE_SIZE", "10000")))
+        return TokenCache.__instance
+
+    @staticmethod
+    def set_instance(instance):
+        TokenCache.__instance = instance
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        self.__by_jti = {}
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token):
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def get(self, token):
+        """
+        Devuelve el payload verificado del token o None si no está en cache
+        o ya expiró.
+        """
+        if self.max_size <= 0:
+            return None
+
+        key = self._digest(token)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            payload, exp = entry
+            if exp is not None and exp <= time.time():
+                # Expirado: se descarta y se deja que jwt.decode lo rechace
+                self.__remove(key)
+                self.misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, token, payload):
+        if self.max_size <= 0:
+            return
+
+        key = self._digest(token)
+        jti = payload.get('jti')
+        exp = payload.get('exp')
+        with self.__lock:
+            self.__entries[key] = (payload, exp)
+            self.__entries.move_to_end(key)
+            if jti:
+                self.__by_jti[jti] = key
+
+            while len(self.__entries) > self.max_size:
+                oldest = next(iter(self.__entries))
+                self.__remove(oldest)
+
+    def invalidate_jti(self, jti):
+        with self.__lock:
+            key = self.__by_jti.get(jti)
+            if key is not None:
+                self.__remove(key)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__by_jti.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self.__lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "size": len(self.__entries),
+                "max_size": self.max_size
+            }
+
+    def __remove(self, key):
+        payload, _ = self.__entries.pop(key)
+        jti = payload.get('jti')
+        if jti and self.__by_jti.get(jti) == key:
+            del self.__by_jti[jti]
@@ -0,0 +1,22 @@
+import datetime
+import uuid
+
+
+def emitir_token(keyring, sub, lifetime=3600, issuer=None, audience=None, **claims):
+    """
+    Firma un token de acceso con la clave activa del keyring
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    payload = {
+        "sub": sub,
+        "iat": now,
+        "exp": now + datetime.timedelta(seconds=lifetime),
+        "jti": str(uuid.uuid4())
+    }
+    if issuer:
+        payload["iss"] = issuer
+    if audience:
+        payload["aud"] = audience
+    payload.update(claims)
+
+    return keyring.sign(payload)
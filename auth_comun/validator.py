@@ -0,0 +1,77 @@
+import jwt
+from auth_comun.keyring import KeyRing
+from auth_comun.token_cache import TokenCache
+from auth_comun.scopes import Claims, InsufficientScopeError
+
+
+class TokenRevokedError(jwt.InvalidTokenError):
+    pass
+
+
+def _provider(value, cls):
+    # Acepta el objeto ya construido o una función que lo devuelve (p. ej. get_instance)
+    if value is None or isinstance(value, cls):
+        return lambda: value
+    return value
+
+
+class TokenValidator:
+    """
+    Reglas de validación de una ruta, resueltas una sola vez al registrarla.
+
+    La firma y la expiración se verifican con el keyring (o se toman del
+    cache, que solo guarda tokens con firma válida). Emisor y audiencia se
+    comprueban en cada solicitud contra el payload: son búsquedas en un dict y
+    así un mismo cache puede compartirse entre rutas con reglas distintas.
+    """
+    def __init__(self, keyring, issuer=None, audience=None, algorithms=None, leeway=0,
+                 cache=None, revocation_check=None, scope_set=None, scopes=None):
+        self.__keyring = _provider(keyring, KeyRing)
+        self.__cache = _provider(cache, TokenCache)
+        self.__revocation_check = revocation_check
+        self.issuer = issuer
+        self.audience = frozenset([audience] if isinstance(audience, str) else audience or ())
+        self.algorithms = frozenset(algorithms) if algorithms else None
+        self.scope_set = scope_set
+        self.required_scopes = scope_set.mask(scopes or ()) if scope_set else 0
+        if scopes and scope_set is None:
+            raise ValueError("Se requieren scopes pero no hay scope_set configurado")
+        self.__decode_kwargs = {
+            "algorithms": self.algorithms,
+            "leeway": leeway,
+            "options": {"require": ["exp"], "verify_aud": False, "verify_iss": False}
+        }
+
+    def validate(self, token):
+        """
+        Devuelve el payload del token o lanza jwt.InvalidTokenError (o una
+        subclase: ExpiredSignatureError, TokenRevokedError, ...)
+        """
+        cache = self.__cache()
+        payload = cache.get(token) if cache is not None else None
+
+        if payload is None:
+            payload = Claims(self.__keyring().decode(token, **self.__decode_kwargs))
+            if self.scope_set is not None:
+                # Una vez por token; la máscara viaja en el cache con el payload
+                payload.scope_mask = self.scope_set.parse(payload.get("scope"))
+            if cache is not None:
+                cache.put(token, payload)
+
+        if self.issuer is not None and payload.get("iss") != self.issuer:
+            raise jwt.InvalidIssuerError("Emisor inválido")
+
+        if self.audience:
+            aud = payload.get("aud")
+            auds = [aud] if isinstance(aud, str) else aud or ()
+            if not any(a in self.audience for a in auds):
+                raise jwt.InvalidAudienceError("Audiencia inválida")
+
+        if self.__revocation_check is not None and self.__revocation_check(payload.get("jti")):
+            raise TokenRevokedError("Token revocado")
+
+        required = self.required_scopes
+        if required and payload.scope_mask & required != required:
+            raise InsufficientScopeError("Scope insuficiente")
+
+        return payload
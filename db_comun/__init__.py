@@ -0,0 +1,8 @@
+"""
+Utilidades de base de datos compartidas por lab03_OauthFlask y
+FlaskBlueprints; solo dependen de psycopg2.
+
+Las aplicaciones agregan la raíz del repositorio a sys.path y le pasan a
+run_migrations una conexión de su propio pool.
+"""
+from db_comun.migrations import run_migrations
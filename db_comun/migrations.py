@@ -0,0 +1,67 @@
+"""
+Ejecutor de migraciones versionadas.
+
+Cada migración es (versión, nombre, [sentencias]) y se aplica una sola vez,
+en su propia transacción, registrándola en la tabla de versiones de la
+aplicación: cada una lleva la suya para poder compartir la base. Si la base ya
+está en la última versión basta una consulta; si no, se toma un advisory
+lock para que dos procesos que arrancan a la vez no apliquen la misma
+migración.
+"""
+import psycopg2.errors
+from psycopg2 import sql
+
+def _version(conn, cursor, table):
+    try:
+        cursor.execute(sql.SQL("SELECT COALESCE(MAX(version), 0) FROM {}").format(table))
+        version = cursor.fetchone()[0]
+        conn.commit()
+        return version
+    except psycopg2.errors.UndefinedTable:
+        # Base nueva o creada antes de las migraciones
+        conn.rollback()
+        return 0
+
+def run_migrations(conn, migrations, lock_id, table):
+    """
+    Aplica en conn, en orden, las migraciones con versión mayor a la
+    registrada en table y devuelve cuántas aplicó. lock_id y table son
+    propios de cada aplicación.
+    """
+    latest = migrations[-1][0]
+    table = sql.Identifier(table)
+    with conn.cursor() as cursor:
+        if _version(conn, cursor, table) >= latest:
+            return 0
+
+        cursor.execute("SELECT pg_advisory_lock(%s)", (lock_id,))
+        try:
+            cursor.execute(sql.SQL("""
+            CREATE TABLE IF NOT EXISTS {} (
+                version INTEGER PRIMARY KEY,
+                nombre VARCHAR(200) NOT NULL,
+                aplicada_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """).format(table))
+            conn.commit()
+            # Otro proceso pudo haber migrado mientras esperábamos el lock
+            current = _version(conn, cursor, table)
+
+            applied = 0
+            for version, nombre, statements in migrations:
+                if version <= current:
+                    continue
+                for statement in statements:
+                    cursor.execute(statement)
+                cursor.execute(sql.SQL("INSERT INTO {} (version, nombre) VALUES (%s, %s)").format(table),
+                               (version, nombre))
+                conn.commit()
+                applied += 1
+                print(f"Migración {version} aplicada: {nombre}")
+            return applied
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (lock_id,))
+            conn.commit()
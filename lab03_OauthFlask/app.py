@@ -1,23 +1,42 @@
 from flask import Flask
 from flask_cors import CORS
-from dotenv import load_dotenv
-import os
+from config import Config
 from blueprints.libro_blueprint import libro_bp
 from blueprints.autor_blueprint import autor_bp
 from blueprints.genero_blueprint import genero_bp
 from blueprints.auth_blueprint import auth_bp
+from blueprints.errors import pool_timeout, database_unavailable
+from blueprints.pagination import NEXT_CURSOR_HEADER
+from db.connection_pool import PoolTimeoutError, set_client
+from services import init_services, services_ready
 
-load_dotenv()
-
-def create_app():
+def create_app(config=Config):
+    """
+    Arma la aplicación sin tocar la base: el pool se abre y los servicios se
+    inicializan en la primera solicitud, salvo que run.py haga el warm-up
+    """
     app = Flask(__name__)
+    app.config.from_object(config)
     
-    CORS(app, resources={r"/api/*": {"origins": "http://localhost:3000"}})
+    CORS(app, resources={r"/api/*": {"origins": "http://localhost:3000"}},
+         expose_headers=[NEXT_CURSOR_HEADER])
 
     app.register_blueprint(libro_bp, url_prefix='/api/libros')
     app.register_blueprint(autor_bp, url_prefix='/api/autores')
     app.register_blueprint(genero_bp, url_prefix='/api/generos')
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
+
+    app.register_error_handler(PoolTimeoutError, pool_timeout)
+
+    @app.before_request
+    def ensure_services():
+        if not services_ready() and not init_services(config):
+            return database_unavailable()
+
+    @app.teardown_request
+    def clear_client(exc):
+        # Los hilos del servidor se reutilizan entre solicitudes
+        set_client(None)
     
     return app
 
@@ -0,0 +1,82 @@
+"""
+Modo ASGI de la API.
+
+/api/libros, /api/autores y /api/generos se sirven con vistas async de Quart
+sobre asyncpg, así una consulta en curso no ocupa un hilo. /api/auth sigue
+siendo la aplicación Flask (firmar tokens y verificar secretos es trabajo de
+CPU) montada con WsgiToAsgi, que la ejecuta en un pool de hilos. El modo
+sync de run.py no cambia.
+
+Uso (desde lab03_OauthFlask, con requirements-async.txt instalado):
+    hypercorn asgi:app --bind 0.0.0.0:5000 --workers 2
+"""
+import asyncio
+from quart import Quart, jsonify
+from quart_cors import cors
+from asgiref.wsgi import WsgiToAsgi
+from app import create_app as create_wsgi_app
+from config import Config
+from services import init_services, services_ready
+from blueprints.async_libro_blueprint import libro_bp
+from blueprints.async_autor_blueprint import autor_bp
+from blueprints.async_genero_blueprint import genero_bp
+from blueprints.async_errors import pool_timeout, database_unavailable
+from blueprints.pagination import NEXT_CURSOR_HEADER
+from middlewares.async_auth_middleware import token_required
+from db.async_pool import AsyncConnectionPool
+from db.connection_pool import PoolTimeoutError
+
+AUTH_PREFIX = '/api/auth'
+
+def create_app(config=Config):
+    app = Quart(__name__)
+    app.config.from_object(config)
+
+    app = cors(app, allow_origin="http://localhost:3000", expose_headers=[NEXT_CURSOR_HEADER])
+
+    app.register_blueprint(libro_bp, url_prefix='/api/libros')
+    app.register_blueprint(autor_bp, url_prefix='/api/autores')
+    app.register_blueprint(genero_bp, url_prefix='/api/generos')
+
+    app.register_error_handler(PoolTimeoutError, pool_timeout)
+
+    @app.route('/api/async-pool-stats', methods=['GET'])
+    @token_required(scopes=["admin"])
+    async def async_pool_stats():
+        return jsonify(AsyncConnectionPool.get_instance().stats()), 200
+
+    @app.before_request
+    async def ensure_services():
+        if not services_ready() and not await asyncio.to_thread(init_services, config):
+            return await database_unavailable()
+
+    @app.before_serving
+    async def startup():
+        if not config.WARM_UP:
+            return
+        # Tablas, cliente por defecto, registro de clientes y sweeper usan el pool sync
+        if await asyncio.to_thread(init_services, config):
+            await AsyncConnectionPool.get_instance().open()
+
+    @app.after_serving
+    async def shutdown():
+        await AsyncConnectionPool.get_instance().close()
+
+    return app
+
+class AuthDispatcher:
+    """
+    Envía las solicitudes HTTP de /api/auth a la aplicación Flask y todo lo
+    demás (incluido lifespan) a la de Quart
+    """
+    def __init__(self, asgi_app, wsgi_app):
+        self.asgi_app = asgi_app
+        self.auth_app = WsgiToAsgi(wsgi_app)
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] == "http" and (path == AUTH_PREFIX or path.startswith(AUTH_PREFIX + '/')):
+            return await self.auth_app(scope, receive, send)
+        return await self.asgi_app(scope, receive, send)
+
+app = AuthDispatcher(create_app(), create_wsgi_app())
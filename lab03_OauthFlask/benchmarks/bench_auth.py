@@ -0,0 +1,168 @@
+"""
+Benchmark de la capa de autenticación.
+
+Mide throughput y latencia (p50/p99) de la firma de tokens en _emitir_token
+(sin autenticar al cliente ni crear el refresh token de /token) y de la
+verificación en token_required y en OAuth/resource_server.token_requerido,
+para tokens válidos, expirados y malformados, con HS256, RS256 y EdDSA, y con
+el cache de tokens activado o desactivado. No necesita base de datos.
+
+Uso (desde lab03_OauthFlask):
+    python -m benchmarks.bench_auth --iterations 5000 --output bench_auth.json
+"""
+import argparse
+import datetime
+import importlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import uuid
+import jwt
+from flask import Flask, jsonify
+from cryptography.hazmat.primitives.asymmetric import rsa, ed25519
+from middlewares.auth_middleware import token_required
+from middlewares.revocation_list import RevocationList
+from middlewares.rate_limit import api_limiter
+from blueprints.auth_blueprint import _emitir_token
+from auth_comun import KeyRing, TokenCache
+
+OAUTH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "OAuth")
+CLIENT = {"client_id": "bench_client", "token_lifetime": 3600}
+
+
+def build_keyrings():
+    hs256 = KeyRing()
+    hs256.add_secret("bench_secret_de_32_bytes_o_mas_!!")
+
+    rs256 = KeyRing()
+    rs256.add_private_key("bench-rsa", rsa.generate_private_key(public_exponent=65537, key_size=2048))
+    rs256.active_kid = "bench-rsa"
+
+    eddsa = KeyRing()
+    eddsa.add_private_key("bench-ed25519", ed25519.Ed25519PrivateKey.generate())
+    eddsa.active_kid = "bench-ed25519"
+
+    return {"HS256": hs256, "RS256": rs256, "EdDSA": eddsa}
+
+
+def build_tokens(keyring):
+    expired = keyring.sign({
+        "sub": CLIENT["client_id"],
+        "exp": datetime.datetime.utcnow() - datetime.timedelta(minutes=5),
+        "jti": str(uuid.uuid4())
+    })
+    return {
+        "valid": _emitir_token(CLIENT),
+        "expired": expired,
+        "malformed": "eyJhbGciOiJub25lIn0.no-es-un-token.firma"
+    }
+
+
+def measure(fn, iterations, warmup):
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    perf = time.perf_counter_ns
+    start = perf()
+    for _ in range(iterations):
+        t0 = perf()
+        fn()
+        samples.append(perf() - t0)
+    elapsed = (perf() - start) / 1e9
+
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "ops_per_sec": round(iterations / elapsed, 1),
+        "mean_us": round(statistics.fmean(samples) / 1000, 2),
+        "p50_us": round(samples[len(samples) // 2] / 1000, 2),
+        "p99_us": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] / 1000, 2)
+    }
+
+
+def load_resource_server():
+    sys.path.insert(0, os.path.abspath(OAUTH_DIR))
+    try:
+        return importlib.import_module("resource_server")
+    finally:
+        sys.path.pop(0)
+
+
+def run(iterations, warmup):
+    keyrings = build_keyrings()
+    results = []
+
+    # Sin base de datos: filtro de revocación vacío y sin límite de tasa
+    RevocationList.set_instance(RevocationList())
+    api_limiter.rate = 0
+
+    app = Flask("bench_auth")
+
+    @token_required
+    def protegido():
+        return jsonify({"ok": True})
+
+    resource_server = load_resource_server()
+
+    for algorithm, keyring in keyrings.items():
+        KeyRing.set_instance(keyring)
+        tokens = build_tokens(keyring)
+
+        stats = measure(lambda: _emitir_token(CLIENT), iterations, warmup)
+        results.append({"group": "issuance", "target": "auth_blueprint._emitir_token",
+                        "algorithm": algorithm, **stats})
+
+        for case, token in tokens.items():
+            headers = {"Authorization": f"Bearer {token}"}
+
+            for cached in (False, True):
+                TokenCache.set_instance(TokenCache(10000 if cached else 0))
+                with app.test_request_context(headers=headers):
+                    stats = measure(protegido, iterations, warmup)
+                results.append({"group": "verification", "target": "token_required", "algorithm": algorithm,
+                                "case": case, "cached": cached, **stats})
+
+            resource_server.keyring = keyring
+            view = resource_server.token_requerido(lambda: jsonify({"ok": True}))
+            for cached in (False, True):
+                resource_server.token_cache = TokenCache(10000 if cached else 0)
+                with resource_server.app.test_request_context(headers=headers):
+                    stats = measure(view, iterations, warmup)
+                results.append({"group": "verification", "target": "resource_server.token_requerido",
+                                "algorithm": algorithm, "case": case, "cached": cached, **stats})
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "pyjwt": jwt.__version__,
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "warmup": warmup
+        },
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de emisión y verificación de tokens")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--output", help="Archivo JSON de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    report = run(args.iterations, args.warmup)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark de la carga masiva de libros.
+
+Carga N libros (por defecto 100 y 1000), cada uno con un autor y un género,
+como lo hacía create_libro (save, add_autor y add_genero por libro, cada uno
+con su conexión) y con Libro.bulk_create (una transacción y una sentencia
+por tabla cada 1000 filas). Informa el tiempo total y los libros por segundo
+de cada uno. Borra los datos de prueba al terminar.
+
+Uso (desde lab03_OauthFlask):
+    python -m benchmarks.bench_bulk --sizes 100,1000 --output bench_bulk.json
+"""
+import argparse
+import datetime
+import json
+import platform
+import time
+import psycopg2
+from db.connection_pool import PostgreSQLConnectionPool
+from db.schema import create_tables
+from models.libro import Libro
+from models.autor import Autor
+from models.genero import Genero
+
+
+def one_by_one(filas):
+    ids = []
+    for fila in filas:
+        libro = Libro(titulo=fila['titulo'], isbn=fila['isbn']).save()
+        for autor_id in fila['autores']:
+            Libro.add_autor(libro['id'], autor_id)
+        for genero_id in fila['generos']:
+            Libro.add_genero(libro['id'], genero_id)
+        ids.append(libro['id'])
+    return ids
+
+
+def bulk(filas):
+    creados, errores = Libro.bulk_create(filas)
+    if errores:
+        raise RuntimeError(f"bulk_create rechazó filas: {errores[:3]}")
+    return [creado['id'] for creado in creados]
+
+
+def rows(size, prefix, autor_id, genero_id):
+    return [{
+        "indice": i,
+        "titulo": f"Libro de carga {i:05d}",
+        "isbn": f"{prefix}-{size}-{i}",
+        "fecha_publicacion": None,
+        "descripcion": None,
+        "autores": [autor_id],
+        "generos": [genero_id]
+    } for i in range(size)]
+
+
+def run(sizes):
+    create_tables()
+    pool = PostgreSQLConnectionPool.get_instance()
+    autor = Autor(nombre="Autor", apellido="Benchmark carga").save()
+    genero = Genero(nombre="Género benchmark carga").save()
+
+    results = []
+    try:
+        for size in sizes:
+            for target, prefix, fn in (("one_by_one", "uno", one_by_one), ("Libro.bulk_create", "lote", bulk)):
+                filas = rows(size, prefix, autor['id'], genero['id'])
+                start = time.perf_counter()
+                ids = fn(filas)
+                elapsed = time.perf_counter() - start
+                results.append({
+                    "target": target,
+                    "books": size,
+                    "seconds": round(elapsed, 3),
+                    "books_per_second": round(size / elapsed, 1)
+                })
+                for libro_id in ids:
+                    Libro.delete(libro_id)
+    finally:
+        Autor.delete(autor['id'])
+        Genero.delete(genero['id'])
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "psycopg2": psycopg2.__version__,
+            "platform": platform.platform()
+        },
+        "results": results,
+        "pool": pool.stats()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de carga masiva de libros")
+    parser.add_argument("--sizes", default="100,1000", help="Cantidades de libros separadas por comas")
+    parser.add_argument("--output", help="Archivo JSON de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    report = run(sizes)
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark de las consultas CRUD de los modelos con y sin sentencias
+preparadas del pool.
+
+Mide throughput y latencia (p50/p99) de Libro.get_by_id, Libro.get_all,
+Autor.get_by_id y Genero.get_all contra la base de DATABASE_URL, primero
+enviando el SQL completo en cada llamada y después con
+PostgreSQLConnectionPool.execute preparando cada sentencia una vez por
+conexión. Crea un libro, un autor y un género de prueba y los borra al
+terminar.
+
+Uso (desde lab03_OauthFlask):
+    python -m benchmarks.bench_queries --iterations 5000 --output bench_queries.json
+"""
+import argparse
+import datetime
+import json
+import platform
+import psycopg2
+from benchmarks.bench_auth import measure
+from db.connection_pool import PostgreSQLConnectionPool
+from db.schema import create_tables
+from models.libro import Libro
+from models.autor import Autor
+from models.genero import Genero
+
+
+def seed():
+    libro = Libro(titulo="Libro de benchmark", isbn="bench-0000", descripcion="benchmark").save()
+    autor = Autor(nombre="Autor", apellido="Benchmark").save()
+    genero = Genero(nombre="Género benchmark").save()
+    Libro.add_autor(libro['id'], autor['id'])
+    Libro.add_genero(libro['id'], genero['id'])
+    return libro['id'], autor['id'], genero['id']
+
+
+def cleanup(libro_id, autor_id, genero_id):
+    Libro.delete(libro_id)
+    Autor.delete(autor_id)
+    Genero.delete(genero_id)
+
+
+def run(iterations, warmup):
+    create_tables()
+    pool = PostgreSQLConnectionPool.get_instance()
+    libro_id, autor_id, genero_id = seed()
+
+    cases = {
+        "Libro.get_by_id": lambda: Libro.get_by_id(libro_id),
+        "Libro.get_all": Libro.get_all,
+        "Autor.get_by_id": lambda: Autor.get_by_id(autor_id),
+        "Genero.get_all": Genero.get_all
+    }
+
+    results = []
+    try:
+        for prepared in (False, True):
+            pool.use_prepared = prepared
+            for target, fn in cases.items():
+                stats = measure(fn, iterations, warmup)
+                results.append({"target": target, "prepared": prepared, **stats})
+    finally:
+        cleanup(libro_id, autor_id, genero_id)
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "psycopg2": psycopg2.__version__,
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "warmup": warmup
+        },
+        "results": results,
+        "pool": pool.stats()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de consultas con y sin sentencias preparadas")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--output", help="Archivo JSON de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    report = run(args.iterations, args.warmup)
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark de la carga de libros con sus autores y géneros.
+
+Crea un autor y un género con N libros (por defecto 10, 100 y 500) y mide
+latencia (p50/p99) y cantidad de consultas de Libro.get_by_autor y
+Libro.get_by_genero contra la implementación anterior, que consultaba los
+autores y géneros libro por libro. Con la carga por lotes la cantidad de
+consultas no depende de N. Borra los datos de prueba al terminar.
+
+Uso (desde lab03_OauthFlask):
+    python -m benchmarks.bench_relations --sizes 10,100,500 --iterations 200 --output bench_relations.json
+"""
+import argparse
+import datetime
+import json
+import platform
+import psycopg2
+import psycopg2.extras
+from benchmarks.bench_auth import measure
+from db.connection_pool import PostgreSQLConnectionPool
+from db.schema import create_tables
+from models.libro import Libro
+from models.autor import Autor
+from models.genero import Genero
+
+_queries = 0
+_execute = psycopg2.extras.RealDictCursor.execute
+
+
+def _counting_execute(self, query, vars=None):
+    global _queries
+    _queries += 1
+    return _execute(self, query, vars)
+
+
+def n_plus_one_get_by_autor(autor_id):
+    # Implementación anterior: ids, IN (...) y dos consultas por libro
+    pool = PostgreSQLConnectionPool.get_instance()
+    with pool.read_connection() as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            cursor.execute("SELECT libro_id FROM libro_autor WHERE autor_id = %s", (autor_id,))
+            libro_ids = [row['libro_id'] for row in cursor.fetchall()]
+            if not libro_ids:
+                return []
+            placeholders = ','.join(['%s'] * len(libro_ids))
+            cursor.execute(f"SELECT * FROM libro WHERE id IN ({placeholders}) ORDER BY titulo", libro_ids)
+            libros = cursor.fetchall()
+            for libro in libros:
+                cursor.execute("""
+                    SELECT a.* FROM autor a JOIN libro_autor la ON a.id = la.autor_id
+                    WHERE la.libro_id = %s
+                """, (libro['id'],))
+                libro['autores'] = cursor.fetchall()
+                cursor.execute("""
+                    SELECT g.* FROM genero g JOIN libro_genero lg ON g.id = lg.genero_id
+                    WHERE lg.libro_id = %s
+                """, (libro['id'],))
+                libro['generos'] = cursor.fetchall()
+            return libros
+
+
+def seed(size):
+    autor = Autor(nombre="Autor", apellido=f"Benchmark {size}").save()
+    genero = Genero(nombre=f"Género benchmark {size}").save()
+    libro_ids = []
+    for i in range(size):
+        libro = Libro(titulo=f"Libro de benchmark {i:04d}", isbn=f"bench-{size}-{i}").save()
+        Libro.add_autor(libro['id'], autor['id'])
+        Libro.add_genero(libro['id'], genero['id'])
+        libro_ids.append(libro['id'])
+    return autor['id'], genero['id'], libro_ids
+
+
+def cleanup(autor_id, genero_id, libro_ids):
+    for libro_id in libro_ids:
+        Libro.delete(libro_id)
+    Autor.delete(autor_id)
+    Genero.delete(genero_id)
+
+
+def count_queries(fn):
+    global _queries
+    # La primera llamada además prepara las sentencias en la conexión
+    fn()
+    _queries = 0
+    fn()
+    return _queries
+
+
+def run(sizes, iterations, warmup):
+    create_tables()
+    pool = PostgreSQLConnectionPool.get_instance()
+    psycopg2.extras.RealDictCursor.execute = _counting_execute
+
+    results = []
+    try:
+        for size in sizes:
+            autor_id, genero_id, libro_ids = seed(size)
+            cases = {
+                "n_plus_one.get_by_autor": lambda: n_plus_one_get_by_autor(autor_id),
+                "Libro.get_by_autor": lambda: Libro.get_by_autor(autor_id),
+                "Libro.get_by_genero": lambda: Libro.get_by_genero(genero_id)
+            }
+            try:
+                for target, fn in cases.items():
+                    queries = count_queries(fn)
+                    stats = measure(fn, iterations, warmup)
+                    results.append({"target": target, "books": size, "queries": queries, **stats})
+            finally:
+                cleanup(autor_id, genero_id, libro_ids)
+    finally:
+        psycopg2.extras.RealDictCursor.execute = _execute
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "psycopg2": psycopg2.__version__,
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "warmup": warmup
+        },
+        "results": results,
+        "pool": pool.stats()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de libros con autores y géneros")
+    parser.add_argument("--sizes", default="10,100,500", help="Cantidades de libros separadas por comas")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--output", help="Archivo JSON de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    report = run(sizes, args.iterations, args.warmup)
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark de arranque de las aplicaciones Flask.
+
+Para lab03_OauthFlask y FlaskBlueprints mide, en un proceso nuevo por
+repetición, cuánto tarda importar el módulo de la aplicación, cuánto
+create_app y cuánto la primera solicitud (que abre el pool y aplica las
+migraciones pendientes) y una segunda ya en caliente. Con --dsn-down se
+apunta DATABASE_URL a un puerto cerrado para comprobar que la aplicación
+arranca igual y la primera solicitud responde 503 sin colgarse.
+
+Uso (desde lab03_OauthFlask):
+    python -m benchmarks.bench_startup --runs 10 --output bench_startup.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+
+# Cada caso corre en su propio intérprete para medir el import en frío
+_PROBE = """
+import json, time
+start = time.perf_counter()
+import app as module
+imported = time.perf_counter()
+app = module.create_app()
+created = time.perf_counter()
+client = app.test_client()
+status = client.get({path!r}).status_code
+first = time.perf_counter()
+client.get({path!r})
+second = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "first_request_ms": (first - created) * 1000,
+    "second_request_ms": (second - first) * 1000,
+    "status": status
+}}))
+"""
+
+APPS = {
+    "lab03_OauthFlask": ("lab03_OauthFlask", "/api/auth/jwks"),
+    "FlaskBlueprints": ("FlaskBlueprints", "/autores")
+}
+
+
+def probe(directory, path, env):
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(path=path)],
+        cwd=os.path.join(ROOT, directory), env=env,
+        capture_output=True, text=True, check=True
+    )
+    # La última línea es el JSON; antes pueden venir los prints de la app
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    return {
+        "min": round(min(samples), 3),
+        "median": round(statistics.median(samples), 3),
+        "max": round(max(samples), 3)
+    }
+
+
+def run(runs, dsn_down):
+    env = dict(os.environ)
+    if dsn_down:
+        env["DATABASE_URL"] = "postgresql://bench@127.0.0.1:9/bench"
+
+    results = []
+    for name, (directory, path) in APPS.items():
+        samples = [probe(directory, path, env) for _ in range(runs)]
+        results.append({
+            "app": name,
+            "path": path,
+            "status": sorted({s["status"] for s in samples}),
+            **{key: summarize([s[key] for s in samples])
+               for key in ("import_ms", "create_app_ms", "first_request_ms", "second_request_ms")}
+        })
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": runs,
+            "dsn_down": dsn_down
+        },
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque y primera solicitud")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--dsn-down", action="store_true",
+                        help="Apunta DATABASE_URL a un puerto cerrado")
+    parser.add_argument("--output", help="Archivo JSON de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    report = run(args.runs, args.dsn_down)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+from quart import Blueprint, request, jsonify
+from models.async_autor import AsyncAutor
+from models.autor import AUTOR_ORDEN
+from middlewares.async_auth_middleware import token_required
+from blueprints.async_errors import error_response
+from blueprints.pagination import page_args, next_cursor, NEXT_CURSOR_HEADER
+
+autor_bp = Blueprint('autor', __name__)
+
+@autor_bp.route('/', methods=['GET'])
+@token_required(scopes=["autores:leer"])
+async def get_autores():
+    try:
+        limite, despues_de = page_args(request.args, AUTOR_ORDEN)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        autores = await AsyncAutor.get_page(limite, despues_de)
+        response = jsonify(autores)
+        cursor = next_cursor(autores, limite, AUTOR_ORDEN)
+        if cursor:
+            response.headers[NEXT_CURSOR_HEADER] = cursor
+        return response, 200
+    except Exception as e:
+        return await error_response(e)
+
+@autor_bp.route('/<int:autor_id>', methods=['GET'])
+@token_required(scopes=["autores:leer"])
+async def get_autor(autor_id):
+    try:
+        autor = await AsyncAutor.get_by_id(autor_id)
+        if autor:
+            return jsonify(autor), 200
+        return jsonify({"error": "Autor no encontrado"}), 404
+    except Exception as e:
+        return await error_response(e)
+
+@autor_bp.route('/', methods=['POST'])
+@token_required(scopes=["autores:escribir"])
+async def create_autor():
+    try:
+        data = await request.get_json()
+        
+        if not data or not data.get('nombre') or not data.get('apellido'):
+            return jsonify({"error": "Se requieren nombre y apellido"}), 400
+        
+        autor = AsyncAutor(
+            nombre=data.get('nombre'),
+            apellido=data.get('apellido'),
+            fecha_nacimiento=data.get('fecha_nacimiento'),
+            nacionalidad=data.get('nacionalidad')
+        )
+        
+        result = await autor.save()
+        if result:
+            return jsonify(result), 201
+        return jsonify({"error": "Error al crear autor"}), 500
+    except Exception as e:
+        return await error_response(e)
+
+@autor_bp.route('/<int:autor_id>', methods=['PUT'])
+@token_required(scopes=["autores:escribir"])
+async def update_autor(autor_id):
+    try:
+        data = await request.get_json()
+        
+        if not data:
+            return jsonify({"error": "No se proporcionaron datos"}), 400
+        
+        autor_existente = await AsyncAutor.get_by_id(autor_id)
+        if not autor_existente:
+            return jsonify({"error": "Autor no encontrado"}), 404
+        
+        autor = AsyncAutor(
+            id=autor_id,
+            nombre=data.get('nombre', autor_existente['nombre']),
+            apellido=data.get('apellido', autor_existente['apellido']),
+            fecha_nacimiento=data.get('fecha_nacimiento', autor_existente['fecha_nacimiento']),
+            nacionalidad=data.get('nacionalidad', autor_existente['nacionalidad'])
+        )
+        
+        result = await autor.save()
+        if result:
+            return jsonify(result), 200
+        return jsonify({"error": "Error al actualizar autor"}), 500
+    except Exception as e:
+        return await error_response(e)
+
+@autor_bp.route('/<int:autor_id>', methods=['DELETE'])
+@token_required(scopes=["autores:escribir"])
+async def delete_autor(autor_id):
+    try:
+        if await AsyncAutor.delete(autor_id):
+            return jsonify({"message": "Autor eliminado correctamente"}), 200
+        return jsonify({"error": "Autor no encontrado"}), 404
+    except Exception as e:
+        return await error_response(e)
\ No newline at end of file
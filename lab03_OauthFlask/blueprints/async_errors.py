@@ -0,0 +1,21 @@
+from quart import jsonify
+from db.connection_pool import PoolTimeoutError
+
+async def error_response(e):
+    """
+    Igual que blueprints.errors.error_response, para las vistas de Quart
+    """
+    if isinstance(e, PoolTimeoutError):
+        return await pool_timeout(e)
+    return jsonify({"error": str(e)}), 500
+
+async def pool_timeout(e):
+    response = jsonify({"error": "Servicio saturado, intente nuevamente"})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+
+async def database_unavailable():
+    response = jsonify({"error": "Base de datos no disponible, intente nuevamente"})
+    response.headers['Retry-After'] = '5'
+    return response, 503
@@ -0,0 +1,93 @@
+from quart import Blueprint, request, jsonify
+from models.async_genero import AsyncGenero
+from models.genero import GENERO_ORDEN
+from middlewares.async_auth_middleware import token_required
+from blueprints.async_errors import error_response
+from blueprints.pagination import page_args, next_cursor, NEXT_CURSOR_HEADER
+
+genero_bp = Blueprint('genero', __name__)
+
+@genero_bp.route('/', methods=['GET'])
+@token_required(scopes=["generos:leer"])
+async def get_generos():
+    try:
+        limite, despues_de = page_args(request.args, GENERO_ORDEN)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        generos = await AsyncGenero.get_page(limite, despues_de)
+        response = jsonify(generos)
+        cursor = next_cursor(generos, limite, GENERO_ORDEN)
+        if cursor:
+            response.headers[NEXT_CURSOR_HEADER] = cursor
+        return response, 200
+    except Exception as e:
+        return await error_response(e)
+
+@genero_bp.route('/<int:genero_id>', methods=['GET'])
+@token_required(scopes=["generos:leer"])
+async def get_genero(genero_id):
+    try:
+        genero = await AsyncGenero.get_by_id(genero_id)
+        if genero:
+            return jsonify(genero), 200
+        return jsonify({"error": "Género no encontrado"}), 404
+    except Exception as e:
+        return await error_response(e)
+
+@genero_bp.route('/', methods=['POST'])
+@token_required(scopes=["generos:escribir"])
+async def create_genero():
+    try:
+        data = await request.get_json()
+        
+        if not data or not data.get('nombre'):
+            return jsonify({"error": "Se requiere nombre del género"}), 400
+        
+        genero = AsyncGenero(
+            nombre=data.get('nombre'),
+            descripcion=data.get('descripcion')
+        )
+        
+        result = await genero.save()
+        if result:
+            return jsonify(result), 201
+        return jsonify({"error": "Error al crear género"}), 500
+    except Exception as e:
+        return await error_response(e)
+
+@genero_bp.route('/<int:genero_id>', methods=['PUT'])
+@token_required(scopes=["generos:escribir"])
+async def update_genero(genero_id):
+    try:
+        data = await request.get_json()
+        
+        if not data:
+            return jsonify({"error": "No se proporcionaron datos"}), 400
+        
+        genero_existente = await AsyncGenero.get_by_id(genero_id)
+        if not genero_existente:
+            return jsonify({"error": "Género no encontrado"}), 404
+        
+        genero = AsyncGenero(
+            id=genero_id,
+            nombre=data.get('nombre', genero_existente['nombre']),
+            descripcion=data.get('descripcion', genero_existente['descripcion'])
+        )
+        
+        result = await genero.save()
+        if result:
+            return jsonify(result), 200
+        return jsonify({"error": "Error al actualizar género"}), 500
+    except Exception as e:
+        return await error_response(e)
+
+@genero_bp.route('/<int:genero_id>', methods=['DELETE'])
+@token_required(scopes=["generos:escribir"])
+async def delete_genero(genero_id):
+    try:
+        if await AsyncGenero.delete(genero_id):
+            return jsonify({"message": "Género eliminado correctamente"}), 200
+        return jsonify({"error": "Género no encontrado"}), 404
+    except Exception as e:
+        return await error_response(e)
\ No newline at end of file
@@ -0,0 +1,230 @@
+from quart import Blueprint, request, jsonify
+from models.async_libro import AsyncLibro
+from models.libro import LIBRO_ORDEN, LIBRO_BUSQUEDA_ORDEN, LIBRO_RELACIONES
+from middlewares.async_auth_middleware import token_required
+from blueprints.async_errors import error_response
+from blueprints.pagination import page_args, include_args, next_cursor, NEXT_CURSOR_HEADER
+from blueprints.bulk import bulk_rows
+
+libro_bp = Blueprint('libro', __name__)
+
+@libro_bp.route('/', methods=['GET'])
+@token_required(scopes=["libros:leer"])
+async def get_libros():
+    try:
+        limite, despues_de = page_args(request.args, LIBRO_ORDEN)
+        include = include_args(request.args, LIBRO_RELACIONES)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        libros = await AsyncLibro.get_page(limite, despues_de, include)
+        response = jsonify(libros)
+        cursor = next_cursor(libros, limite, LIBRO_ORDEN)
+        if cursor:
+            response.headers[NEXT_CURSOR_HEADER] = cursor
+        return response, 200
+    except Exception as e:
+        return await error_response(e)
+
+@libro_bp.route('/search', methods=['GET'])
+@token_required(scopes=["libros:leer"])
+async def search_libros():
+    q = request.args.get('q', '').strip()
+    if not q:
+        return jsonify({"error": "Se requiere q"}), 400
+    try:
+        limite, despues_de = page_args(request.args, LIBRO_BUSQUEDA_ORDEN)
+        include = include_args(request.args, LIBRO_RELACIONES)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        libros = await AsyncLibro.search(q, limite, despues_de, include)
+        response = jsonify(libros)
+        cursor = next_cursor(libros, limite, LIBRO_BUSQUEDA_ORDEN)
+        if cursor:
+            response.headers[NEXT_CURSOR_HEADER] = cursor
+        return response, 200
+    except Exception as e:
+        return await error_response(e)
+
+@libro_bp.route('/<int:libro_id>', methods=['GET'])
+@token_required(scopes=["libros:leer"])
+async def get_libro(libro_id):
+    try:
+        libro = await AsyncLibro.get_by_id(libro_id)
+        if libro:
+            return jsonify(libro), 200
+        return jsonify({"error": "Libro no encontrado"}), 404
+    except Exception as e:
+        return await error_response(e)
+
+@libro_bp.route('/', methods=['POST'])
+@token_required(scopes=["libros:escribir"])
+async def create_libro():
+    try:
+        data = await request.get_json()
+        
+        if not data or not data.get('titulo'):
+            return jsonify({"error": "Se requiere título del libro"}), 400
+        
+        libro = AsyncLibro(
+            titulo=data.get('titulo'),
+            isbn=data.get('isbn'),
+            fecha_publicacion=data.get('fecha_publicacion'),
+            descripcion=data.get('descripcion')
+        )
+        
+        result = await libro.save()
+        
+        if result and data.get('autores'):
+            for autor_id in data.get('autores'):
+                await AsyncLibro.add_autor(result['id'], autor_id)
+        
+        if result and data.get('generos'):
+            for genero_id in data.get('generos'):
+                await AsyncLibro.add_genero(result['id'], genero_id)
+        
+        if result:
+            return jsonify(await AsyncLibro.get_by_id(result['id'])), 201
+        return jsonify({"error": "Error al crear libro"}), 500
+    except Exception as e:
+        return await error_response(e)
+
+@libro_bp.route('/<int:libro_id>', methods=['PUT'])
+@token_required(scopes=["libros:escribir"])
+async def update_libro(libro_id):
+    try:
+        data = await request.get_json()
+        
+        if not data:
+            return jsonify({"error": "No se proporcionaron datos"}), 400
+        
+        libro_existente = await AsyncLibro.get_by_id(libro_id)
+        if not libro_existente:
+            return jsonify({"error": "Libro no encontrado"}), 404
+        
+        libro = AsyncLibro(
+            id=libro_id,
+            titulo=data.get('titulo', libro_existente['titulo']),
+            isbn=data.get('isbn', libro_existente['isbn']),
+            fecha_publicacion=data.get('fecha_publicacion', libro_existente['fecha_publicacion']),
+            descripcion=data.get('descripcion', libro_existente['descripcion'])
+        )
+        
+        result = await libro.save()
+        
+        # Update authors if provided
+        if result and 'autores' in data:
+            await AsyncLibro.set_autores(libro_id, data['autores'])
+        
+        # Update genres if provided
+        if result and 'generos' in data:
+            await AsyncLibro.set_generos(libro_id, data['generos'])
+        
+        if result:
+            return jsonify(await AsyncLibro.get_by_id(libro_id)), 200
+        return jsonify({"error": "Error al actualizar libro"}), 500
+    except Exception as e:
+        return await error_response(e)
+
+@libro_bp.route('/<int:libro_id>', methods=['DELETE'])
+@token_required(scopes=["libros:escribir"])
+async def delete_libro(libro_id):
+    try:
+        if await AsyncLibro.delete(libro_id):
+            return jsonify({"message": "Libro eliminado correctamente"}), 200
+        return jsonify({"error": "Libro no encontrado"}), 404
+    except Exception as e:
+        return await error_response(e)
+
+@libro_bp.route('/bulk', methods=['POST'])
+@token_required(scopes=["libros:escribir"])
+async def bulk_create_libros():
+    """
+    Crea muchos libros de una vez: {"libros": [{"titulo": ..., "autores": [ids],
+    "generos": [ids]}, ...]}. Las filas con errores se informan por índice
+    y no impiden que se carguen las demás.
+    """
+    try:
+        filas, errores = bulk_rows(await request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        result = await AsyncLibro.bulk_create(filas) if filas else ([], [])
+        if result is None:
+            return jsonify({"error": "Error al crear libros"}), 500
+        creados, errores_lote = result
+        errores = sorted(errores + errores_lote, key=lambda error: error['indice'])
+        status = 201 if not errores else 200 if creados else 400
+        return jsonify({"creados": creados, "errores": errores}), status
+    except Exception as e:
+        return await error_response(e)
+
+@libro_bp.route('/<int:libro_id>/autores/<int:autor_id>', methods=['POST'])
+@token_required(scopes=["libros:escribir"])
+async def add_autor_to_libro(libro_id, autor_id):
+    try:
+        if await AsyncLibro.add_autor(libro_id, autor_id):
+            return jsonify({"message": "Autor añadido al libro correctamente"}), 201
+        return jsonify({"error": "Error al añadir autor al libro"}), 500
+    except Exception as e:
+        return await error_response(e)
+
+@libro_bp.route('/<int:libro_id>/autores/<int:autor_id>', methods=['DELETE'])
+@token_required(scopes=["libros:escribir"])
+async def remove_autor_from_libro(libro_id, autor_id):
+    try:
+        if await AsyncLibro.remove_autor(libro_id, autor_id):
+            return jsonify({"message": "Autor eliminado del libro correctamente"}), 200
+        return jsonify({"error": "Error al eliminar autor del libro"}), 500
+    except Exception as e:
+        return await error_response(e)
+
+@libro_bp.route('/<int:libro_id>/generos/<int:genero_id>', methods=['POST'])
+@token_required(scopes=["libros:escribir"])
+async def add_genero_to_libro(libro_id, genero_id):
+    try:
+        if await AsyncLibro.add_genero(libro_id, genero_id):
+            return jsonify({"message": "Género añadido al libro correctamente"}), 201
+        return jsonify({"error": "Error al añadir género al libro"}), 500
+    except Exception as e:
+        return await error_response(e)
+
+@libro_bp.route('/<int:libro_id>/generos/<int:genero_id>', methods=['DELETE'])
+@token_required(scopes=["libros:escribir"])
+async def remove_genero_from_libro(libro_id, genero_id):
+    try:
+        if await AsyncLibro.remove_genero(libro_id, genero_id):
+            return jsonify({"message": "Género eliminado del libro correctamente"}), 200
+        return jsonify({"error": "Error al eliminar género del libro"}), 500
+    except Exception as e:
+        return await error_response(e)
+
+
+@libro_bp.route('/por-genero/<int:genero_id>', methods=['GET'])
+@token_required(scopes=["libros:leer"])
+async def get_libros_por_genero(genero_id):
+    """
+    Obtiene todos los libros de un género específico
+    """
+    try:
+        libros = await AsyncLibro.get_by_genero(genero_id)
+        if libros:
+            return jsonify(libros), 200
+        return jsonify({"message": "No se encontraron libros para este género"}), 404
+    except Exception as e:
+        return await error_response(e)
+
+@libro_bp.route('/por-autor/<int:autor_id>', methods=['GET'])
+@token_required(scopes=["libros:leer"])
+async def get_libros_por_autor(autor_id):
+    """
+    Obtiene todos los libros de un autor específico
+    """
+    try:
+        libros = await AsyncLibro.get_by_autor(autor_id)
+        if libros:
+            return jsonify(libros), 200
+        return jsonify({"message": "No se encontraron libros para este autor"}), 404
+    except Exception as e:
+        return await error_response(e)
\ No newline at end of file
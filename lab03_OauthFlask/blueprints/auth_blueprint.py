@@ -1,20 +1,37 @@
 from flask import Blueprint, request, jsonify
 import jwt
 import datetime
-import uuid
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
+from middlewares.auth_middleware import token_required, verify_token, JWT_ISSUER, JWT_AUDIENCE, SCOPES
+from auth_comun import KeyRing, TokenCache, emitir_token
+from middlewares.revocation_list import RevocationList
+from middlewares.client_registry import ClientRegistry
+from models.refresh_token import RefreshToken
+from db.connection_pool import PostgreSQLConnectionPool
+from middlewares.rate_limit import rate_limited, too_many_requests, token_limiter, token_ip_limiter, api_limiter
+from config import Config
 
 auth_bp = Blueprint('auth', __name__)
 
-# En una aplicación real, almacenar estos datos de forma segura
-CLIENT_ID = os.getenv("CLIENT_ID", "test_client")
-CLIENT_SECRET = os.getenv("CLIENT_SECRET", "test_secret")
-JWT_SECRET = os.getenv("JWT_SECRET", "mi_clave_super_secreta")
+INTROSPECT_MAX_BATCH = Config.INTROSPECT_MAX_BATCH
+
+def _introspect(token):
+    # RFC 7662: un token inválido, expirado o revocado es simplemente inactivo
+    if not isinstance(token, str) or not token:
+        return {"active": False}
+    try:
+        payload = verify_token(token)
+    except jwt.InvalidTokenError:
+        return {"active": False}
+    return {"active": True, "token_type": "bearer", "client_id": payload.get('sub'), **payload}
+
+def _emitir_token(client, scope=""):
+    # Crear token JWT
+    return emitir_token(KeyRing.get_instance(), client['client_id'], client['token_lifetime'],
+                        issuer=JWT_ISSUER, audience=JWT_AUDIENCE, scope=scope)
 
 @auth_bp.route('/token', methods=['POST'])
+# El client_id del cuerpo no está autenticado: cambiarlo no debe dar un bucket nuevo
+@rate_limited(token_ip_limiter, lambda: request.remote_addr)
 def token():
     try:
         data = request.get_json()
@@ -22,24 +39,138 @@ def token():
         if not data:
             return jsonify({"error": "No se proporcionaron datos"}), 400
         
-        # Validación simple
-        if data.get('client_id') != CLIENT_ID or data.get('client_secret') != CLIENT_SECRET:
+        grant_type = data.get('grant_type', 'client_credentials')
+        if grant_type not in ('client_credentials', 'refresh_token'):
+            return jsonify({"error": "grant_type_no_soportado"}), 400
+        
+        # RFC 6749 §6: un cliente confidencial se autentica también al renovar
+        client = ClientRegistry.get_instance().authenticate(data.get('client_id'), data.get('client_secret'))
+        if not client:
             return jsonify({"error": "cliente_invalido"}), 401
+        allowed, retry_after = token_limiter.allow(client['client_id'])
+        if not allowed:
+            return too_many_requests(retry_after)
         
-        # Crear token JWT
-        expiration = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
-        payload = {
-            "sub": CLIENT_ID,
-            "exp": expiration,
-            "jti": str(uuid.uuid4())
+        if grant_type == 'refresh_token':
+            if not data.get('refresh_token'):
+                return jsonify({"error": "No se proporcionó refresh_token"}), 400
+            
+            # Solo se consume un token emitido a este mismo cliente
+            resultado, scope, refresh_token = RefreshToken.rotar(data['refresh_token'], client['client_id'])
+            if resultado == RefreshToken.REUTILIZADO:
+                return jsonify({"error": "refresh_token_reutilizado"}), 401
+            if resultado != RefreshToken.OK:
+                return jsonify({"error": "refresh_token_invalido"}), 401
+            
+            # Nunca más scopes que los del token original ni que los actuales del cliente
+            originales = scope.split() if scope is not None else client['scopes'].split()
+            permitidos = " ".join(s for s in originales if s in client['scopes'].split())
+            scope = SCOPES.grant(data.get('scope'), permitidos)
+            if scope is None:
+                return jsonify({"error": "scope_invalido"}), 400
+        else:
+            scope = SCOPES.grant(data.get('scope'), client['scopes'])
+            if scope is None:
+                return jsonify({"error": "scope_invalido"}), 400
+            
+            refresh_token = RefreshToken.crear(client['client_id'], scope)
+        
+        respuesta = {
+            "token_acceso": _emitir_token(client, scope),
+            "tipo_token": "bearer",
+            "expira_en": client['token_lifetime'],
+            "scope": scope
         }
+        if refresh_token:
+            respuesta["refresh_token"] = refresh_token
         
-        token = jwt.encode(payload, JWT_SECRET, algorithm="HS256")
+        return jsonify(respuesta)
+    except Exception as e:
+        return jsonify({"error": f"Error al generar token: {str(e)}"}), 500
+
+@auth_bp.route('/jwks', methods=['GET'])
+def jwks():
+    # Claves públicas para que los servidores de recursos verifiquen sin compartir secretos
+    return jsonify(KeyRing.get_instance().to_jwks()), 200
+
+@auth_bp.route('/revoke', methods=['POST'])
+def revoke():
+    try:
+        data = request.get_json()
         
-        return jsonify({
-            "token_acceso": token,
-            "tipo_token": "bearer",
-            "expira_en": 3600
-        })
+        if not data or not data.get('token'):
+            return jsonify({"error": "No se proporcionaron datos"}), 400
+        
+        if not ClientRegistry.get_instance().authenticate(data.get('client_id'), data.get('client_secret')):
+            return jsonify({"error": "cliente_invalido"}), 401
+        
+        try:
+            payload = KeyRing.get_instance().decode(data['token'])
+        except jwt.ExpiredSignatureError:
+            # Un token expirado ya no es aceptado, no hace falta revocarlo
+            return jsonify({"mensaje": "Token revocado"}), 200
+        except jwt.InvalidTokenError:
+            return jsonify({"error": "token_invalido"}), 400
+        
+        if payload.get('sub') != data.get('client_id') or not payload.get('jti'):
+            return jsonify({"error": "token_invalido"}), 400
+        
+        expira_en = datetime.datetime.utcfromtimestamp(payload['exp']) if payload.get('exp') else None
+        if not RevocationList.get_instance().revoke(payload['jti'], expira_en):
+            return jsonify({"error": "Error al revocar token"}), 500
+        
+        return jsonify({"mensaje": "Token revocado"}), 200
+    except Exception as e:
+        return jsonify({"error": f"Error al revocar token: {str(e)}"}), 500
+
+@auth_bp.route('/introspect', methods=['POST'])
+def introspect():
+    """
+    Introspección de tokens (RFC 7662). Acepta un token o una lista de
+    tokens ("tokens") para validar varios en una sola llamada.
+    """
+    try:
+        data = request.get_json(silent=True) or request.form.to_dict()
+        
+        # Autenticación del cliente por HTTP Basic o en el cuerpo
+        auth = request.authorization
+        client_id = auth.username if auth else data.get('client_id')
+        client_secret = auth.password if auth else data.get('client_secret')
+        if not ClientRegistry.get_instance().authenticate(client_id, client_secret):
+            return jsonify({"error": "cliente_invalido"}), 401
+        
+        if 'tokens' in data:
+            tokens = data['tokens']
+            if not isinstance(tokens, list):
+                return jsonify({"error": "tokens debe ser una lista"}), 400
+            if len(tokens) > INTROSPECT_MAX_BATCH:
+                return jsonify({"error": f"Máximo {INTROSPECT_MAX_BATCH} tokens por solicitud"}), 400
+            return jsonify({"resultados": [_introspect(t) for t in tokens]}), 200
+        
+        if not data.get('token'):
+            return jsonify({"error": "No se proporcionaron datos"}), 400
+        
+        return jsonify(_introspect(data['token'])), 200
     except Exception as e:
-        return jsonify({"error": f"Error al generar token: {str(e)}"}), 500
\ No newline at end of file
+        return jsonify({"error": f"Error al introspeccionar token: {str(e)}"}), 500
+
+@auth_bp.route('/revocation-stats', methods=['GET'])
+@token_required(scopes=["admin"])
+def revocation_stats():
+    return jsonify(RevocationList.get_instance().stats()), 200
+
+@auth_bp.route('/cache-stats', methods=['GET'])
+@token_required(scopes=["admin"])
+def cache_stats():
+    return jsonify(TokenCache.get_instance().stats()), 200
+
+@auth_bp.route('/rate-limit-stats', methods=['GET'])
+@token_required(scopes=["admin"])
+def rate_limit_stats():
+    return jsonify({"api": api_limiter.stats(), "token_ip": token_ip_limiter.stats(),
+                    "token": token_limiter.stats()}), 200
+
+@auth_bp.route('/pool-stats', methods=['GET'])
+@token_required(scopes=["admin"])
+def pool_stats():
+    return jsonify(PostgreSQLConnectionPool.get_instance().stats()), 200
@@ -1,20 +1,30 @@
 from flask import Blueprint, request, jsonify
-from models.autor import Autor
+from models.autor import Autor, AUTOR_ORDEN
 from middlewares.auth_middleware import token_required
+from blueprints.errors import error_response
+from blueprints.pagination import page_args, next_cursor, NEXT_CURSOR_HEADER
 
 autor_bp = Blueprint('autor', __name__)
 
 @autor_bp.route('/', methods=['GET'])
-@token_required
+@token_required(scopes=["autores:leer"])
 def get_autores():
     try:
-        autores = Autor.get_all()
-        return jsonify(autores), 200
+        limite, despues_de = page_args(request.args, AUTOR_ORDEN)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        autores = Autor.get_page(limite, despues_de)
+        response = jsonify(autores)
+        cursor = next_cursor(autores, limite, AUTOR_ORDEN)
+        if cursor:
+            response.headers[NEXT_CURSOR_HEADER] = cursor
+        return response, 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 @autor_bp.route('/<int:autor_id>', methods=['GET'])
-@token_required
+@token_required(scopes=["autores:leer"])
 def get_autor(autor_id):
     try:
         autor = Autor.get_by_id(autor_id)
@@ -22,10 +32,10 @@ def get_autor(autor_id):
             return jsonify(autor), 200
         return jsonify({"error": "Autor no encontrado"}), 404
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 @autor_bp.route('/', methods=['POST'])
-@token_required
+@token_required(scopes=["autores:escribir"])
 def create_autor():
     try:
         data = request.get_json()
@@ -45,10 +55,10 @@ def create_autor():
             return jsonify(result), 201
         return jsonify({"error": "Error al crear autor"}), 500
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 @autor_bp.route('/<int:autor_id>', methods=['PUT'])
-@token_required
+@token_required(scopes=["autores:escribir"])
 def update_autor(autor_id):
     try:
         data = request.get_json()
@@ -73,14 +83,14 @@ def update_autor(autor_id):
             return jsonify(result), 200
         return jsonify({"error": "Error al actualizar autor"}), 500
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 @autor_bp.route('/<int:autor_id>', methods=['DELETE'])
-@token_required
+@token_required(scopes=["autores:escribir"])
 def delete_autor(autor_id):
     try:
         if Autor.delete(autor_id):
             return jsonify({"message": "Autor eliminado correctamente"}), 200
         return jsonify({"error": "Autor no encontrado"}), 404
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return error_response(e)
\ No newline at end of file
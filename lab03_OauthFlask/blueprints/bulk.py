@@ -0,0 +1,59 @@
+import datetime
+from config import Config
+
+def bulk_rows(data):
+    """
+    Valida el cuerpo de POST /libros/bulk ({"libros": [...]}). Devuelve
+    (filas, errores): las filas válidas con su índice en la lista original
+    y los errores de las demás. Lanza ValueError si el cuerpo no sirve.
+    """
+    libros = data.get('libros') if isinstance(data, dict) else None
+    if not isinstance(libros, list) or not libros:
+        raise ValueError("Se requiere libros, una lista no vacía")
+    if len(libros) > Config.BULK_MAX_ROWS:
+        raise ValueError(f"Máximo {Config.BULK_MAX_ROWS} libros por solicitud")
+
+    filas, errores = [], []
+    for indice, libro in enumerate(libros):
+        try:
+            filas.append(_fila(indice, libro))
+        except ValueError as e:
+            errores.append({"indice": indice, "error": str(e)})
+    return filas, errores
+
+def _fila(indice, libro):
+    if not isinstance(libro, dict):
+        raise ValueError("Cada libro debe ser un objeto")
+    titulo = libro.get('titulo')
+    if not isinstance(titulo, str) or not titulo.strip():
+        raise ValueError("Se requiere título del libro")
+    if len(titulo) > 200:
+        raise ValueError("titulo admite hasta 200 caracteres")
+    isbn = libro.get('isbn')
+    if isbn is not None and (not isinstance(isbn, str) or len(isbn) > 20):
+        raise ValueError("isbn debe ser un texto de hasta 20 caracteres")
+    descripcion = libro.get('descripcion')
+    if descripcion is not None and not isinstance(descripcion, str):
+        raise ValueError("descripcion debe ser un texto")
+    fecha = libro.get('fecha_publicacion')
+    if fecha is not None:
+        try:
+            fecha = datetime.date.fromisoformat(fecha)
+        except (TypeError, ValueError):
+            raise ValueError("fecha_publicacion debe tener formato AAAA-MM-DD")
+    return {
+        "indice": indice,
+        "titulo": titulo,
+        "isbn": isbn or None,
+        "fecha_publicacion": fecha,
+        "descripcion": descripcion,
+        "autores": _ids(libro.get('autores'), 'autores'),
+        "generos": _ids(libro.get('generos'), 'generos')
+    }
+
+def _ids(valores, campo):
+    if valores is None:
+        return []
+    if not isinstance(valores, list) or not all(isinstance(v, int) and not isinstance(v, bool) for v in valores):
+        raise ValueError(f"{campo} debe ser una lista de ids")
+    return list(dict.fromkeys(valores))
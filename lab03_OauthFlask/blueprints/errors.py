@@ -0,0 +1,22 @@
+from flask import jsonify
+from db.connection_pool import PoolTimeoutError
+
+def error_response(e):
+    """
+    Respuesta para una excepción no prevista en una vista. Si el pool está
+    saturado se responde 503 para que el cliente reintente.
+    """
+    if isinstance(e, PoolTimeoutError):
+        return pool_timeout(e)
+    return jsonify({"error": str(e)}), 500
+
+def pool_timeout(e):
+    response = jsonify({"error": "Servicio saturado, intente nuevamente"})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+
+def database_unavailable():
+    response = jsonify({"error": "Base de datos no disponible, intente nuevamente"})
+    response.headers['Retry-After'] = '5'
+    return response, 503
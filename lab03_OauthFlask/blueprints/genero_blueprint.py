@@ -1,20 +1,30 @@
 from flask import Blueprint, request, jsonify
-from models.genero import Genero
+from models.genero import Genero, GENERO_ORDEN
 from middlewares.auth_middleware import token_required
+from blueprints.errors import error_response
+from blueprints.pagination import page_args, next_cursor, NEXT_CURSOR_HEADER
 
 genero_bp = Blueprint('genero', __name__)
 
 @genero_bp.route('/', methods=['GET'])
-@token_required
+@token_required(scopes=["generos:leer"])
 def get_generos():
     try:
-        generos = Genero.get_all()
-        return jsonify(generos), 200
+        limite, despues_de = page_args(request.args, GENERO_ORDEN)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        generos = Genero.get_page(limite, despues_de)
+        response = jsonify(generos)
+        cursor = next_cursor(generos, limite, GENERO_ORDEN)
+        if cursor:
+            response.headers[NEXT_CURSOR_HEADER] = cursor
+        return response, 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 @genero_bp.route('/<int:genero_id>', methods=['GET'])
-@token_required
+@token_required(scopes=["generos:leer"])
 def get_genero(genero_id):
     try:
         genero = Genero.get_by_id(genero_id)
@@ -22,10 +32,10 @@ def get_genero(genero_id):
             return jsonify(genero), 200
         return jsonify({"error": "Género no encontrado"}), 404
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 @genero_bp.route('/', methods=['POST'])
-@token_required
+@token_required(scopes=["generos:escribir"])
 def create_genero():
     try:
         data = request.get_json()
@@ -43,10 +53,10 @@ def create_genero():
             return jsonify(result), 201
         return jsonify({"error": "Error al crear género"}), 500
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 @genero_bp.route('/<int:genero_id>', methods=['PUT'])
-@token_required
+@token_required(scopes=["generos:escribir"])
 def update_genero(genero_id):
     try:
         data = request.get_json()
@@ -69,14 +79,14 @@ def update_genero(genero_id):
             return jsonify(result), 200
         return jsonify({"error": "Error al actualizar género"}), 500
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 @genero_bp.route('/<int:genero_id>', methods=['DELETE'])
-@token_required
+@token_required(scopes=["generos:escribir"])
 def delete_genero(genero_id):
     try:
         if Genero.delete(genero_id):
             return jsonify({"message": "Género eliminado correctamente"}), 200
         return jsonify({"error": "Género no encontrado"}), 404
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return error_response(e)
\ No newline at end of file
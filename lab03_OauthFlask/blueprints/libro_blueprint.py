@@ -1,20 +1,53 @@
 from flask import Blueprint, request, jsonify
-from models.libro import Libro
+from models.libro import Libro, LIBRO_ORDEN, LIBRO_BUSQUEDA_ORDEN, LIBRO_RELACIONES
 from middlewares.auth_middleware import token_required
+from blueprints.errors import error_response
+from blueprints.pagination import page_args, include_args, next_cursor, NEXT_CURSOR_HEADER
+from blueprints.bulk import bulk_rows
 
 libro_bp = Blueprint('libro', __name__)
 
 @libro_bp.route('/', methods=['GET'])
-@token_required
+@token_required(scopes=["libros:leer"])
 def get_libros():
     try:
-        libros = Libro.get_all()
-        return jsonify(libros), 200
+        limite, despues_de = page_args(request.args, LIBRO_ORDEN)
+        include = include_args(request.args, LIBRO_RELACIONES)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        libros = Libro.get_page(limite, despues_de, include)
+        response = jsonify(libros)
+        cursor = next_cursor(libros, limite, LIBRO_ORDEN)
+        if cursor:
+            response.headers[NEXT_CURSOR_HEADER] = cursor
+        return response, 200
+    except Exception as e:
+        return error_response(e)
+
+@libro_bp.route('/search', methods=['GET'])
+@token_required(scopes=["libros:leer"])
+def search_libros():
+    q = request.args.get('q', '').strip()
+    if not q:
+        return jsonify({"error": "Se requiere q"}), 400
+    try:
+        limite, despues_de = page_args(request.args, LIBRO_BUSQUEDA_ORDEN)
+        include = include_args(request.args, LIBRO_RELACIONES)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        libros = Libro.search(q, limite, despues_de, include)
+        response = jsonify(libros)
+        cursor = next_cursor(libros, limite, LIBRO_BUSQUEDA_ORDEN)
+        if cursor:
+            response.headers[NEXT_CURSOR_HEADER] = cursor
+        return response, 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 @libro_bp.route('/<int:libro_id>', methods=['GET'])
-@token_required
+@token_required(scopes=["libros:leer"])
 def get_libro(libro_id):
     try:
         libro = Libro.get_by_id(libro_id)
@@ -22,10 +55,10 @@ def get_libro(libro_id):
             return jsonify(libro), 200
         return jsonify({"error": "Libro no encontrado"}), 404
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 @libro_bp.route('/', methods=['POST'])
-@token_required
+@token_required(scopes=["libros:escribir"])
 def create_libro():
     try:
         data = request.get_json()
@@ -54,11 +87,11 @@ def create_libro():
             return jsonify(Libro.get_by_id(result['id'])), 201
         return jsonify({"error": "Error al crear libro"}), 500
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 # blueprints/libro_blueprint.py (continued)
 @libro_bp.route('/<int:libro_id>', methods=['PUT'])
-@token_required
+@token_required(scopes=["libros:escribir"])
 def update_libro(libro_id):
     try:
         data = request.get_json()
@@ -82,101 +115,94 @@ def update_libro(libro_id):
         
         # Update authors if provided
         if result and 'autores' in data:
-            # Clear existing relationships
-            pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            try:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM libro_autor WHERE libro_id = %s", (libro_id,))
-                conn.commit()
-                
-                # Add new relationships
-                for autor_id in data['autores']:
-                    Libro.add_autor(libro_id, autor_id)
-            except Exception as e:
-                conn.rollback()
-                print(f"Error updating libro-autor relationships: {e}")
-            finally:
-                pool.release_connection(conn)
+            Libro.set_autores(libro_id, data['autores'])
         
         # Update genres if provided
         if result and 'generos' in data:
-            # Clear existing relationships
-            pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            try:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM libro_genero WHERE libro_id = %s", (libro_id,))
-                conn.commit()
-                
-                # Add new relationships
-                for genero_id in data['generos']:
-                    Libro.add_genero(libro_id, genero_id)
-            except Exception as e:
-                conn.rollback()
-                print(f"Error updating libro-genero relationships: {e}")
-            finally:
-                pool.release_connection(conn)
+            Libro.set_generos(libro_id, data['generos'])
         
         if result:
             return jsonify(Libro.get_by_id(libro_id)), 200
         return jsonify({"error": "Error al actualizar libro"}), 500
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 @libro_bp.route('/<int:libro_id>', methods=['DELETE'])
-@token_required
+@token_required(scopes=["libros:escribir"])
 def delete_libro(libro_id):
     try:
         if Libro.delete(libro_id):
             return jsonify({"message": "Libro eliminado correctamente"}), 200
         return jsonify({"error": "Libro no encontrado"}), 404
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
+
+@libro_bp.route('/bulk', methods=['POST'])
+@token_required(scopes=["libros:escribir"])
+def bulk_create_libros():
+    """
+    Crea muchos libros de una vez: {"libros": [{"titulo": ..., "autores": [ids],
+    "generos": [ids]}, ...]}. Las filas con errores se informan por índice
+    y no impiden que se carguen las demás.
+    """
+    try:
+        filas, errores = bulk_rows(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        result = Libro.bulk_create(filas) if filas else ([], [])
+        if result is None:
+            return jsonify({"error": "Error al crear libros"}), 500
+        creados, errores_lote = result
+        errores = sorted(errores + errores_lote, key=lambda error: error['indice'])
+        status = 201 if not errores else 200 if creados else 400
+        return jsonify({"creados": creados, "errores": errores}), status
+    except Exception as e:
+        return error_response(e)
 
 @libro_bp.route('/<int:libro_id>/autores/<int:autor_id>', methods=['POST'])
-@token_required
+@token_required(scopes=["libros:escribir"])
 def add_autor_to_libro(libro_id, autor_id):
     try:
         if Libro.add_autor(libro_id, autor_id):
             return jsonify({"message": "Autor añadido al libro correctamente"}), 201
         return jsonify({"error": "Error al añadir autor al libro"}), 500
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 @libro_bp.route('/<int:libro_id>/autores/<int:autor_id>', methods=['DELETE'])
-@token_required
+@token_required(scopes=["libros:escribir"])
 def remove_autor_from_libro(libro_id, autor_id):
     try:
         if Libro.remove_autor(libro_id, autor_id):
             return jsonify({"message": "Autor eliminado del libro correctamente"}), 200
         return jsonify({"error": "Error al eliminar autor del libro"}), 500
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 @libro_bp.route('/<int:libro_id>/generos/<int:genero_id>', methods=['POST'])
-@token_required
+@token_required(scopes=["libros:escribir"])
 def add_genero_to_libro(libro_id, genero_id):
     try:
         if Libro.add_genero(libro_id, genero_id):
             return jsonify({"message": "Género añadido al libro correctamente"}), 201
         return jsonify({"error": "Error al añadir género al libro"}), 500
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 @libro_bp.route('/<int:libro_id>/generos/<int:genero_id>', methods=['DELETE'])
-@token_required
+@token_required(scopes=["libros:escribir"])
 def remove_genero_from_libro(libro_id, genero_id):
     try:
         if Libro.remove_genero(libro_id, genero_id):
             return jsonify({"message": "Género eliminado del libro correctamente"}), 200
         return jsonify({"error": "Error al eliminar género del libro"}), 500
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @libro_bp.route('/por-genero/<int:genero_id>', methods=['GET'])
-@token_required
+@token_required(scopes=["libros:leer"])
 def get_libros_por_genero(genero_id):
     """
     Obtiene todos los libros de un género específico
@@ -187,10 +213,10 @@ def get_libros_por_genero(genero_id):
             return jsonify(libros), 200
         return jsonify({"message": "No se encontraron libros para este género"}), 404
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 @libro_bp.route('/por-autor/<int:autor_id>', methods=['GET'])
-@token_required
+@token_required(scopes=["libros:leer"])
 def get_libros_por_autor(autor_id):
     """
     Obtiene todos los libros de un autor específico
@@ -201,4 +227,4 @@ def get_libros_por_autor(autor_id):
             return jsonify(libros), 200
         return jsonify({"message": "No se encontraron libros para este autor"}), 404
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return error_response(e)
\ No newline at end of file
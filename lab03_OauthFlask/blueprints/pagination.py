@@ -0,0 +1,72 @@
+import base64
+import binascii
+import json
+from config import Config
+
+# Encabezado con el cursor de la página siguiente; el cuerpo sigue siendo un arreglo
+NEXT_CURSOR_HEADER = 'X-Siguiente-Cursor'
+# Rango de las columnas INTEGER (SERIAL)
+_INT_MIN, _INT_MAX = -2 ** 31, 2 ** 31 - 1
+
+def page_args(args, orden):
+    """
+    Lee ?limite y ?despues_de de la query string; orden son los pares
+    (columna, tipo) del listado. Devuelve (limite, despues_de) con
+    despues_de en None para la primera página. Lanza ValueError si alguno
+    no es válido, incluido un cursor con valores de otro tipo.
+    """
+    try:
+        limite = int(args.get('limite', Config.PAGE_DEFAULT_LIMIT))
+    except ValueError:
+        raise ValueError("limite debe ser un entero")
+    if limite < 1:
+        raise ValueError("limite debe ser mayor a 0")
+    limite = min(limite, Config.PAGE_MAX_LIMIT)
+
+    token = args.get('despues_de')
+    if not token:
+        return limite, None
+    try:
+        despues_de = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (ValueError, binascii.Error):
+        raise ValueError("despues_de no es un cursor válido")
+    if (not isinstance(despues_de, list) or len(despues_de) != len(orden)
+            or not all(_valido(valor, tipo) for valor, (_, tipo) in zip(despues_de, orden))):
+        raise ValueError("despues_de no es un cursor válido")
+    return limite, despues_de
+
+def _valido(valor, tipo):
+    # bool es un int para Python pero no para la base
+    if isinstance(valor, bool):
+        return False
+    if tipo is int:
+        return isinstance(valor, int) and _INT_MIN <= valor <= _INT_MAX
+    if tipo is float:
+        return isinstance(valor, (int, float))
+    return isinstance(valor, tipo)
+
+def next_cursor(rows, limite, orden):
+    """
+    Cursor opaco de la página siguiente (los valores de orden en la última
+    fila), o None si esta página no llegó al límite
+    """
+    if len(rows) < limite:
+        return None
+    valores = [rows[-1][columna] for columna, _ in orden]
+    raw = json.dumps(valores, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def include_args(args, allowed):
+    """
+    Lee ?include=autores,generos. Devuelve las relaciones pedidas sin
+    repetir; lanza ValueError si alguna no está en allowed.
+    """
+    include = []
+    for relacion in args.get('include', '').split(','):
+        relacion = relacion.strip()
+        if not relacion or relacion in include:
+            continue
+        if relacion not in allowed:
+            raise ValueError(f"include admite: {', '.join(allowed)}")
+        include.append(relacion)
+    return tuple(include)
@@ -0,0 +1,78 @@
+import os
+from dotenv import load_dotenv
+
+# Único lugar donde se lee el .env; los demás módulos toman los valores de Config
+load_dotenv()
+
+def _bool(name, default):
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+class Config:
+    """
+    Configuración de la aplicación, leída del entorno una sola vez al
+    importar este módulo. create_app la carga en app.config.
+    """
+    DATABASE_URL = os.getenv("DATABASE_URL")
+    # Réplicas de lectura separadas por comas
+    DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+    # Segundos máximos para abrir una conexión; evita que un worker se cuelgue si la base no responde
+    DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "3"))
+
+    POOL_MIN = int(os.getenv("POOL_MIN", "1"))
+    POOL_MAX = int(os.getenv("POOL_MAX", "10"))
+    POOL_ACQUIRE_TIMEOUT = float(os.getenv("POOL_ACQUIRE_TIMEOUT", "2"))
+    POOL_LONG_HOLD_SECONDS = float(os.getenv("POOL_LONG_HOLD_SECONDS", "5"))
+    POOL_STATS_SAMPLES = int(os.getenv("POOL_STATS_SAMPLES", "1000"))
+    # Reciclado y validación de conexiones (segundos, 0 desactiva)
+    POOL_MAX_LIFETIME = float(os.getenv("POOL_MAX_LIFETIME", "1800"))
+    POOL_IDLE_TIMEOUT = float(os.getenv("POOL_IDLE_TIMEOUT", "300"))
+    POOL_VALIDATE_AFTER = float(os.getenv("POOL_VALIDATE_AFTER", "5"))
+    # Modo adaptativo: el límite de conexiones se mueve entre POOL_MIN y POOL_MAX
+    POOL_ADAPTIVE = _bool("POOL_ADAPTIVE", "false")
+    POOL_ADAPT_INTERVAL = float(os.getenv("POOL_ADAPT_INTERVAL", "5"))
+    POOL_GROW_WAIT_MS = float(os.getenv("POOL_GROW_WAIT_MS", "10"))
+    POOL_PREPARED_STATEMENTS = _bool("POOL_PREPARED_STATEMENTS", "true")
+    # Las lecturas de un cliente van al primario durante esta ventana después de que escribió
+    READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+    REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+
+    # Tamaño de página de los listados (?limite) y su máximo
+    PAGE_DEFAULT_LIMIT = int(os.getenv("PAGE_DEFAULT_LIMIT", "50"))
+    PAGE_MAX_LIMIT = int(os.getenv("PAGE_MAX_LIMIT", "200"))
+    # Libros por solicitud en POST /libros/bulk
+    BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "10000"))
+
+    JWT_ISSUER = os.getenv("JWT_ISSUER")
+    JWT_AUDIENCE = os.getenv("JWT_AUDIENCE")
+    CLIENT_ID = os.getenv("CLIENT_ID", "test_client")
+    CLIENT_SECRET = os.getenv("CLIENT_SECRET", "test_secret")
+    CLIENT_AUTH_CACHE_SECONDS = float(os.getenv("CLIENT_AUTH_CACHE_SECONDS", "300"))
+    # Un client_id desconocido no se vuelve a buscar en la base durante este tiempo
+    CLIENT_MISS_CACHE_SECONDS = float(os.getenv("CLIENT_MISS_CACHE_SECONDS", "30"))
+    REFRESH_TOKEN_LIFETIME = int(os.getenv("REFRESH_TOKEN_LIFETIME", str(30 * 24 * 3600)))
+    INTROSPECT_MAX_BATCH = int(os.getenv("INTROSPECT_MAX_BATCH", "100"))
+
+    REVOCATION_CAPACITY = int(os.getenv("REVOCATION_CAPACITY", "500000"))
+    REVOCATION_FP_RATE = float(os.getenv("REVOCATION_FP_RATE", "0.001"))
+    REVOCATION_REFRESH_SECONDS = float(os.getenv("REVOCATION_REFRESH_SECONDS", "5"))
+    # Ids ya vistos que se releen en cada refresh: un id bajo puede confirmarse después de otros más altos
+    REVOCATION_REFRESH_OVERLAP = int(os.getenv("REVOCATION_REFRESH_OVERLAP", "1000"))
+    # Cada cuánto se rearma el filtro desde cero, solo con las revocaciones vigentes
+    REVOCATION_REBUILD_SECONDS = float(os.getenv("REVOCATION_REBUILD_SECONDS", "3600"))
+
+    RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")
+    API_RATE_LIMIT = float(os.getenv("API_RATE_LIMIT", "50"))
+    API_RATE_BURST = float(os.getenv("API_RATE_BURST", "100"))
+    TOKEN_RATE_LIMIT = float(os.getenv("TOKEN_RATE_LIMIT", "1"))
+    TOKEN_RATE_BURST = float(os.getenv("TOKEN_RATE_BURST", "10"))
+    TOKEN_IP_RATE_LIMIT = float(os.getenv("TOKEN_IP_RATE_LIMIT", "5"))
+    TOKEN_IP_RATE_BURST = float(os.getenv("TOKEN_IP_RATE_BURST", "20"))
+
+    SWEEP_INTERVAL_SECONDS = float(os.getenv("SWEEP_INTERVAL_SECONDS", "300"))
+    SWEEP_BATCH_SIZE = int(os.getenv("SWEEP_BATCH_SIZE", "1000"))
+
+    # run.py y asgi.py migran, registran el cliente y abren el pool antes de
+    # aceptar solicitudes; con false todo se hace en la primera que lo necesite
+    WARM_UP = _bool("WARM_UP", "true")
+    # Tras un intento fallido de inicializar, las solicitudes responden 503 sin reintentar durante este tiempo
+    INIT_RETRY_SECONDS = float(os.getenv("INIT_RETRY_SECONDS", "5"))
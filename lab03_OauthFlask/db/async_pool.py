@@ -0,0 +1,117 @@
+import asyncio
+import datetime
+import asyncpg
+from collections import deque
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+import time
+from db.connection_pool import (PoolTimeoutError, POOL_MIN, POOL_MAX, POOL_ACQUIRE_TIMEOUT,
+                                POOL_IDLE_TIMEOUT, POOL_STATS_SAMPLES, _summary)
+from config import Config
+
+class AsyncConnectionPool:
+    """
+    Pool asyncpg para el modo ASGI. Se abre dentro del event loop del
+    servidor (open() en before_serving) y comparte los límites y el timeout
+    de PostgreSQLConnectionPool. asyncpg ya prepara y cachea por conexión
+    las sentencias que ejecuta, así que las mismas consultas $1..$n de los
+    modelos sync se reutilizan sin volver a planificarse.
+    """
+    __instance = None
+
+    @staticmethod
+    def get_instance():
+        if AsyncConnectionPool.__instance is None:
+            AsyncConnectionPool()
+        return AsyncConnectionPool.__instance
+
+    def __init__(self):
+        if AsyncConnectionPool.__instance is not None:
+            raise Exception("Esta clase es un Singleton!")
+        else:
+            AsyncConnectionPool.__instance = self
+            self.minconn = POOL_MIN
+            self.maxconn = max(POOL_MAX, POOL_MIN)
+            self.acquire_timeout = POOL_ACQUIRE_TIMEOUT
+            self.idle_timeout = POOL_IDLE_TIMEOUT
+            # Usar URL de conexión
+            self.dsn = Config.DATABASE_URL
+            self.__pool = None
+            # Serializa la apertura perezosa: varias corrutinas pueden llegar
+            # a connection() antes de que termine create_pool
+            self.__open_lock = asyncio.Lock()
+            self.__wait_samples = deque(maxlen=POOL_STATS_SAMPLES)
+            self.__checkouts = 0
+            self.__exhaustions = 0
+
+    async def open(self):
+        if self.__pool is None:
+            async with self.__open_lock:
+                if self.__pool is None:
+                    self.__pool = await asyncpg.create_pool(
+                        dsn=self.dsn,
+                        min_size=self.minconn,
+                        max_size=self.maxconn,
+                        max_inactive_connection_lifetime=self.idle_timeout,
+                        timeout=Config.DB_CONNECT_TIMEOUT
+                    )
+        return self
+
+    async def close(self):
+        async with self.__open_lock:
+            if self.__pool is not None:
+                await self.__pool.close()
+                self.__pool = None
+
+    @asynccontextmanager
+    async def connection(self, timeout=None):
+        """
+        Presta una conexión y la devuelve al pool al salir del bloque. Lanza
+        PoolTimeoutError si no se obtiene dentro del tiempo de espera.
+        """
+        if self.__pool is None:
+            await self.open()
+        if timeout is None:
+            timeout = self.acquire_timeout
+
+        start = time.monotonic()
+        try:
+            connection = await self.__pool.acquire(timeout=timeout)
+        except asyncio.TimeoutError:
+            self.__exhaustions += 1
+            raise PoolTimeoutError(f"No hay conexiones disponibles después de {timeout}s")
+        self.__checkouts += 1
+        self.__wait_samples.append(time.monotonic() - start)
+
+        try:
+            yield connection
+        finally:
+            await self.__pool.release(connection)
+
+    def stats(self):
+        size = self.__pool.get_size() if self.__pool else 0
+        idle = self.__pool.get_idle_size() if self.__pool else 0
+        return {
+            "minconn": self.minconn,
+            "maxconn": self.maxconn,
+            "open": size,
+            "in_use": size - idle,
+            "idle": idle,
+            "acquire_timeout": self.acquire_timeout,
+            "checkouts": self.__checkouts,
+            "exhaustions": self.__exhaustions,
+            "wait": _summary(self.__wait_samples)
+        }
+
+def as_date(value):
+    """
+    asyncpg exige datetime.date para parámetros DATE; psycopg2 aceptaba el
+    texto tal cual. Acepta ISO (2020-01-31) y el formato HTTP con que
+    jsonify serializa las fechas.
+    """
+    if value is None or isinstance(value, datetime.date):
+        return value
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        return parsedate_to_datetime(value).date()
@@ -1,12 +1,138 @@
-from psycopg2 import pool
+import psycopg2
+import psycopg2.errors
+from psycopg2 import extensions, pool
+from collections import deque
+from contextlib import contextmanager
+import contextvars
+import itertools
+import random
+import re
+import sys
+import threading
+import time
 import os
-from dotenv import load_dotenv
+from config import Config
 
-load_dotenv()
+POOL_MIN = Config.POOL_MIN
+POOL_MAX = Config.POOL_MAX
+POOL_ACQUIRE_TIMEOUT = Config.POOL_ACQUIRE_TIMEOUT
+POOL_LONG_HOLD_SECONDS = Config.POOL_LONG_HOLD_SECONDS
+POOL_STATS_SAMPLES = Config.POOL_STATS_SAMPLES
+POOL_MAX_LIFETIME = Config.POOL_MAX_LIFETIME
+POOL_IDLE_TIMEOUT = Config.POOL_IDLE_TIMEOUT
+POOL_VALIDATE_AFTER = Config.POOL_VALIDATE_AFTER
+POOL_ADAPTIVE = Config.POOL_ADAPTIVE
+POOL_ADAPT_INTERVAL = Config.POOL_ADAPT_INTERVAL
+POOL_GROW_WAIT_MS = Config.POOL_GROW_WAIT_MS
+POOL_PREPARED_STATEMENTS = Config.POOL_PREPARED_STATEMENTS
+DATABASE_REPLICA_URLS = Config.DATABASE_REPLICA_URLS
+READ_YOUR_WRITES_SECONDS = Config.READ_YOUR_WRITES_SECONDS
+REPLICA_RETRY_SECONDS = Config.REPLICA_RETRY_SECONDS
+# Clientes recordados como máximo antes de olvidar los que ya salieron de la ventana
+_MAX_RECENT_WRITERS = 10000
+
+# Marca que recibe un waiter cuando se liberó un lugar pero no una conexión
+_OPEN_NEW = object()
+
+# Sentencias preparadas: nombre -> (sql con $1..$n, mismo sql con %(pN)s para ejecutarlo sin preparar)
+_STATEMENTS = {}
+
+# Cliente de la solicitud en curso (sub del token), para leer lo que acaba de escribir
+_client = contextvars.ContextVar("pool_client", default=None)
+
+class PoolTimeoutError(pool.PoolError):
+    """
+    No se obtuvo una conexión dentro del tiempo de espera
+    """
+
+def prepared_statement(name, sql):
+    """
+    Registra una sentencia con parámetros $1, $2... y devuelve su nombre para
+    ejecutarla con PostgreSQLConnectionPool.execute
+    """
+    registered = _STATEMENTS.get(name)
+    if registered is not None and registered[0] != sql:
+        raise ValueError(f"La sentencia {name} ya está registrada con otro SQL")
+    plain = re.sub(r"\$(\d+)", r"%(p\1)s", sql.replace("%", "%%"))
+    _STATEMENTS[name] = (sql, plain)
+    return name
+
+def set_client(client_id):
+    """
+    Asocia las consultas siguientes del hilo o tarea actual a client_id (o a
+    nadie con None) para aplicar read-your-writes
+    """
+    _client.set(client_id)
+
+def statement_sql(name):
+    """
+    SQL con parámetros $1..$n de una sentencia registrada (lo usan los
+    modelos async, que preparan con asyncpg)
+    """
+    return _STATEMENTS[name][0]
+
+def _summary(samples):
+    # Resumen en milisegundos de las últimas muestras
+    if not samples:
+        return {"count": 0, "avg_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(samples)
+    n = len(ordered)
+    return {
+        "count": n,
+        "avg_ms": round(sum(ordered) / n * 1000, 3),
+        "p50_ms": round(ordered[n // 2] * 1000, 3),
+        "p99_ms": round(ordered[min(n - 1, int(n * 0.99))] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3)
+    }
+
+class _Waiter:
+    __slots__ = ("event", "connection")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.connection = None
 
 class PostgreSQLConnectionPool:
+    """
+    Pool de conexiones con cola de espera FIFO.
+
+    Si no hay conexiones libres ni lugar para abrir otra, get_connection
+    espera su turno hasta acquire_timeout segundos y luego lanza
+    PoolTimeoutError. Las conexiones liberadas se entregan directamente al
+    primero de la cola, así una ráfaga espera unos milisegundos en orden de
+    llegada en lugar de fallar.
+
+    Una conexión que estuvo inactiva más de validate_after segundos se
+    prueba con SELECT 1 antes de prestarla; si falla se descartan también
+    las demás inactivas (tras un reinicio de la base están todas muertas).
+    Las conexiones se cierran al superar max_lifetime (con algo de azar para
+    no renovarlas todas juntas) o idle_timeout sin uso; cada préstamo y
+    devolución revisa todas las inactivas, no solo la que se presta. Después de un fork
+    el proceso hijo empieza con un pool vacío y nunca usa ni cierra las
+    conexiones del padre.
+
+    Con POOL_ADAPTIVE el límite de conexiones arranca en minconn (al menos 1) y cada
+    adapt_interval segundos se duplica si la espera media superó
+    grow_wait_ms o hubo timeouts, o baja de a una si el pico de uso quedó
+    por debajo del límite. Las decisiones se registran y se ven en stats().
+
+    execute() corre las sentencias registradas con prepared_statement como
+    sentencias preparadas del servidor: cada conexión las prepara la primera
+    vez que las usa y después solo envía EXECUTE. Una conexión nueva empieza
+    sin ninguna.
+
+    Con DATABASE_REPLICA_URLS el pool del primario crea un pool por réplica
+    y read_connection() reparte las lecturas entre ellas en round-robin. Una
+    réplica que no acepta conexiones queda fuera durante
+    REPLICA_RETRY_SECONDS; sin réplicas sanas se lee del primario. Toda
+    conexión pedida con connection() cuenta como escritura del cliente
+    actual (set_client), y sus lecturas van al primario durante
+    READ_YOUR_WRITES_SECONDS para que no vea datos viejos por el retraso de
+    replicación.
+    """
     __instance = None
-    __connection_pool = None
+    # Primario y réplicas, para reiniciarlos todos después de un fork
+    __pools = []
 
     @staticmethod
     def get_instance():
@@ -14,34 +140,573 @@ class PostgreSQLConnectionPool:
             PostgreSQLConnectionPool()
         return PostgreSQLConnectionPool.__instance
 
-    def __init__(self):
-        if PostgreSQLConnectionPool.__instance is not None:
+    def __init__(self, dsn=None, replica=False):
+        if not replica and PostgreSQLConnectionPool.__instance is not None:
             raise Exception("Esta clase es un Singleton!")
         else:
-            PostgreSQLConnectionPool.__instance = self
-            self.__connection_pool = self.__create_connection_pool()
+            if not replica:
+                PostgreSQLConnectionPool.__instance = self
+            PostgreSQLConnectionPool.__pools.append(self)
+            self.minconn = POOL_MIN
+            self.maxconn = max(POOL_MAX, POOL_MIN)
+            self.adaptive = POOL_ADAPTIVE
+            self.adapt_interval = POOL_ADAPT_INTERVAL
+            self.grow_wait_ms = POOL_GROW_WAIT_MS
+            self.acquire_timeout = POOL_ACQUIRE_TIMEOUT
+            self.long_hold_seconds = POOL_LONG_HOLD_SECONDS
+            self.max_lifetime = POOL_MAX_LIFETIME
+            self.idle_timeout = POOL_IDLE_TIMEOUT
+            self.validate_after = POOL_VALIDATE_AFTER
+            self.use_prepared = POOL_PREPARED_STATEMENTS
+            self.read_your_writes_seconds = READ_YOUR_WRITES_SECONDS
+            self.replica_retry_seconds = REPLICA_RETRY_SECONDS
+            self.connect_timeout = Config.DB_CONNECT_TIMEOUT
+            # Usar URL de conexión
+            self.dsn = dsn or Config.DATABASE_URL
+            self.__orphans = []
+            self.__reset()
+            self.__create_connection_pool()
+            self.__start_adapter()
+            # Salud de este pool como réplica: no se usa hasta down_until
+            self.__down_until = 0.0
+            self.__failures = 0
+            self.__round_robin = itertools.count()
+            self.__replicas = [] if replica else [
+                PostgreSQLConnectionPool(url, replica=True) for url in DATABASE_REPLICA_URLS
+            ]
+
+    def __reset(self):
+        self.__pid = os.getpid()
+        self.__lock = threading.Lock()
+        # Conexiones libres como (conexión, inactiva_desde)
+        self.__idle = []
+        self.__waiters = deque()
+        self.__size = 0
+        # id(conexión) -> (conexión, vence_en, sentencias preparadas)
+        self.__connections = {}
+        self.__checked_out = {}
+        self.__wait_samples = deque(maxlen=POOL_STATS_SAMPLES)
+        self.__hold_samples = deque(maxlen=POOL_STATS_SAMPLES)
+        self.__checkouts = 0
+        self.__exhaustions = 0
+        self.__long_holds = 0
+        self.__recycled = 0
+        self.__validation_failures = 0
+        # Límite vigente de conexiones abiertas y ventana del modo adaptativo
+        # Con POOL_MIN=0 el modo adaptativo arranca igual con una conexión; con 0 nunca saldría de ahí
+        self.__limit = max(1, self.minconn) if self.adaptive else self.maxconn
+        self.__window_wait = 0.0
+        self.__window_count = 0
+        self.__window_peak = 0
+        self.__last_exhaustions = 0
+        self.__decisions = deque(maxlen=50)
+        self.__stop = threading.Event()
+        # cliente -> momento de su última escritura
+        self.__last_write = {}
+
+    def __start_adapter(self):
+        if self.adaptive:
+            threading.Thread(target=self.__run, name="pool-adapter", daemon=True).start()
+
+    def __run(self):
+        stop = self.__stop
+        while not stop.wait(self.adapt_interval):
+            self.adapt()
+
+    def _after_fork(self):
+        """
+        Se ejecuta en el proceso hijo. Los sockets heredados son del padre:
+        cerrarlos (o que el GC los cierre) le terminaría sus sesiones, así
+        que se apuntan a /dev/null y las conexiones se conservan sin usar.
+        """
+        inherited = [entry[0] for entry in self.__connections.values()]
+        if inherited:
+            devnull = os.open(os.devnull, os.O_RDWR)
+            try:
+                for connection in inherited:
+                    if not connection.closed:
+                        os.dup2(devnull, connection.fileno())
+            finally:
+                os.close(devnull)
+        self.__orphans.extend(inherited)
+        self.__reset()
+        # Los hilos no sobreviven al fork
+        self.__start_adapter()
 
     def __create_connection_pool(self):
         try:
-            # Usar URL de conexión
-            db_url = os.getenv("DATABASE_URL")
-            
-            # Crear un pool de conexiones
-            connection_pool = pool.ThreadedConnectionPool(
-                minconn=1,
-                maxconn=10,
-                dsn=db_url
-            )
-            return connection_pool
+            # Abrir las conexiones mínimas
+            for _ in range(self.minconn):
+                self.__size += 1
+                self.__idle.append((self.__connect(), time.monotonic()))
         except Exception as e:
             print(f"Error al crear el pool de conexiones: {e}")
-            return None
 
-    def get_connection(self):
-        return self.__connection_pool.getconn()
+    def __connect(self):
+        try:
+            connection = psycopg2.connect(self.dsn, connect_timeout=self.connect_timeout)
+        except Exception:
+            with self.__lock:
+                self.__size -= 1
+                if self.__waiters:
+                    # Que el siguiente en la cola lo intente en vez de esperar en vano
+                    self.__size += 1
+                    waiter = self.__waiters.popleft()
+                    waiter.connection = _OPEN_NEW
+                    waiter.event.set()
+            raise
+        expires = None
+        if self.max_lifetime > 0:
+            expires = time.monotonic() + self.max_lifetime * random.uniform(0.9, 1.0)
+        with self.__lock:
+            self.__connections[id(connection)] = (connection, expires, set())
+        return connection
+
+    def __discard(self, connection):
+        # Cierra una conexión cuyo lugar en el pool sigue reservado por quien la tenía
+        with self.__lock:
+            self.__connections.pop(id(connection), None)
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def __usable(self, connection, idle_since, now):
+        if connection.closed:
+            return False
+        if self.idle_timeout > 0 and self.__size > self.minconn and now - idle_since > self.idle_timeout:
+            self.__recycled += 1
+            return False
+        expires = self.__connections.get(id(connection), (None, None, None))[1]
+        if expires is not None and now > expires:
+            self.__recycled += 1
+            return False
+        return True
+
+    def __expire_idle(self, now):
+        # Con el lock tomado. Las inactivas se prestan desde el final (LIFO), así
+        # que las del principio nunca pasarían por __usable: se revisan todas acá.
+        # Devuelve las vencidas para cerrarlas fuera del lock.
+        stale = []
+        keep = []
+        for connection, since in self.__idle:
+            if self.__usable(connection, since, now):
+                keep.append((connection, since))
+            else:
+                self.__connections.pop(id(connection), None)
+                self.__size -= 1
+                stale.append(connection)
+        if stale:
+            self.__idle = keep
+        return stale
+
+    def __validate(self, connection):
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def __acquire(self, timeout, frame):
+        if os.getpid() != self.__pid:
+            # Fork sin pasar por register_at_fork
+            self._after_fork()
+        if timeout is None:
+            timeout = self.acquire_timeout
+        start = time.monotonic()
+        connection = None
+        idle_since = None
+        waiter = None
+
+        with self.__lock:
+            stale = self.__expire_idle(start)
+            while self.__idle and not self.__waiters:
+                candidate, since = self.__idle.pop()
+                if self.__usable(candidate, since, start):
+                    connection, idle_since = candidate, since
+                    break
+                # Se cierra fuera del lock
+                self.__connections.pop(id(candidate), None)
+                self.__size -= 1
+                stale.append(candidate)
+            if connection is None:
+                if self.__size < self.__limit and not self.__waiters:
+                    self.__size += 1
+                    connection = _OPEN_NEW
+                else:
+                    waiter = _Waiter()
+                    self.__waiters.append(waiter)
+
+        for candidate in stale:
+            try:
+                candidate.close()
+            except Exception:
+                pass
+
+        if waiter is not None:
+            if not waiter.event.wait(timeout):
+                with self.__lock:
+                    # The releaser may have handed us a connection just now
+                    if waiter.connection is None:
+                        self.__waiters.remove(waiter)
+                        self.__exhaustions += 1
+                        raise PoolTimeoutError(
+                            f"No hay conexiones disponibles después de {timeout}s")
+            connection = waiter.connection
+
+        if idle_since is not None and self.validate_after >= 0 \
+                and start - idle_since > self.validate_after \
+                and not self.__validate(connection):
+            with self.__lock:
+                self.__validation_failures += 1
+            self.__discard(connection)
+            self.__drop_idle()
+            connection = _OPEN_NEW
+
+        if connection is _OPEN_NEW:
+            connection = self.__connect()
+
+        acquired = time.monotonic()
+        call_site = f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+        with self.__lock:
+            self.__checkouts += 1
+            self.__wait_samples.append(acquired - start)
+            self.__checked_out[id(connection)] = (acquired, call_site)
+            self.__window_wait += acquired - start
+            self.__window_count += 1
+            self.__window_peak = max(self.__window_peak, len(self.__checked_out))
+        return connection
+
+    def __release_slot(self):
+        # Libera el lugar de una conexión cerrada o se lo cede al primero en espera
+        with self.__lock:
+            if self.__waiters:
+                waiter = self.__waiters.popleft()
+                waiter.connection = _OPEN_NEW
+                waiter.event.set()
+            else:
+                self.__size -= 1
+
+    def __drop_idle(self):
+        # Tras una validación fallida las demás inactivas probablemente también estén muertas
+        with self.__lock:
+            idle, self.__idle = self.__idle, []
+        for connection, _ in idle:
+            self.__discard(connection)
+            self.__release_slot()
+
+    def __note_write(self):
+        client = _client.get()
+        if client is None or not self.__replicas:
+            return
+        now = time.monotonic()
+        with self.__lock:
+            self.__last_write[client] = now
+            if len(self.__last_write) > _MAX_RECENT_WRITERS:
+                cutoff = now - self.read_your_writes_seconds
+                self.__last_write = {k: t for k, t in self.__last_write.items() if t > cutoff}
+
+    def __read_targets(self):
+        # Réplicas sanas a probar en orden, o ninguna si el cliente escribió hace poco
+        if not self.__replicas:
+            return []
+        now = time.monotonic()
+        client = _client.get()
+        if client is not None:
+            with self.__lock:
+                last_write = self.__last_write.get(client)
+            if last_write is not None and now - last_write < self.read_your_writes_seconds:
+                return []
+        n = len(self.__replicas)
+        start = next(self.__round_robin)
+        rotated = [self.__replicas[(start + i) % n] for i in range(n)]
+        return [replica for replica in rotated if replica.__down_until <= now]
+
+    def __mark_down(self, error):
+        self.__failures += 1
+        self.__down_until = time.monotonic() + self.replica_retry_seconds
+        print(f"Réplica fuera de servicio por {self.replica_retry_seconds:.0f}s: {error}")
+
+    def get_connection(self, timeout=None):
+        # Call site of the model method that asked for the connection
+        connection = self.__acquire(timeout, sys._getframe(1))
+        self.__note_write()
+        return connection
 
     def release_connection(self, connection):
-        self.__connection_pool.putconn(connection)
+        if os.getpid() != self.__pid:
+            self._after_fork()
+        if id(connection) not in self.__connections:
+            for replica in self.__replicas:
+                if id(connection) in replica.__connections:
+                    return replica.release_connection(connection)
+            # Ajena al pool, p. ej. prestada al proceso padre antes del fork
+            return
+        # Igual que psycopg2: descartar conexiones rotas y deshacer transacciones abiertas
+        if not connection.closed:
+            status = connection.info.transaction_status
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                connection.close()
+            elif status != extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    connection.rollback()
+                except psycopg2.Error:
+                    connection.close()
+
+        now = time.monotonic()
+        expires = self.__connections[id(connection)][1]
+        recycle = not connection.closed and expires is not None and now > expires
+        if recycle:
+            connection.close()
+
+        surplus = None
+        stale = []
+        with self.__lock:
+            if recycle:
+                self.__recycled += 1
+            checkout = self.__checked_out.pop(id(connection), None)
+            if checkout:
+                held = now - checkout[0]
+                self.__hold_samples.append(held)
+                if held > self.long_hold_seconds:
+                    self.__long_holds += 1
+                    print(f"Connection held {held:.2f}s (acquired at {checkout[1]})")
+
+            if connection.closed:
+                self.__connections.pop(id(connection), None)
+                self.__size -= 1
+                if self.__waiters:
+                    # Hay lugar para una conexión nueva: la abre el siguiente en la cola
+                    self.__size += 1
+                    connection = _OPEN_NEW
+                else:
+                    return
+
+            if self.__waiters:
+                waiter = self.__waiters.popleft()
+                waiter.connection = connection
+                waiter.event.set()
+            elif self.__size > self.__limit:
+                # Sobra desde que se achicó el límite
+                self.__connections.pop(id(connection), None)
+                self.__size -= 1
+                surplus = connection
+            else:
+                self.__idle.append((connection, now))
+                stale = self.__expire_idle(now)
+
+        if surplus is not None:
+            surplus.close()
+        for connection in stale:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def adapt(self):
+        """
+        Ajusta el límite de conexiones según la última ventana: crece si hubo
+        espera o timeouts, se achica si el pico de uso quedó holgado.
+        Devuelve la decisión tomada o None.
+        """
+        surplus = []
+        with self.__lock:
+            count = self.__window_count
+            avg_wait_ms = self.__window_wait / count * 1000 if count else 0.0
+            peak = self.__window_peak
+            exhaustions = self.__exhaustions - self.__last_exhaustions
+            self.__window_wait = 0.0
+            self.__window_count = 0
+            self.__window_peak = len(self.__checked_out)
+            self.__last_exhaustions = self.__exhaustions
+
+            limit = self.__limit
+            if (avg_wait_ms > self.grow_wait_ms or exhaustions) and limit < self.maxconn:
+                new_limit = min(self.maxconn, max(limit + 1, limit * 2))
+                action = "grow"
+            elif peak + 1 < limit and limit > max(1, self.minconn):
+                new_limit = limit - 1
+                action = "shrink"
+            else:
+                return None
+            self.__limit = new_limit
+
+            # Nuevos lugares para los que ya esperan; conexiones inactivas que sobran
+            while self.__waiters and self.__size < new_limit:
+                self.__size += 1
+                waiter = self.__waiters.popleft()
+                waiter.connection = _OPEN_NEW
+                waiter.event.set()
+            while self.__idle and self.__size > new_limit:
+                connection, _ = self.__idle.pop(0)
+                self.__connections.pop(id(connection), None)
+                self.__size -= 1
+                surplus.append(connection)
+
+            decision = {
+                "at": round(time.time(), 3),
+                "action": action,
+                "from": limit,
+                "to": new_limit,
+                "avg_wait_ms": round(avg_wait_ms, 3),
+                "peak_in_use": peak,
+                "exhaustions": exhaustions
+            }
+            self.__decisions.append(decision)
+
+        for connection in surplus:
+            connection.close()
+        print(f"Pool {action}: {limit} -> {new_limit} conexiones "
+              f"(espera media {avg_wait_ms:.1f} ms, pico {peak}, timeouts {exhaustions})")
+        return decision
+
+    def execute(self, cursor, name, params=()):
+        """
+        Ejecuta la sentencia registrada name en el cursor, preparándola en su
+        conexión si todavía no lo estaba
+        """
+        sql, plain = _STATEMENTS[name]
+        entry = self.__connections.get(id(cursor.connection))
+        if entry is None:
+            # Conexión prestada por read_connection desde una réplica
+            for replica in self.__replicas:
+                entry = replica.__connections.get(id(cursor.connection))
+                if entry is not None:
+                    break
+        if not self.use_prepared or entry is None:
+            cursor.execute(plain, {f"p{i}": value for i, value in enumerate(params, 1)})
+            return
+
+        prepared = entry[2]
+        if name not in prepared:
+            cursor.execute(f"PREPARE {name} AS {sql}")
+            prepared.add(name)
+        try:
+            if params:
+                cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+            else:
+                cursor.execute(f"EXECUTE {name}")
+        except psycopg2.errors.InvalidSqlStatementName:
+            # El servidor ya no la tiene (p. ej. DEALLOCATE ALL); se vuelve a preparar la próxima vez
+            prepared.discard(name)
+            raise
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """
+        Presta una conexión y la devuelve al pool al salir del bloque, aun si
+        hubo una excepción
+        """
+        connection = self.__acquire(timeout, sys._getframe(2))
+        self.__note_write()
+        try:
+            yield connection
+        finally:
+            self.release_connection(connection)
+
+    @contextmanager
+    def read_connection(self, timeout=None):
+        """
+        Como connection() pero para consultas de solo lectura: usa una réplica
+        sana si hay y el cliente no escribió recientemente, si no el primario.
+        Si una réplica no responde o no tiene conexiones libres se sigue con
+        la próxima y por último con el primario.
+        """
+        frame = sys._getframe(2)
+        for replica in self.__read_targets():
+            try:
+                connection = replica.__acquire(timeout, frame)
+            except psycopg2.OperationalError as e:
+                replica.__mark_down(e)
+                continue
+            except PoolTimeoutError:
+                # Réplica saturada pero sana: se prueba la siguiente o el primario sin marcarla caída
+                continue
+            try:
+                yield connection
+            finally:
+                replica.release_connection(connection)
+            return
+
+        connection = self.__acquire(timeout, frame)
+        try:
+            yield connection
+        finally:
+            self.release_connection(connection)
 
     def close_all_connections(self):
-        self.__connection_pool.closeall()
\ No newline at end of file
+        for replica in self.__replicas:
+            replica.close_all_connections()
+        with self.__lock:
+            idle, self.__idle = self.__idle, []
+            self.__size -= len(idle)
+            for connection, _ in idle:
+                self.__connections.pop(id(connection), None)
+        for connection, _ in idle:
+            connection.close()
+
+    def stats(self):
+        """
+        Estadísticas del pool: espera al pedir conexión, tiempo de uso,
+        conexiones en uso e inactivas, agotamientos, reciclados y conexiones
+        retenidas más de long_hold_seconds junto con quién las pidió
+        """
+        now = time.monotonic()
+        replicas = [
+            {"host": replica.__host(), "healthy": replica.__down_until <= now,
+             "failures": replica.__failures, **replica.stats()}
+            for replica in self.__replicas
+        ]
+        with self.__lock:
+            held = [
+                {"held_s": round(now - acquired, 3), "call_site": call_site}
+                for acquired, call_site in self.__checked_out.values()
+                if now - acquired > self.long_hold_seconds
+            ]
+            return {
+                "pid": self.__pid,
+                "minconn": self.minconn,
+                "maxconn": self.maxconn,
+                "adaptive": self.adaptive,
+                "limit": self.__limit,
+                "open": self.__size,
+                "in_use": len(self.__checked_out),
+                "idle": len(self.__idle),
+                "waiting": len(self.__waiters),
+                "utilization": round(len(self.__checked_out) / self.__limit, 3) if self.__limit else 0.0,
+                "acquire_timeout": self.acquire_timeout,
+                "checkouts": self.__checkouts,
+                "exhaustions": self.__exhaustions,
+                "long_holds": self.__long_holds,
+                "recycled": self.__recycled,
+                "validation_failures": self.__validation_failures,
+                "use_prepared": self.use_prepared,
+                "prepared_statements": sum(len(entry[2]) for entry in self.__connections.values()),
+                "wait": _summary(self.__wait_samples),
+                "hold": _summary(self.__hold_samples),
+                "held_too_long": held,
+                "decisions": list(self.__decisions),
+                "read_your_writes_seconds": self.read_your_writes_seconds,
+                "recent_writers": sum(1 for t in self.__last_write.values()
+                                      if now - t < self.read_your_writes_seconds),
+                "replicas": replicas
+            }
+
+    def __host(self):
+        # Host de la réplica sin credenciales, para las estadísticas
+        try:
+            params = extensions.parse_dsn(self.dsn)
+        except psycopg2.ProgrammingError:
+            return None
+        return f"{params.get('host', 'localhost')}:{params.get('port', 5432)}"
+
+    @staticmethod
+    def _after_fork_in_child():
+        for instance in PostgreSQLConnectionPool.__pools:
+            instance._after_fork()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=PostgreSQLConnectionPool._after_fork_in_child)
@@ -0,0 +1,20 @@
+import os
+import sys
+
+# El ejecutor de migraciones vive en db_comun, en la raíz del repositorio
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from db_comun import run_migrations
+from db.connection_pool import PostgreSQLConnectionPool
+
+# Clave del advisory lock que serializa las migraciones entre procesos
+MIGRATION_LOCK = 4031201
+# Versiones aplicadas de esta aplicación; FlaskBlueprints lleva las suyas aparte
+MIGRATION_TABLE = "schema_migrations"
+
+def migrate(migrations):
+    """
+    Aplica las migraciones pendientes de migrations y devuelve cuántas aplicó
+    """
+    with PostgreSQLConnectionPool.get_instance().connection() as conn:
+        return run_migrations(conn, migrations, MIGRATION_LOCK, MIGRATION_TABLE)
@@ -1,80 +1,278 @@
+from db.migrations import migrate
+
+# Esquema inicial: las tablas que antes creaba create_tables en cada arranque
+_ESQUEMA_INICIAL = [
+    """
+    CREATE TABLE IF NOT EXISTS autor (
+        id SERIAL PRIMARY KEY,
+        nombre VARCHAR(100) NOT NULL,
+        apellido VARCHAR(100) NOT NULL,
+        fecha_nacimiento DATE,
+        nacionalidad VARCHAR(50),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS genero (
+        id SERIAL PRIMARY KEY,
+        nombre VARCHAR(50) NOT NULL UNIQUE,
+        descripcion TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS libro (
+        id SERIAL PRIMARY KEY,
+        titulo VARCHAR(200) NOT NULL,
+        isbn VARCHAR(20) UNIQUE,
+        fecha_publicacion DATE,
+        descripcion TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # Create bridge tables for many-to-many relationships
+    """
+    CREATE TABLE IF NOT EXISTS libro_autor (
+        libro_id INTEGER REFERENCES libro(id) ON DELETE CASCADE,
+        autor_id INTEGER REFERENCES autor(id) ON DELETE CASCADE,
+        PRIMARY KEY (libro_id, autor_id),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS libro_genero (
+        libro_id INTEGER REFERENCES libro(id) ON DELETE CASCADE,
+        genero_id INTEGER REFERENCES genero(id) ON DELETE CASCADE,
+        PRIMARY KEY (libro_id, genero_id),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # OAuth clients allowed to request tokens, with hashed secrets
+    """
+    CREATE TABLE IF NOT EXISTS oauth_client (
+        id SERIAL PRIMARY KEY,
+        client_id VARCHAR(100) NOT NULL UNIQUE,
+        secret_hash VARCHAR(255) NOT NULL,
+        token_lifetime INTEGER NOT NULL DEFAULT 3600,
+        activo BOOLEAN NOT NULL DEFAULT TRUE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # Scopes granted to each client (space separated)
+    """
+    ALTER TABLE oauth_client ADD COLUMN IF NOT EXISTS scopes TEXT NOT NULL
+    DEFAULT 'libros:leer libros:escribir autores:leer autores:escribir generos:leer generos:escribir'
+    """,
+    # Refresh tokens, stored only as a SHA-256 of the token value
+    """
+    CREATE TABLE IF NOT EXISTS refresh_token (
+        id BIGSERIAL PRIMARY KEY,
+        token_hash BYTEA NOT NULL UNIQUE,
+        client_id VARCHAR(100) NOT NULL,
+        familia UUID NOT NULL,
+        usado BOOLEAN NOT NULL DEFAULT FALSE,
+        expira_en TIMESTAMP NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "ALTER TABLE refresh_token ADD COLUMN IF NOT EXISTS scope TEXT",
+    "CREATE INDEX IF NOT EXISTS idx_refresh_token_familia ON refresh_token (familia)",
+    "CREATE INDEX IF NOT EXISTS idx_refresh_token_expira_en ON refresh_token (expira_en)",
+    # Revoked tokens, looked up by jti only on Bloom filter hits
+    """
+    CREATE TABLE IF NOT EXISTS token_revocado (
+        id BIGSERIAL PRIMARY KEY,
+        jti VARCHAR(64) NOT NULL UNIQUE,
+        expira_en TIMESTAMP,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+]
+
+# Las consultas por autor y por género buscan en las tablas puente por la
+# segunda columna de la clave primaria, que el índice de la PK no cubre
+_INDICES_BUSQUEDA_INVERSA = [
+    "CREATE INDEX IF NOT EXISTS idx_libro_autor_autor_id ON libro_autor (autor_id)",
+    "CREATE INDEX IF NOT EXISTS idx_libro_genero_genero_id ON libro_genero (genero_id)",
+    "CREATE INDEX IF NOT EXISTS idx_libro_titulo ON libro (titulo, id)",
+    "CREATE INDEX IF NOT EXISTS idx_libro_updated_at ON libro (updated_at)",
+]
+
+# Paginación por cursor de /api/autores (libro y genero ya tienen índice en su orden)
+_INDICE_ORDEN_AUTOR = [
+    "CREATE INDEX IF NOT EXISTS idx_autor_orden ON autor (apellido, nombre, id)",
+]
+
+# Búsqueda de texto: un tsvector por libro con título (peso A), nombres de
+# autores (B), géneros (C) y descripción (D), mantenido por triggers. Vive en
+# una tabla aparte para no sumar la columna a los SELECT * de libro.
+_BUSQUEDA_LIBRO = [
+    """
+    CREATE TABLE IF NOT EXISTS libro_busqueda (
+        libro_id INTEGER PRIMARY KEY REFERENCES libro(id) ON DELETE CASCADE,
+        documento TSVECTOR NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_libro_busqueda_documento ON libro_busqueda USING GIN (documento)",
+    """
+    CREATE OR REPLACE FUNCTION libro_busqueda_refrescar(ids INTEGER[]) RETURNS void AS $$
+        INSERT INTO libro_busqueda (libro_id, documento)
+        SELECT l.id,
+               setweight(to_tsvector('spanish', coalesce(l.titulo, '')), 'A') ||
+               setweight(to_tsvector('spanish', coalesce(a.nombres, '')), 'B') ||
+               setweight(to_tsvector('spanish', coalesce(g.nombres, '')), 'C') ||
+               setweight(to_tsvector('spanish', coalesce(l.descripcion, '')), 'D')
+        FROM libro l
+        LEFT JOIN LATERAL (
+            SELECT string_agg(au.nombre || ' ' || au.apellido, ' ') AS nombres
+            FROM libro_autor la JOIN autor au ON au.id = la.autor_id
+            WHERE la.libro_id = l.id
+        ) a ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT string_agg(ge.nombre, ' ') AS nombres
+            FROM libro_genero lg JOIN genero ge ON ge.id = lg.genero_id
+            WHERE lg.libro_id = l.id
+        ) g ON TRUE
+        WHERE l.id = ANY(ids)
+        ON CONFLICT (libro_id) DO UPDATE SET documento = EXCLUDED.documento
+    $$ LANGUAGE sql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION libro_busqueda_libro() RETURNS trigger AS $$
+    BEGIN
+        PERFORM libro_busqueda_refrescar(ARRAY[NEW.id]);
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION libro_busqueda_relacion() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            PERFORM libro_busqueda_refrescar(ARRAY[OLD.libro_id]);
+        ELSE
+            PERFORM libro_busqueda_refrescar(ARRAY[NEW.libro_id]);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION libro_busqueda_autor() RETURNS trigger AS $$
+    BEGIN
+        PERFORM libro_busqueda_refrescar(ARRAY(SELECT libro_id FROM libro_autor WHERE autor_id = NEW.id));
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION libro_busqueda_genero() RETURNS trigger AS $$
+    BEGIN
+        PERFORM libro_busqueda_refrescar(ARRAY(SELECT libro_id FROM libro_genero WHERE genero_id = NEW.id));
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_libro_busqueda ON libro",
+    """
+    CREATE TRIGGER trg_libro_busqueda AFTER INSERT OR UPDATE OF titulo, descripcion ON libro
+    FOR EACH ROW EXECUTE PROCEDURE libro_busqueda_libro()
+    """,
+    "DROP TRIGGER IF EXISTS trg_libro_autor_busqueda ON libro_autor",
+    """
+    CREATE TRIGGER trg_libro_autor_busqueda AFTER INSERT OR DELETE ON libro_autor
+    FOR EACH ROW EXECUTE PROCEDURE libro_busqueda_relacion()
+    """,
+    "DROP TRIGGER IF EXISTS trg_libro_genero_busqueda ON libro_genero",
+    """
+    CREATE TRIGGER trg_libro_genero_busqueda AFTER INSERT OR DELETE ON libro_genero
+    FOR EACH ROW EXECUTE PROCEDURE libro_busqueda_relacion()
+    """,
+    "DROP TRIGGER IF EXISTS trg_autor_busqueda ON autor",
+    """
+    CREATE TRIGGER trg_autor_busqueda AFTER UPDATE OF nombre, apellido ON autor
+    FOR EACH ROW EXECUTE PROCEDURE libro_busqueda_autor()
+    """,
+    "DROP TRIGGER IF EXISTS trg_genero_busqueda ON genero",
+    """
+    CREATE TRIGGER trg_genero_busqueda AFTER UPDATE OF nombre ON genero
+    FOR EACH ROW EXECUTE PROCEDURE libro_busqueda_genero()
+    """,
+    # Libros que ya existían
+    "SELECT libro_busqueda_refrescar(ARRAY(SELECT id FROM libro))",
+]
+
+# Los triggers de búsqueda pasan a uno por sentencia con tablas de transición:
+# un INSERT o COPY de miles de filas refresca libro_busqueda una sola vez
+# en lugar de una por fila. UPDATE de libro sigue por fila porque las tablas
+# de transición no admiten lista de columnas.
+_BUSQUEDA_POR_SENTENCIA = [
+    """
+    CREATE OR REPLACE FUNCTION libro_busqueda_libros() RETURNS trigger AS $$
+    BEGIN
+        PERFORM libro_busqueda_refrescar(ARRAY(SELECT id FROM filas));
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION libro_busqueda_relaciones() RETURNS trigger AS $$
+    BEGIN
+        PERFORM libro_busqueda_refrescar(ARRAY(SELECT DISTINCT libro_id FROM filas));
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_libro_busqueda ON libro",
+    "DROP TRIGGER IF EXISTS trg_libro_busqueda_insert ON libro",
+    """
+    CREATE TRIGGER trg_libro_busqueda_insert AFTER INSERT ON libro
+    REFERENCING NEW TABLE AS filas
+    FOR EACH STATEMENT EXECUTE PROCEDURE libro_busqueda_libros()
+    """,
+    """
+    CREATE TRIGGER trg_libro_busqueda AFTER UPDATE OF titulo, descripcion ON libro
+    FOR EACH ROW EXECUTE PROCEDURE libro_busqueda_libro()
+    """,
+]
+for _tabla in ("libro_autor", "libro_genero"):
+    _BUSQUEDA_POR_SENTENCIA += [
+        f"DROP TRIGGER IF EXISTS trg_{_tabla}_busqueda ON {_tabla}",
+        f"DROP TRIGGER IF EXISTS trg_{_tabla}_busqueda_insert ON {_tabla}",
+        f"DROP TRIGGER IF EXISTS trg_{_tabla}_busqueda_delete ON {_tabla}",
+        f"""
+        CREATE TRIGGER trg_{_tabla}_busqueda_insert AFTER INSERT ON {_tabla}
+        REFERENCING NEW TABLE AS filas
+        FOR EACH STATEMENT EXECUTE PROCEDURE libro_busqueda_relaciones()
+        """,
+        f"""
+        CREATE TRIGGER trg_{_tabla}_busqueda_delete AFTER DELETE ON {_tabla}
+        REFERENCING OLD TABLE AS filas
+        FOR EACH STATEMENT EXECUTE PROCEDURE libro_busqueda_relaciones()
+        """,
+    ]
+_BUSQUEDA_POR_SENTENCIA.append("DROP FUNCTION IF EXISTS libro_busqueda_relacion()")
+
+MIGRATIONS = [
+    (1, "esquema inicial", _ESQUEMA_INICIAL),
+    (2, "indices de busqueda inversa", _INDICES_BUSQUEDA_INVERSA),
+    (3, "indice de orden de autor", _INDICE_ORDEN_AUTOR),
+    (4, "busqueda de texto en libros", _BUSQUEDA_LIBRO),
+    (5, "triggers de busqueda por sentencia", _BUSQUEDA_POR_SENTENCIA),
+]
+
 def create_tables():
-    pool = None
-    conn = None
-    cursor = None
-    
+    """
+    Lleva la base a la última versión de MIGRATIONS
+    """
     try:
-        from db.connection_pool import PostgreSQLConnectionPool
-        pool = PostgreSQLConnectionPool.get_instance()
-        conn = pool.get_connection()
-        cursor = conn.cursor()
-        
-        # Create tables
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS autor (
-            id SERIAL PRIMARY KEY,
-            nombre VARCHAR(100) NOT NULL,
-            apellido VARCHAR(100) NOT NULL,
-            fecha_nacimiento DATE,
-            nacionalidad VARCHAR(50),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
-        
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS genero (
-            id SERIAL PRIMARY KEY,
-            nombre VARCHAR(50) NOT NULL UNIQUE,
-            descripcion TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
-        
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS libro (
-            id SERIAL PRIMARY KEY,
-            titulo VARCHAR(200) NOT NULL,
-            isbn VARCHAR(20) UNIQUE,
-            fecha_publicacion DATE,
-            descripcion TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
-        
-        # Create bridge tables for many-to-many relationships
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS libro_autor (
-            libro_id INTEGER REFERENCES libro(id) ON DELETE CASCADE,
-            autor_id INTEGER REFERENCES autor(id) ON DELETE CASCADE,
-            PRIMARY KEY (libro_id, autor_id),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
-        
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS libro_genero (
-            libro_id INTEGER REFERENCES libro(id) ON DELETE CASCADE,
-            genero_id INTEGER REFERENCES genero(id) ON DELETE CASCADE,
-            PRIMARY KEY (libro_id, genero_id),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
-        
-        conn.commit()
-        print("Tables created successfully")
-        
+        migrate(MIGRATIONS)
     except Exception as e:
-        if conn:
-            conn.rollback()
         print(f"Error creating tables: {e}")
-    finally:
-        if cursor:
-            cursor.close()
-        if conn and pool:
-            pool.release_connection(conn)
 
 if __name__ == "__main__":
-    create_tables()
\ No newline at end of file
+    create_tables()
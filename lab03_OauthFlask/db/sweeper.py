@@ -0,0 +1,52 @@
+import threading
+import time
+from models.refresh_token import RefreshToken
+from config import Config
+
+SWEEP_INTERVAL_SECONDS = Config.SWEEP_INTERVAL_SECONDS
+SWEEP_BATCH_SIZE = Config.SWEEP_BATCH_SIZE
+
+
+class ExpiredTokenSweeper:
+    """
+    Hilo en segundo plano que borra refresh tokens expirados en lotes
+    pequeños, para no mantener locks largos ni generar un DELETE gigante.
+    """
+    __instance = None
+
+    @staticmethod
+    def get_instance():
+        if ExpiredTokenSweeper.__instance is None:
+            ExpiredTokenSweeper.__instance = ExpiredTokenSweeper()
+        return ExpiredTokenSweeper.__instance
+
+    def __init__(self, interval=SWEEP_INTERVAL_SECONDS, batch_size=SWEEP_BATCH_SIZE):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.__stop = threading.Event()
+        self.__thread = None
+
+    def start(self):
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__run, name="token-sweeper", daemon=True)
+            self.__thread.start()
+
+    def stop(self):
+        self.__stop.set()
+
+    def sweep(self):
+        total = 0
+        while not self.__stop.is_set():
+            deleted = RefreshToken.purge_expired(self.batch_size)
+            total += deleted
+            if deleted < self.batch_size:
+                break
+            # Pausa breve entre lotes para ceder la base de datos
+            time.sleep(0.05)
+        return total
+
+    def __run(self):
+        while not self.__stop.wait(self.interval):
+            deleted = self.sweep()
+            if deleted:
+                print(f"Purged {deleted} expired refresh tokens")
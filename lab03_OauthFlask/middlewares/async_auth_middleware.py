@@ -0,0 +1,42 @@
+import asyncio
+import math
+from quart import jsonify
+# auth_middleware puts the repository root on sys.path for auth_comun
+from middlewares.auth_middleware import SCOPES, JWT_ISSUER, JWT_AUDIENCE
+from middlewares.rate_limit import api_limiter
+from middlewares.revocation_list import RevocationList
+from models.async_token_revocado import AsyncTokenRevocado
+from auth_comun import KeyRing, TokenCache
+from auth_comun.quart_decorators import AsyncTokenRequired
+
+_revocations = None
+
+async def _is_revoked(jti):
+    # El filtro se consulta en el loop; la carga inicial y la búsqueda exacta no lo bloquean
+    global _revocations
+    if _revocations is None:
+        _revocations = await asyncio.to_thread(RevocationList.get_instance)
+    if not _revocations.might_be_revoked(jti):
+        return False
+    return await AsyncTokenRevocado.esta_revocado(jti)
+
+def _after_validation(payload):
+    # Mismo límite por cliente que el modo sync
+    allowed, retry_after = api_limiter.allow(payload.get('sub'))
+    if not allowed:
+        response = jsonify({"error": "Demasiadas solicitudes"})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+        return response
+    return None
+
+# Mismas reglas que middlewares.auth_middleware.token_required, para vistas async
+token_required = AsyncTokenRequired(
+    KeyRing.get_instance,
+    cache=TokenCache.get_instance,
+    revocation_check=_is_revoked,
+    scope_set=SCOPES,
+    after_validation=_after_validation,
+    issuer=JWT_ISSUER,
+    audience=JWT_AUDIENCE
+)
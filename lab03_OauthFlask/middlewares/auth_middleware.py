@@ -1,37 +1,54 @@
-from flask import request, jsonify
-from functools import wraps
-import jwt
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-JWT_SECRET = os.getenv("JWT_SECRET", "mi_clave_super_secreta")
-
-def token_required(f):
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        token = None
-        
-        # Check if token is in the header
-        auth_header = request.headers.get('Authorization')
-        if auth_header:
-            parts = auth_header.split()
-            if len(parts) == 2 and parts[0].lower() == 'bearer':
-                token = parts[1]
-        
-        if not token:
-            return jsonify({'error': 'Token is missing'}), 401
-        
-        try:
-            # Decode the token
-            payload = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
-            # You can add more validation here if needed
-        except jwt.ExpiredSignatureError:
-            return jsonify({'error': 'Token has expired'}), 401
-        except jwt.InvalidTokenError:
-            return jsonify({'error': 'Invalid token'}), 401
-        
-        return f(*args, **kwargs)
-    
-    return decorated
\ No newline at end of file
+import sys
+
+# Shared auth package lives at the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from auth_comun import KeyRing, TokenCache, TokenRequired, ScopeSet
+from middlewares.revocation_list import RevocationList
+from middlewares.rate_limit import api_limiter, too_many_requests
+from db.connection_pool import set_client
+from config import Config
+
+JWT_ISSUER = Config.JWT_ISSUER
+JWT_AUDIENCE = Config.JWT_AUDIENCE
+
+# Every scope the API knows about; each one gets a bit in the token's scope mask
+SCOPES = ScopeSet([
+    "libros:leer", "libros:escribir",
+    "autores:leer", "autores:escribir",
+    "generos:leer", "generos:escribir",
+    "admin"
+])
+
+def _is_revoked(jti):
+    return RevocationList.get_instance().is_revoked(jti)
+
+def _after_validation(payload):
+    # Per-client throttling before the revocation lookup or the view touch the database
+    allowed, retry_after = api_limiter.allow(payload.get('sub'))
+    if not allowed:
+        return too_many_requests(retry_after)
+    # Read-your-writes: las lecturas de este cliente van al primario si escribió hace poco
+    set_client(payload.get('sub'))
+    return None
+
+token_required = TokenRequired(
+    KeyRing.get_instance,
+    cache=TokenCache.get_instance,
+    revocation_check=_is_revoked,
+    scope_set=SCOPES,
+    after_validation=_after_validation,
+    issuer=JWT_ISSUER,
+    audience=JWT_AUDIENCE
+)
+
+# Validator used outside of routes (introspection, revocation)
+_validator = token_required.validator()
+
+def verify_token(token):
+    """
+    Verifica firma, expiración y revocación del token y devuelve su payload.
+    Lanza jwt.InvalidTokenError (o una subclase) si no es válido.
+    """
+    return _validator.validate(token)
@@ -0,0 +1,134 @@
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from werkzeug.security import check_password_hash
+from models.oauth_client import OAuthClient
+from config import Config
+
+CLIENT_AUTH_CACHE_SECONDS = Config.CLIENT_AUTH_CACHE_SECONDS
+CLIENT_MISS_CACHE_SECONDS = Config.CLIENT_MISS_CACHE_SECONDS
+# Tope de client_id inexistentes recordados; se descarta el más viejo
+_MAX_MISSES = 10000
+
+
+class ClientRegistry:
+    """
+    Índice en memoria de los clientes OAuth activos, cargado una vez desde la
+    tabla oauth_client.
+
+    Las verificaciones exitosas del secreto (un hash lento a propósito) se
+    recuerdan durante CLIENT_AUTH_CACHE_SECONDS como un SHA-256 del secreto
+    presentado, así que una ráfaga de logins del mismo cliente paga el hash
+    lento una sola vez. Los client_id que no existen se recuerdan durante
+    CLIENT_MISS_CACHE_SECONDS para que no cuesten una consulta cada vez.
+    """
+    __instance = None
+    __instance_lock = threading.Lock()
+
+    @staticmethod
+    def get_instance():
+        if ClientRegistry.__instance is None:
+            with ClientRegistry.__instance_lock:
+                if ClientRegistry.__instance is None:
+                    instance = ClientRegistry()
+                    instance.load()
+                    ClientRegistry.__instance = instance
+        return ClientRegistry.__instance
+
+    def __init__(self, cache_seconds=CLIENT_AUTH_CACHE_SECONDS, miss_seconds=CLIENT_MISS_CACHE_SECONDS):
+        self.cache_seconds = cache_seconds
+        self.miss_seconds = miss_seconds
+        self.__clients = {}
+        self.__verified = {}
+        self.__misses = OrderedDict()
+        self.__locks = {}
+        self.__lock = threading.Lock()
+
+    def load(self):
+        clients = {row['client_id']: dict(row) for row in OAuthClient.get_all_activos()}
+        with self.__lock:
+            self.__clients = clients
+            self.__verified.clear()
+            self.__misses.clear()
+        print(f"Loaded {len(clients)} oauth clients")
+
+    def add(self, client):
+        """
+        Agrega o reemplaza un cliente en el índice (dict con client_id,
+        secret_hash y token_lifetime)
+        """
+        with self.__lock:
+            self.__clients[client['client_id']] = dict(client)
+            self.__verified.pop(client['client_id'], None)
+            self.__misses.pop(client['client_id'], None)
+
+    def remove(self, client_id):
+        with self.__lock:
+            self.__clients.pop(client_id, None)
+            self.__verified.pop(client_id, None)
+
+    def get(self, client_id):
+        client = self.__clients.get(client_id)
+        if client is None and client_id and not self.__is_missing(client_id):
+            # Cliente creado después del arranque. Si la consulta falla la
+            # excepción sube y el id no queda recordado como inexistente
+            client = OAuthClient.get_by_client_id(client_id)
+            if client:
+                self.add(client)
+                client = dict(client)
+            else:
+                self.__add_miss(client_id)
+        return client
+
+    def __is_missing(self, client_id):
+        with self.__lock:
+            expires = self.__misses.get(client_id)
+            if expires is None:
+                return False
+            if expires > time.monotonic():
+                return True
+            del self.__misses[client_id]
+            return False
+
+    def __add_miss(self, client_id):
+        with self.__lock:
+            self.__misses[client_id] = time.monotonic() + self.miss_seconds
+            self.__misses.move_to_end(client_id)
+            if len(self.__misses) > _MAX_MISSES:
+                self.__misses.popitem(last=False)
+
+    def authenticate(self, client_id, client_secret):
+        """
+        Devuelve el cliente si las credenciales son válidas, o None
+        """
+        if not client_id or not client_secret:
+            return None
+
+        client = self.get(client_id)
+        if client is None:
+            return None
+
+        digest = hashlib.sha256(client_secret.encode('utf-8')).digest()
+        if self.__is_cached(client_id, digest):
+            return client
+
+        # Un lock por cliente: ante una ráfaga solo uno calcula el hash lento
+        with self.__lock:
+            client_lock = self.__locks.setdefault(client_id, threading.Lock())
+        with client_lock:
+            if self.__is_cached(client_id, digest):
+                return client
+            if not check_password_hash(client['secret_hash'], client_secret):
+                return None
+            with self.__lock:
+                self.__verified[client_id] = (digest, time.monotonic() + self.cache_seconds)
+        return client
+
+    def __is_cached(self, client_id, digest):
+        entry = self.__verified.get(client_id)
+        if entry is None:
+            return False
+        cached_digest, expires = entry
+        return expires > time.monotonic() and hmac.compare_digest(cached_digest, digest)
@@ -0,0 +1,151 @@
+from flask import jsonify
+from collections import OrderedDict
+from functools import wraps
+import math
+import threading
+import time
+from config import Config
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+RATE_LIMIT_REDIS_URL = Config.RATE_LIMIT_REDIS_URL
+API_RATE_LIMIT = Config.API_RATE_LIMIT
+API_RATE_BURST = Config.API_RATE_BURST
+TOKEN_RATE_LIMIT = Config.TOKEN_RATE_LIMIT
+TOKEN_RATE_BURST = Config.TOKEN_RATE_BURST
+TOKEN_IP_RATE_LIMIT = Config.TOKEN_IP_RATE_LIMIT
+TOKEN_IP_RATE_BURST = Config.TOKEN_IP_RATE_BURST
+
+# Token bucket atómico en Redis: devuelve {permitido, segundos_de_espera}
+_REDIS_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local data = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(data[1]) or burst
+local ts = tonumber(data[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 't', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(retry)}
+"""
+
+
+class TokenBucketLimiter:
+    """
+    Limitador token bucket por clave (IP, client_id o sub del JWT).
+
+    En memoria el estado se reparte en shards con su propio lock para que
+    hilos con claves distintas no compitan; un shard lleno descarta la clave
+    usada hace más tiempo. Con RATE_LIMIT_REDIS_URL el estado
+    vive en Redis y todos los workers comparten los mismos límites; si Redis
+    falla se sigue limitando en memoria.
+    """
+    def __init__(self, name, rate, burst, shards=16, max_keys_per_shard=10000, redis_url=RATE_LIMIT_REDIS_URL):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.rejected = 0
+        self.max_keys_per_shard = max_keys_per_shard
+        self.__shards = [(threading.Lock(), OrderedDict()) for _ in range(shards)]
+        self.__redis = None
+        self.__script = None
+        if redis_url:
+            if redis is None:
+                print("RATE_LIMIT_REDIS_URL configurado pero el paquete redis no está instalado")
+            else:
+                self.__redis = redis.Redis.from_url(redis_url)
+                self.__script = self.__redis.register_script(_REDIS_SCRIPT)
+
+    def allow(self, key, cost=1):
+        """
+        Devuelve (permitido, segundos hasta poder reintentar)
+        """
+        if self.rate <= 0:
+            return True, 0
+
+        if self.__redis is not None:
+            try:
+                allowed, retry = self.__script(keys=[f"ratelimit:{self.name}:{key}"],
+                                               args=[self.rate, self.burst, time.time(), cost])
+                allowed, retry = bool(allowed), float(retry)
+                if not allowed:
+                    self.rejected += 1
+                return allowed, retry
+            except Exception as e:
+                print(f"Error en rate limit con Redis, usando memoria: {e}")
+
+        return self.__allow_local(key, cost)
+
+    def __allow_local(self, key, cost):
+        lock, buckets = self.__shards[hash(key) % len(self.__shards)]
+        now = time.monotonic()
+        with lock:
+            bucket = buckets.get(key)
+            if bucket is None:
+                if len(buckets) >= self.max_keys_per_shard:
+                    buckets.popitem(last=False)
+                bucket = buckets[key] = [self.burst, now]
+            else:
+                buckets.move_to_end(key)
+
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens >= cost:
+                bucket[0] = tokens - cost
+                return True, 0
+
+            bucket[0] = tokens
+            self.rejected += 1
+            return False, (cost - tokens) / self.rate
+
+    def stats(self):
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "rejected": self.rejected,
+            "keys": sum(len(buckets) for _, buckets in self.__shards),
+            "shared": self.__redis is not None
+        }
+
+
+api_limiter = TokenBucketLimiter("api", API_RATE_LIMIT, API_RATE_BURST)
+# /token se limita primero por IP, antes de saber si el client_id es real,
+# y después por cliente una vez autenticado
+token_ip_limiter = TokenBucketLimiter("token_ip", TOKEN_IP_RATE_LIMIT, TOKEN_IP_RATE_BURST)
+token_limiter = TokenBucketLimiter("token", TOKEN_RATE_LIMIT, TOKEN_RATE_BURST)
+
+
+def too_many_requests(retry_after):
+    response = jsonify({"error": "Demasiadas solicitudes"})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def rate_limited(limiter, key_func):
+    """
+    Rechaza con 429 antes de ejecutar la vista (y de tomar una conexión)
+    cuando la clave devuelta por key_func agotó su bucket
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            allowed, retry_after = limiter.allow(key_func())
+            if not allowed:
+                return too_many_requests(retry_after)
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
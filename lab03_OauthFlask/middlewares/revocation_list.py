@@ -0,0 +1,188 @@
+import hashlib
+import math
+import threading
+import time
+from models.token_revocado import TokenRevocado
+from config import Config
+
+REVOCATION_CAPACITY = Config.REVOCATION_CAPACITY
+REVOCATION_FP_RATE = Config.REVOCATION_FP_RATE
+REVOCATION_REFRESH_SECONDS = Config.REVOCATION_REFRESH_SECONDS
+REVOCATION_REFRESH_OVERLAP = Config.REVOCATION_REFRESH_OVERLAP
+REVOCATION_REBUILD_SECONDS = Config.REVOCATION_REBUILD_SECONDS
+REFRESH_BATCH = 10000
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom sobre un bytearray. Un resultado negativo es definitivo;
+    uno positivo solo indica que hace falta la búsqueda exacta.
+    """
+    def __init__(self, capacity, fp_rate):
+        self.size = max(8, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self.__bits = bytearray((self.size + 7) // 8)
+        self.__lock = threading.Lock()
+
+    def __positions(self, value):
+        # Double hashing: k posiciones a partir de un solo digest
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.num_hashes)]
+
+    def add(self, value):
+        positions = self.__positions(value)
+        with self.__lock:
+            for pos in positions:
+                self.__bits[pos >> 3] |= 1 << (pos & 7)
+            self.count += 1
+
+    def __contains__(self, value):
+        bits = self.__bits
+        for pos in self.__positions(value):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+
+class RevocationList:
+    """
+    Lista de jti revocados. Se consulta primero el filtro de Bloom en memoria
+    y solo sus aciertos llegan a la tabla token_revocado. Un hilo en segundo
+    plano agrega al filtro las revocaciones nuevas, releyendo los últimos
+    overlap ids ya vistos, y cada rebuild_seconds arma un filtro nuevo solo
+    con las vigentes para que las vencidas dejen de ocuparlo.
+    """
+    __instance = None
+    __instance_lock = threading.Lock()
+
+    @staticmethod
+    def get_instance():
+        if RevocationList.__instance is None:
+            with RevocationList.__instance_lock:
+                if RevocationList.__instance is None:
+                    instance = RevocationList()
+                    instance.start()
+                    RevocationList.__instance = instance
+        return RevocationList.__instance
+
+    @staticmethod
+    def set_instance(instance):
+        RevocationList.__instance = instance
+
+    def __init__(self, capacity=REVOCATION_CAPACITY, fp_rate=REVOCATION_FP_RATE,
+                 refresh_seconds=REVOCATION_REFRESH_SECONDS, overlap=REVOCATION_REFRESH_OVERLAP,
+                 rebuild_seconds=REVOCATION_REBUILD_SECONDS):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.bloom = BloomFilter(capacity, fp_rate)
+        self.refresh_seconds = refresh_seconds
+        self.overlap = overlap
+        self.rebuild_seconds = rebuild_seconds
+        self.bloom_hits = 0
+        self.rebuilds = 0
+        self.__last_id = 0
+        self.__last_rebuild = time.monotonic()
+        # jti revocados en este proceso mientras se arma un filtro nuevo
+        self.__recientes = None
+        self.__refresh_lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread = None
+
+    def start(self):
+        # Carga inicial síncrona para no aceptar tokens ya revocados
+        self.refresh()
+        self.__thread = threading.Thread(target=self.__run, name="revocation-refresh", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        self.__stop.set()
+
+    def __run(self):
+        while not self.__stop.wait(self.refresh_seconds):
+            if self.rebuild_seconds and time.monotonic() - self.__last_rebuild >= self.rebuild_seconds:
+                self.rebuild()
+            else:
+                self.refresh()
+
+    def __load(self, bloom, desde):
+        # Los ids se asignan al insertar pero se ven al confirmar, así que se
+        # relee desde overlap ids antes del último para no saltear ninguno
+        last_id = desde
+        desde = max(0, desde - self.overlap)
+        while True:
+            rows = TokenRevocado.get_desde(desde, REFRESH_BATCH)
+            if rows is None:
+                return None
+            for row in rows:
+                if row['jti'] not in bloom:
+                    bloom.add(row['jti'])
+                desde = row['id']
+            last_id = max(last_id, desde)
+            if len(rows) < REFRESH_BATCH:
+                return last_id
+
+    def refresh(self):
+        """
+        Agrega al filtro las revocaciones nuevas
+        """
+        with self.__refresh_lock:
+            last_id = self.__load(self.bloom, self.__last_id)
+            if last_id is not None:
+                self.__last_id = last_id
+
+    def rebuild(self):
+        """
+        Reemplaza el filtro por uno nuevo con las revocaciones vigentes
+        """
+        with self.__refresh_lock:
+            self.__recientes = []
+            bloom = BloomFilter(self.capacity, self.fp_rate)
+            last_id = self.__load(bloom, 0)
+            if last_id is None:
+                # Sin la base se sigue con el filtro actual y se reintenta en el próximo ciclo
+                self.__recientes = None
+                return False
+            self.bloom = bloom
+            recientes, self.__recientes = self.__recientes, None
+            for jti in recientes:
+                bloom.add(jti)
+            self.__last_id = last_id
+            self.__last_rebuild = time.monotonic()
+            self.rebuilds += 1
+            return True
+
+    def revoke(self, jti, expira_en=None):
+        if not TokenRevocado.revocar(jti, expira_en):
+            return False
+        # Visible de inmediato en este proceso; los demás lo verán en el próximo refresh.
+        # Se anota antes de agregarlo por si rebuild() cambia el filtro en el medio.
+        recientes = self.__recientes
+        if recientes is not None:
+            recientes.append(jti)
+        self.bloom.add(jti)
+        return True
+
+    def might_be_revoked(self, jti):
+        """
+        Solo el filtro, en memoria: False es definitivo, True pide la búsqueda exacta
+        """
+        if not jti or jti not in self.bloom:
+            return False
+        self.bloom_hits += 1
+        return True
+
+    def is_revoked(self, jti):
+        return self.might_be_revoked(jti) and TokenRevocado.esta_revocado(jti)
+
+    def stats(self):
+        return {
+            "bloom_adds": self.bloom.count,
+            "bloom_bits": self.bloom.size,
+            "bloom_hashes": self.bloom.num_hashes,
+            "bloom_hits": self.bloom_hits,
+            "rebuilds": self.rebuilds,
+            "last_id": self.__last_id
+        }
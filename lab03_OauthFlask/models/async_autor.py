@@ -0,0 +1,78 @@
+from db.async_pool import AsyncConnectionPool, as_date
+from db.connection_pool import PoolTimeoutError, statement_sql
+from models.autor import AUTOR_TODOS, AUTOR_PAGINA, AUTOR_PAGINA_DESDE, AUTOR_POR_ID, AUTOR_ACTUALIZAR, AUTOR_CREAR, AUTOR_ELIMINAR
+
+class AsyncAutor:
+    """
+    Versión async de Autor para el modo ASGI; mismas consultas y resultados
+    """
+    def __init__(self, id=None, nombre=None, apellido=None, fecha_nacimiento=None, nacionalidad=None):
+        self.id = id
+        self.nombre = nombre
+        self.apellido = apellido
+        self.fecha_nacimiento = fecha_nacimiento
+        self.nacionalidad = nacionalidad
+
+    @staticmethod
+    async def get_all():
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                return [dict(row) for row in await conn.fetch(statement_sql(AUTOR_TODOS))]
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error fetching autores: {e}")
+            return []
+
+    @staticmethod
+    async def get_page(limite, despues_de=None):
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                if despues_de is None:
+                    rows = await conn.fetch(statement_sql(AUTOR_PAGINA), limite)
+                else:
+                    rows = await conn.fetch(statement_sql(AUTOR_PAGINA_DESDE), *despues_de, limite)
+                return [dict(row) for row in rows]
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error fetching autores: {e}")
+            return []
+
+    @staticmethod
+    async def get_by_id(autor_id):
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                row = await conn.fetchrow(statement_sql(AUTOR_POR_ID), autor_id)
+                return dict(row) if row else None
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error fetching autor: {e}")
+            return None
+
+    async def save(self):
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                params = (self.nombre, self.apellido, as_date(self.fecha_nacimiento), self.nacionalidad)
+                if self.id:
+                    row = await conn.fetchrow(statement_sql(AUTOR_ACTUALIZAR), *params, self.id)
+                else:
+                    row = await conn.fetchrow(statement_sql(AUTOR_CREAR), *params)
+                return dict(row) if row else None
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error saving autor: {e}")
+            return None
+
+    @staticmethod
+    async def delete(autor_id):
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                return await conn.fetchval(statement_sql(AUTOR_ELIMINAR), autor_id) is not None
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error deleting autor: {e}")
+            return False
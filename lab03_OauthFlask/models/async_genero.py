@@ -0,0 +1,75 @@
+from db.async_pool import AsyncConnectionPool
+from db.connection_pool import PoolTimeoutError, statement_sql
+from models.genero import GENERO_TODOS, GENERO_PAGINA, GENERO_PAGINA_DESDE, GENERO_POR_ID, GENERO_ACTUALIZAR, GENERO_CREAR, GENERO_ELIMINAR
+
+class AsyncGenero:
+    """
+    Versión async de Genero para el modo ASGI; mismas consultas y resultados
+    """
+    def __init__(self, id=None, nombre=None, descripcion=None):
+        self.id = id
+        self.nombre = nombre
+        self.descripcion = descripcion
+
+    @staticmethod
+    async def get_all():
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                return [dict(row) for row in await conn.fetch(statement_sql(GENERO_TODOS))]
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error fetching generos: {e}")
+            return []
+
+    @staticmethod
+    async def get_page(limite, despues_de=None):
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                if despues_de is None:
+                    rows = await conn.fetch(statement_sql(GENERO_PAGINA), limite)
+                else:
+                    rows = await conn.fetch(statement_sql(GENERO_PAGINA_DESDE), *despues_de, limite)
+                return [dict(row) for row in rows]
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error fetching generos: {e}")
+            return []
+
+    @staticmethod
+    async def get_by_id(genero_id):
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                row = await conn.fetchrow(statement_sql(GENERO_POR_ID), genero_id)
+                return dict(row) if row else None
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error fetching genero: {e}")
+            return None
+
+    async def save(self):
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                if self.id:
+                    row = await conn.fetchrow(statement_sql(GENERO_ACTUALIZAR), self.nombre, self.descripcion, self.id)
+                else:
+                    row = await conn.fetchrow(statement_sql(GENERO_CREAR), self.nombre, self.descripcion)
+                return dict(row) if row else None
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error saving genero: {e}")
+            return None
+
+    @staticmethod
+    async def delete(genero_id):
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                return await conn.fetchval(statement_sql(GENERO_ELIMINAR), genero_id) is not None
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error deleting genero: {e}")
+            return False
@@ -0,0 +1,256 @@
+from db.async_pool import AsyncConnectionPool, as_date
+from db.connection_pool import PoolTimeoutError, statement_sql
+from models.libro import (LIBRO_TODOS, LIBRO_PAGINA, LIBRO_PAGINA_DESDE, LIBRO_POR_ID, LIBRO_AUTORES,
+                          LIBRO_GENEROS, LIBRO_ACTUALIZAR, LIBRO_CREAR, LIBRO_ELIMINAR, LIBRO_AGREGAR_AUTOR,
+                          LIBRO_QUITAR_AUTOR, LIBRO_AGREGAR_GENERO, LIBRO_QUITAR_GENERO, LIBRO_RELACIONES,
+                          LIBRO_POR_AUTOR, LIBRO_POR_GENERO, LIBRO_BUSCAR, LIBRO_BUSCAR_DESDE,
+                          _rechazar, _insertadas)
+
+class AsyncLibro:
+    """
+    Versión async de Libro para el modo ASGI; mismas consultas y resultados
+    """
+    def __init__(self, id=None, titulo=None, isbn=None, fecha_publicacion=None, descripcion=None):
+        self.id = id
+        self.titulo = titulo
+        self.isbn = isbn
+        self.fecha_publicacion = fecha_publicacion
+        self.descripcion = descripcion
+
+    @staticmethod
+    async def _relaciones(conn, libro):
+        libro['autores'] = [dict(row) for row in await conn.fetch(statement_sql(LIBRO_AUTORES), libro['id'])]
+        libro['generos'] = [dict(row) for row in await conn.fetch(statement_sql(LIBRO_GENEROS), libro['id'])]
+        return libro
+
+    @staticmethod
+    async def _cargar_relaciones(conn, libros, include=tuple(LIBRO_RELACIONES)):
+        # Igual que Libro._cargar_relaciones: una consulta por relación para todos los libros
+        if not libros:
+            return libros
+        por_id = {libro['id']: libro for libro in libros}
+        ids = list(por_id)
+        for relacion in include:
+            for libro in libros:
+                libro[relacion] = []
+            for row in await conn.fetch(statement_sql(LIBRO_RELACIONES[relacion]), ids):
+                row = dict(row)
+                por_id[row.pop('libro_id')][relacion].append(row)
+        return libros
+
+    @staticmethod
+    async def get_all():
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                return [dict(row) for row in await conn.fetch(statement_sql(LIBRO_TODOS))]
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error fetching libros: {e}")
+            return []
+
+    @staticmethod
+    async def get_page(limite, despues_de=None, include=()):
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                if despues_de is None:
+                    rows = await conn.fetch(statement_sql(LIBRO_PAGINA), limite)
+                else:
+                    rows = await conn.fetch(statement_sql(LIBRO_PAGINA_DESDE), *despues_de, limite)
+                return await AsyncLibro._cargar_relaciones(conn, [dict(row) for row in rows], include)
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error fetching libros: {e}")
+            return []
+
+    @staticmethod
+    async def search(q, limite, despues_de=None, include=()):
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                if despues_de is None:
+                    rows = await conn.fetch(statement_sql(LIBRO_BUSCAR), q, limite)
+                else:
+                    rows = await conn.fetch(statement_sql(LIBRO_BUSCAR_DESDE), q, *despues_de, limite)
+                return await AsyncLibro._cargar_relaciones(conn, [dict(row) for row in rows], include)
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error searching libros: {e}")
+            return []
+
+    @staticmethod
+    async def get_by_id(libro_id):
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                row = await conn.fetchrow(statement_sql(LIBRO_POR_ID), libro_id)
+                if row is None:
+                    return None
+                return await AsyncLibro._relaciones(conn, dict(row))
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error fetching libro: {e}")
+            return None
+
+    async def save(self):
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                params = (self.titulo, self.isbn, as_date(self.fecha_publicacion), self.descripcion)
+                if self.id:
+                    row = await conn.fetchrow(statement_sql(LIBRO_ACTUALIZAR), *params, self.id)
+                else:
+                    row = await conn.fetchrow(statement_sql(LIBRO_CREAR), *params)
+                return dict(row) if row else None
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error saving libro: {e}")
+            return None
+
+    @staticmethod
+    async def bulk_create(filas):
+        """
+        Como Libro.bulk_create: los libros entran con un INSERT sobre unnest
+        y las relaciones con COPY, todo en una transacción
+        """
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                async with conn.transaction():
+                    rows = await conn.fetch("SELECT id FROM autor WHERE id = ANY($1::int[])",
+                                            list({a for fila in filas for a in fila['autores']}))
+                    autores = {row['id'] for row in rows}
+                    rows = await conn.fetch("SELECT id FROM genero WHERE id = ANY($1::int[])",
+                                            list({g for fila in filas for g in fila['generos']}))
+                    generos = {row['id'] for row in rows}
+                    rows = await conn.fetch("SELECT isbn FROM libro WHERE isbn = ANY($1::varchar[])",
+                                            [fila['isbn'] for fila in filas if fila['isbn']])
+                    filas, errores = _rechazar(filas, autores, generos, {row['isbn'] for row in rows})
+
+                    if filas:
+                        rows = await conn.fetch("SELECT nextval(pg_get_serial_sequence('libro', 'id')) AS id "
+                                                "FROM generate_series(1, $1)", len(filas))
+                        for fila, row in zip(filas, rows):
+                            fila['id'] = row['id']
+
+                        rows = await conn.fetch("""
+                            INSERT INTO libro (id, titulo, isbn, fecha_publicacion, descripcion)
+                            SELECT * FROM unnest($1::int[], $2::varchar[], $3::varchar[], $4::date[], $5::text[])
+                            ON CONFLICT (isbn) DO NOTHING RETURNING id
+                        """, [f['id'] for f in filas], [f['titulo'] for f in filas], [f['isbn'] for f in filas],
+                            [f['fecha_publicacion'] for f in filas], [f['descripcion'] for f in filas])
+                        filas = _insertadas(filas, {row['id'] for row in rows}, errores)
+
+                        libro_autores = [(f['id'], a) for f in filas for a in f['autores']]
+                        if libro_autores:
+                            await conn.copy_records_to_table('libro_autor', records=libro_autores,
+                                                             columns=['libro_id', 'autor_id'])
+                        libro_generos = [(f['id'], g) for f in filas for g in f['generos']]
+                        if libro_generos:
+                            await conn.copy_records_to_table('libro_genero', records=libro_generos,
+                                                             columns=['libro_id', 'genero_id'])
+                return [{"indice": f['indice'], "id": f['id']} for f in filas], errores
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error bulk creating libros: {e}")
+            return None
+
+    @staticmethod
+    async def delete(libro_id):
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                return await conn.fetchval(statement_sql(LIBRO_ELIMINAR), libro_id) is not None
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error deleting libro: {e}")
+            return False
+
+    @staticmethod
+    async def __execute(name, *args, error):
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                await conn.execute(statement_sql(name), *args)
+                return True
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"{error}: {e}")
+            return False
+
+    @staticmethod
+    async def add_autor(libro_id, autor_id):
+        return await AsyncLibro.__execute(LIBRO_AGREGAR_AUTOR, libro_id, autor_id,
+                                          error="Error adding autor to libro")
+
+    @staticmethod
+    async def remove_autor(libro_id, autor_id):
+        return await AsyncLibro.__execute(LIBRO_QUITAR_AUTOR, libro_id, autor_id,
+                                          error="Error removing autor from libro")
+
+    @staticmethod
+    async def add_genero(libro_id, genero_id):
+        return await AsyncLibro.__execute(LIBRO_AGREGAR_GENERO, libro_id, genero_id,
+                                          error="Error adding genero to libro")
+
+    @staticmethod
+    async def remove_genero(libro_id, genero_id):
+        return await AsyncLibro.__execute(LIBRO_QUITAR_GENERO, libro_id, genero_id,
+                                          error="Error removing genero from libro")
+
+    @staticmethod
+    async def __replace(libro_id, ids, delete_sql, insert_name, error):
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                async with conn.transaction():
+                    await conn.execute(delete_sql, libro_id)
+                    await conn.executemany(statement_sql(insert_name), [(libro_id, id) for id in ids])
+                return True
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"{error}: {e}")
+            return False
+
+    @staticmethod
+    async def set_autores(libro_id, autor_ids):
+        """
+        Reemplaza los autores del libro en una sola transacción
+        """
+        return await AsyncLibro.__replace(libro_id, autor_ids, "DELETE FROM libro_autor WHERE libro_id = $1",
+                                          LIBRO_AGREGAR_AUTOR, "Error updating libro-autor relationships")
+
+    @staticmethod
+    async def set_generos(libro_id, genero_ids):
+        """
+        Reemplaza los géneros del libro en una sola transacción
+        """
+        return await AsyncLibro.__replace(libro_id, genero_ids, "DELETE FROM libro_genero WHERE libro_id = $1",
+                                          LIBRO_AGREGAR_GENERO, "Error updating libro-genero relationships")
+
+    @staticmethod
+    async def __get_by(name, value, error):
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                libros = [dict(row) for row in await conn.fetch(statement_sql(name), value)]
+                return await AsyncLibro._cargar_relaciones(conn, libros)
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"{error}: {e}")
+            return []
+
+    @staticmethod
+    async def get_by_genero(genero_id):
+        """
+        Obtiene todos los libros de un género específico
+        """
+        return await AsyncLibro.__get_by(LIBRO_POR_GENERO, genero_id, "Error getting books by genre")
+
+    @staticmethod
+    async def get_by_autor(autor_id):
+        """
+        Obtiene todos los libros de un autor específico
+        """
+        return await AsyncLibro.__get_by(LIBRO_POR_AUTOR, autor_id, "Error getting books by author")
@@ -0,0 +1,17 @@
+from db.async_pool import AsyncConnectionPool
+
+class AsyncTokenRevocado:
+    """
+    Búsqueda exacta de revocaciones para el modo ASGI, sin bloquear el loop
+    """
+    @staticmethod
+    async def esta_revocado(jti):
+        """
+        Igual que TokenRevocado.esta_revocado: ante un error se asume revocado
+        """
+        try:
+            async with AsyncConnectionPool.get_instance().connection() as conn:
+                return await conn.fetchval("SELECT 1 FROM token_revocado WHERE jti = $1", jti) is not None
+        except Exception as e:
+            print(f"Error checking revoked token: {e}")
+            return True
@@ -1,6 +1,25 @@
-from db.connection_pool import PostgreSQLConnectionPool
+from db.connection_pool import PostgreSQLConnectionPool, PoolTimeoutError, prepared_statement
 import psycopg2.extras
 
+AUTOR_TODOS = prepared_statement("autor_todos", "SELECT * FROM autor ORDER BY apellido, nombre")
+AUTOR_PAGINA = prepared_statement("autor_pagina", "SELECT * FROM autor ORDER BY apellido, nombre, id LIMIT $1")
+AUTOR_PAGINA_DESDE = prepared_statement("autor_pagina_desde", """
+SELECT * FROM autor WHERE (apellido, nombre, id) > ($1, $2, $3)
+ORDER BY apellido, nombre, id LIMIT $4
+""")
+# Orden de get_page (columna, tipo); el cursor de la página siguiente son estos valores de la última fila
+AUTOR_ORDEN = (("apellido", str), ("nombre", str), ("id", int))
+AUTOR_POR_ID = prepared_statement("autor_por_id", "SELECT * FROM autor WHERE id = $1")
+AUTOR_ACTUALIZAR = prepared_statement("autor_actualizar", """
+UPDATE autor SET nombre = $1, apellido = $2, fecha_nacimiento = $3, nacionalidad = $4,
+updated_at = CURRENT_TIMESTAMP WHERE id = $5 RETURNING *
+""")
+AUTOR_CREAR = prepared_statement("autor_crear", """
+INSERT INTO autor (nombre, apellido, fecha_nacimiento, nacionalidad)
+VALUES ($1, $2, $3, $4) RETURNING *
+""")
+AUTOR_ELIMINAR = prepared_statement("autor_eliminar", "DELETE FROM autor WHERE id = $1 RETURNING id")
+
 class Autor:
     def __init__(self, id=None, nombre=None, apellido=None, fecha_nacimiento=None, nacionalidad=None):
         self.id = id
@@ -11,104 +30,83 @@ class Autor:
     
     @staticmethod
     def get_all():
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            
-            cursor.execute("SELECT * FROM autor ORDER BY apellido, nombre")
-            return cursor.fetchall()
+            with pool.read_connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    pool.execute(cursor, AUTOR_TODOS)
+                    return cursor.fetchall()
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error fetching autores: {e}")
+            return []
+    
+    @staticmethod
+    def get_page(limite, despues_de=None):
+        """
+        Hasta limite autores ordenados por apellido y nombre, a partir de despues_de
+        (los valores de AUTOR_ORDEN del último de la página anterior)
+        """
+        try:
+            pool = PostgreSQLConnectionPool.get_instance()
+            with pool.read_connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    if despues_de is None:
+                        pool.execute(cursor, AUTOR_PAGINA, (limite,))
+                    else:
+                        pool.execute(cursor, AUTOR_PAGINA_DESDE, (*despues_de, limite))
+                    return cursor.fetchall()
+        except PoolTimeoutError:
+            raise
         except Exception as e:
             print(f"Error fetching autores: {e}")
             return []
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
     
     @staticmethod
     def get_by_id(autor_id):
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            
-            cursor.execute("SELECT * FROM autor WHERE id = %s", (autor_id,))
-            return cursor.fetchone()
+            with pool.read_connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    pool.execute(cursor, AUTOR_POR_ID, (autor_id,))
+                    return cursor.fetchone()
+        except PoolTimeoutError:
+            raise
         except Exception as e:
             print(f"Error fetching autor: {e}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
     
     def save(self):
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            
-            if self.id:
-                cursor.execute("""
-                UPDATE autor SET nombre = %s, apellido = %s, fecha_nacimiento = %s, nacionalidad = %s, 
-                updated_at = CURRENT_TIMESTAMP WHERE id = %s RETURNING *
-                """, (self.nombre, self.apellido, self.fecha_nacimiento, self.nacionalidad, self.id))
-            else:
-                cursor.execute("""
-                INSERT INTO autor (nombre, apellido, fecha_nacimiento, nacionalidad) 
-                VALUES (%s, %s, %s, %s) RETURNING *
-                """, (self.nombre, self.apellido, self.fecha_nacimiento, self.nacionalidad))
-            
-            conn.commit()
-            return cursor.fetchone()
+            with pool.connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    if self.id:
+                        pool.execute(cursor, AUTOR_ACTUALIZAR, (self.nombre, self.apellido, self.fecha_nacimiento, self.nacionalidad, self.id))
+                    else:
+                        pool.execute(cursor, AUTOR_CREAR, (self.nombre, self.apellido, self.fecha_nacimiento, self.nacionalidad))
+
+                    conn.commit()
+                    return cursor.fetchone()
+        except PoolTimeoutError:
+            raise
         except Exception as e:
-            if conn:
-                conn.rollback()
             print(f"Error saving autor: {e}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
     
     @staticmethod
     def delete(autor_id):
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("DELETE FROM autor WHERE id = %s RETURNING id", (autor_id,))
-            result = cursor.fetchone()
-            conn.commit()
-            return result is not None
+            with pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    pool.execute(cursor, AUTOR_ELIMINAR, (autor_id,))
+                    result = cursor.fetchone()
+                    conn.commit()
+                    return result is not None
+        except PoolTimeoutError:
+            raise
         except Exception as e:
-            if conn:
-                conn.rollback()
             print(f"Error deleting autor: {e}")
-            return False
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
\ No newline at end of file
+            return False
\ No newline at end of file
@@ -1,6 +1,22 @@
-from db.connection_pool import PostgreSQLConnectionPool
+from db.connection_pool import PostgreSQLConnectionPool, PoolTimeoutError, prepared_statement
 import psycopg2.extras
 
+GENERO_TODOS = prepared_statement("genero_todos", "SELECT * FROM genero ORDER BY nombre")
+GENERO_PAGINA = prepared_statement("genero_pagina", "SELECT * FROM genero ORDER BY nombre, id LIMIT $1")
+GENERO_PAGINA_DESDE = prepared_statement("genero_pagina_desde", """
+SELECT * FROM genero WHERE (nombre, id) > ($1, $2)
+ORDER BY nombre, id LIMIT $3
+""")
+# Orden de get_page (columna, tipo); el cursor de la página siguiente son estos valores de la última fila
+GENERO_ORDEN = (("nombre", str), ("id", int))
+GENERO_POR_ID = prepared_statement("genero_por_id", "SELECT * FROM genero WHERE id = $1")
+GENERO_ACTUALIZAR = prepared_statement("genero_actualizar", """
+UPDATE genero SET nombre = $1, descripcion = $2, updated_at = CURRENT_TIMESTAMP
+WHERE id = $3 RETURNING *
+""")
+GENERO_CREAR = prepared_statement("genero_crear", "INSERT INTO genero (nombre, descripcion) VALUES ($1, $2) RETURNING *")
+GENERO_ELIMINAR = prepared_statement("genero_eliminar", "DELETE FROM genero WHERE id = $1 RETURNING id")
+
 class Genero:
     def __init__(self, id=None, nombre=None, descripcion=None):
         self.id = id
@@ -9,103 +25,83 @@ class Genero:
     
     @staticmethod
     def get_all():
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            
-            cursor.execute("SELECT * FROM genero ORDER BY nombre")
-            return cursor.fetchall()
+            with pool.read_connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    pool.execute(cursor, GENERO_TODOS)
+                    return cursor.fetchall()
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error fetching generos: {e}")
+            return []
+    
+    @staticmethod
+    def get_page(limite, despues_de=None):
+        """
+        Hasta limite géneros ordenados por nombre, a partir de despues_de
+        (los valores de GENERO_ORDEN del último de la página anterior)
+        """
+        try:
+            pool = PostgreSQLConnectionPool.get_instance()
+            with pool.read_connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    if despues_de is None:
+                        pool.execute(cursor, GENERO_PAGINA, (limite,))
+                    else:
+                        pool.execute(cursor, GENERO_PAGINA_DESDE, (*despues_de, limite))
+                    return cursor.fetchall()
+        except PoolTimeoutError:
+            raise
         except Exception as e:
             print(f"Error fetching generos: {e}")
             return []
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
     
     @staticmethod
     def get_by_id(genero_id):
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            
-            cursor.execute("SELECT * FROM genero WHERE id = %s", (genero_id,))
-            return cursor.fetchone()
+            with pool.read_connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    pool.execute(cursor, GENERO_POR_ID, (genero_id,))
+                    return cursor.fetchone()
+        except PoolTimeoutError:
+            raise
         except Exception as e:
             print(f"Error fetching genero: {e}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
     
     def save(self):
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            
-            if self.id:
-                cursor.execute("""
-                UPDATE genero SET nombre = %s, descripcion = %s, updated_at = CURRENT_TIMESTAMP 
-                WHERE id = %s RETURNING *
-                """, (self.nombre, self.descripcion, self.id))
-            else:
-                cursor.execute("""
-                INSERT INTO genero (nombre, descripcion) VALUES (%s, %s) RETURNING *
-                """, (self.nombre, self.descripcion))
-            
-            conn.commit()
-            return cursor.fetchone()
+            with pool.connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    if self.id:
+                        pool.execute(cursor, GENERO_ACTUALIZAR, (self.nombre, self.descripcion, self.id))
+                    else:
+                        pool.execute(cursor, GENERO_CREAR, (self.nombre, self.descripcion))
+
+                    conn.commit()
+                    return cursor.fetchone()
+        except PoolTimeoutError:
+            raise
         except Exception as e:
-            if conn:
-                conn.rollback()
             print(f"Error saving genero: {e}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
     
     @staticmethod
     def delete(genero_id):
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("DELETE FROM genero WHERE id = %s RETURNING id", (genero_id,))
-            result = cursor.fetchone()
-            conn.commit()
-            return result is not None
+            with pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    pool.execute(cursor, GENERO_ELIMINAR, (genero_id,))
+                    result = cursor.fetchone()
+                    conn.commit()
+                    return result is not None
+        except PoolTimeoutError:
+            raise
         except Exception as e:
-            if conn:
-                conn.rollback()
             print(f"Error deleting genero: {e}")
-            return False
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
\ No newline at end of file
+            return False
\ No newline at end of file
@@ -1,6 +1,124 @@
-from db.connection_pool import PostgreSQLConnectionPool
+from db.connection_pool import PostgreSQLConnectionPool, PoolTimeoutError, prepared_statement
 import psycopg2.extras
 
+LIBRO_TODOS = prepared_statement("libro_todos", "SELECT * FROM libro ORDER BY titulo")
+LIBRO_PAGINA = prepared_statement("libro_pagina", "SELECT * FROM libro ORDER BY titulo, id LIMIT $1")
+LIBRO_PAGINA_DESDE = prepared_statement("libro_pagina_desde", """
+SELECT * FROM libro WHERE (titulo, id) > ($1, $2)
+ORDER BY titulo, id LIMIT $3
+""")
+# Orden de get_page (columna, tipo); el cursor de la página siguiente son estos valores de la última fila
+LIBRO_ORDEN = (("titulo", str), ("id", int))
+# Búsqueda de texto sobre libro_busqueda (índice GIN), de mayor a menor relevancia
+LIBRO_BUSCAR = prepared_statement("libro_buscar", """
+SELECT l.*, ts_rank_cd(b.documento, q)::float8 AS relevancia
+FROM websearch_to_tsquery('spanish', $1) q, libro_busqueda b
+JOIN libro l ON l.id = b.libro_id
+WHERE b.documento @@ q
+ORDER BY relevancia DESC, l.id DESC LIMIT $2
+""")
+LIBRO_BUSCAR_DESDE = prepared_statement("libro_buscar_desde", """
+SELECT * FROM (
+    SELECT l.*, ts_rank_cd(b.documento, q)::float8 AS relevancia
+    FROM websearch_to_tsquery('spanish', $1) q, libro_busqueda b
+    JOIN libro l ON l.id = b.libro_id
+    WHERE b.documento @@ q
+) r
+WHERE (r.relevancia, r.id) < ($2, $3)
+ORDER BY relevancia DESC, id DESC LIMIT $4
+""")
+LIBRO_BUSQUEDA_ORDEN = (("relevancia", float), ("id", int))
+LIBRO_POR_ID = prepared_statement("libro_por_id", "SELECT * FROM libro WHERE id = $1")
+LIBRO_AUTORES = prepared_statement("libro_autores", """
+SELECT a.* FROM autor a
+JOIN libro_autor la ON a.id = la.autor_id
+WHERE la.libro_id = $1
+""")
+LIBRO_GENEROS = prepared_statement("libro_generos", """
+SELECT g.* FROM genero g
+JOIN libro_genero lg ON g.id = lg.genero_id
+WHERE lg.libro_id = $1
+""")
+# Relaciones de varios libros a la vez, para no consultar libro por libro
+LIBRO_AUTORES_DE = prepared_statement("libro_autores_de", """
+SELECT la.libro_id, a.* FROM autor a
+JOIN libro_autor la ON a.id = la.autor_id
+WHERE la.libro_id = ANY($1)
+""")
+LIBRO_GENEROS_DE = prepared_statement("libro_generos_de", """
+SELECT lg.libro_id, g.* FROM genero g
+JOIN libro_genero lg ON g.id = lg.genero_id
+WHERE lg.libro_id = ANY($1)
+""")
+# Relaciones que se pueden pedir con ?include
+LIBRO_RELACIONES = {"autores": LIBRO_AUTORES_DE, "generos": LIBRO_GENEROS_DE}
+LIBRO_POR_AUTOR = prepared_statement("libro_por_autor", """
+SELECT l.* FROM libro l
+JOIN libro_autor la ON la.libro_id = l.id
+WHERE la.autor_id = $1
+ORDER BY l.titulo
+""")
+LIBRO_POR_GENERO = prepared_statement("libro_por_genero", """
+SELECT l.* FROM libro l
+JOIN libro_genero lg ON lg.libro_id = l.id
+WHERE lg.genero_id = $1
+ORDER BY l.titulo
+""")
+LIBRO_ACTUALIZAR = prepared_statement("libro_actualizar", """
+UPDATE libro SET titulo = $1, isbn = $2, fecha_publicacion = $3, descripcion = $4,
+updated_at = CURRENT_TIMESTAMP WHERE id = $5 RETURNING *
+""")
+LIBRO_CREAR = prepared_statement("libro_crear", """
+INSERT INTO libro (titulo, isbn, fecha_publicacion, descripcion)
+VALUES ($1, $2, $3, $4) RETURNING *
+""")
+LIBRO_ELIMINAR = prepared_statement("libro_eliminar", "DELETE FROM libro WHERE id = $1 RETURNING id")
+LIBRO_AGREGAR_AUTOR = prepared_statement("libro_agregar_autor",
+    "INSERT INTO libro_autor (libro_id, autor_id) VALUES ($1, $2) ON CONFLICT DO NOTHING")
+LIBRO_QUITAR_AUTOR = prepared_statement("libro_quitar_autor",
+    "DELETE FROM libro_autor WHERE libro_id = $1 AND autor_id = $2")
+LIBRO_AGREGAR_GENERO = prepared_statement("libro_agregar_genero",
+    "INSERT INTO libro_genero (libro_id, genero_id) VALUES ($1, $2) ON CONFLICT DO NOTHING")
+LIBRO_QUITAR_GENERO = prepared_statement("libro_quitar_genero",
+    "DELETE FROM libro_genero WHERE libro_id = $1 AND genero_id = $2")
+
+# Filas por sentencia al insertar lotes con execute_values
+_BULK_PAGE = 1000
+
+def _rechazar(filas, autores, generos, isbns):
+    """
+    Separa las filas de un lote que citan autores o géneros inexistentes o
+    repiten un isbn ya usado en la base o antes en el mismo lote. Devuelve
+    (filas válidas, errores).
+    """
+    validas, errores, usados = [], [], set(isbns)
+    for fila in filas:
+        faltan_autores = [a for a in fila['autores'] if a not in autores]
+        faltan_generos = [g for g in fila['generos'] if g not in generos]
+        if faltan_autores:
+            error = f"Autores no encontrados: {faltan_autores}"
+        elif faltan_generos:
+            error = f"Géneros no encontrados: {faltan_generos}"
+        elif fila['isbn'] in usados:
+            error = f"isbn {fila['isbn']} ya existe"
+        else:
+            if fila['isbn']:
+                usados.add(fila['isbn'])
+            validas.append(fila)
+            continue
+        errores.append({"indice": fila['indice'], "error": error})
+    return validas, errores
+
+def _insertadas(filas, ids, errores):
+    # ON CONFLICT DO NOTHING omite las filas cuyo isbn otra transacción cargó mientras tanto
+    insertadas = []
+    for fila in filas:
+        if fila['id'] in ids:
+            insertadas.append(fila)
+        else:
+            errores.append({"indice": fila['indice'], "error": f"isbn {fila['isbn']} ya existe"})
+    return insertadas
+
 class Libro:
     def __init__(self, id=None, titulo=None, isbn=None, fecha_publicacion=None, descripcion=None):
         self.id = id
@@ -11,351 +129,318 @@ class Libro:
     
     @staticmethod
     def get_all():
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            
-            cursor.execute("SELECT * FROM libro ORDER BY titulo")
-            return cursor.fetchall()
+            with pool.read_connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    pool.execute(cursor, LIBRO_TODOS)
+                    return cursor.fetchall()
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error fetching libros: {e}")
+            return []
+    
+    @staticmethod
+    def get_page(limite, despues_de=None, include=()):
+        """
+        Hasta limite libros ordenados por título, a partir de despues_de
+        (los valores de LIBRO_ORDEN del último de la página anterior), con
+        las relaciones de include ya cargadas
+        """
+        try:
+            pool = PostgreSQLConnectionPool.get_instance()
+            with pool.read_connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    if despues_de is None:
+                        pool.execute(cursor, LIBRO_PAGINA, (limite,))
+                    else:
+                        pool.execute(cursor, LIBRO_PAGINA_DESDE, (*despues_de, limite))
+                    return Libro._cargar_relaciones(pool, cursor, cursor.fetchall(), include)
+        except PoolTimeoutError:
+            raise
         except Exception as e:
             print(f"Error fetching libros: {e}")
             return []
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
+    
+    @staticmethod
+    def search(q, limite, despues_de=None, include=()):
+        """
+        Hasta limite libros cuyo título, descripción, autores o géneros
+        coinciden con q, por relevancia; despues_de son los valores de
+        LIBRO_BUSQUEDA_ORDEN del último de la página anterior
+        """
+        try:
+            pool = PostgreSQLConnectionPool.get_instance()
+            with pool.read_connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    if despues_de is None:
+                        pool.execute(cursor, LIBRO_BUSCAR, (q, limite))
+                    else:
+                        pool.execute(cursor, LIBRO_BUSCAR_DESDE, (q, *despues_de, limite))
+                    return Libro._cargar_relaciones(pool, cursor, cursor.fetchall(), include)
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error searching libros: {e}")
+            return []
     
     @staticmethod
     def get_by_id(libro_id):
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            
-            cursor.execute("SELECT * FROM libro WHERE id = %s", (libro_id,))
-            libro = cursor.fetchone()
-            
-            if libro:
-                # Fetch autores
-                cursor.execute("""
-                SELECT a.* FROM autor a
-                JOIN libro_autor la ON a.id = la.autor_id
-                WHERE la.libro_id = %s
-                """, (libro_id,))
-                libro['autores'] = cursor.fetchall()
-                
-                # Fetch generos
-                cursor.execute("""
-                SELECT g.* FROM genero g
-                JOIN libro_genero lg ON g.id = lg.genero_id
-                WHERE lg.libro_id = %s
-                """, (libro_id,))
-                libro['generos'] = cursor.fetchall()
-            
-            return libro
+            with pool.read_connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    pool.execute(cursor, LIBRO_POR_ID, (libro_id,))
+                    libro = cursor.fetchone()
+
+                    if libro:
+                        # Fetch autores
+                        pool.execute(cursor, LIBRO_AUTORES, (libro_id,))
+                        libro['autores'] = cursor.fetchall()
+
+                        # Fetch generos
+                        pool.execute(cursor, LIBRO_GENEROS, (libro_id,))
+                        libro['generos'] = cursor.fetchall()
+
+                    return libro
+        except PoolTimeoutError:
+            raise
         except Exception as e:
             print(f"Error fetching libro: {e}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
     
     def save(self):
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            
-            if self.id:
-                cursor.execute("""
-                UPDATE libro SET titulo = %s, isbn = %s, fecha_publicacion = %s, descripcion = %s, 
-                updated_at = CURRENT_TIMESTAMP WHERE id = %s RETURNING *
-                """, (self.titulo, self.isbn, self.fecha_publicacion, self.descripcion, self.id))
-            else:
-                cursor.execute("""
-                INSERT INTO libro (titulo, isbn, fecha_publicacion, descripcion) 
-                VALUES (%s, %s, %s, %s) RETURNING *
-                """, (self.titulo, self.isbn, self.fecha_publicacion, self.descripcion))
-            
-            conn.commit()
-            return cursor.fetchone()
+            with pool.connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    if self.id:
+                        pool.execute(cursor, LIBRO_ACTUALIZAR, (self.titulo, self.isbn, self.fecha_publicacion, self.descripcion, self.id))
+                    else:
+                        pool.execute(cursor, LIBRO_CREAR, (self.titulo, self.isbn, self.fecha_publicacion, self.descripcion))
+
+                    conn.commit()
+                    return cursor.fetchone()
+        except PoolTimeoutError:
+            raise
         except Exception as e:
-            if conn:
-                conn.rollback()
             print(f"Error saving libro: {e}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
+    
+    @staticmethod
+    def bulk_create(filas):
+        """
+        Inserta un lote de libros ya validados, con sus autores y géneros, en
+        una sola transacción y con una sentencia por tabla cada _BULK_PAGE
+        filas. Devuelve (creados, errores) por índice de fila, o None si la
+        transacción falló.
+        """
+        try:
+            pool = PostgreSQLConnectionPool.get_instance()
+            with pool.connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    cursor.execute("SELECT id FROM autor WHERE id = ANY(%s)",
+                                   (list({a for fila in filas for a in fila['autores']}),))
+                    autores = {row['id'] for row in cursor.fetchall()}
+                    cursor.execute("SELECT id FROM genero WHERE id = ANY(%s)",
+                                   (list({g for fila in filas for g in fila['generos']}),))
+                    generos = {row['id'] for row in cursor.fetchall()}
+                    cursor.execute("SELECT isbn FROM libro WHERE isbn = ANY(%s)",
+                                   ([fila['isbn'] for fila in filas if fila['isbn']],))
+                    filas, errores = _rechazar(filas, autores, generos, {row['isbn'] for row in cursor.fetchall()})
+
+                    if filas:
+                        # Ids reservados antes de insertar para no depender del orden de RETURNING
+                        cursor.execute("SELECT nextval(pg_get_serial_sequence('libro', 'id')) AS id "
+                                       "FROM generate_series(1, %s)", (len(filas),))
+                        for fila, row in zip(filas, cursor.fetchall()):
+                            fila['id'] = row['id']
+
+                        rows = psycopg2.extras.execute_values(cursor, """
+                            INSERT INTO libro (id, titulo, isbn, fecha_publicacion, descripcion) VALUES %s
+                            ON CONFLICT (isbn) DO NOTHING RETURNING id
+                        """, [(f['id'], f['titulo'], f['isbn'], f['fecha_publicacion'], f['descripcion']) for f in filas],
+                            page_size=_BULK_PAGE, fetch=True)
+                        filas = _insertadas(filas, {row['id'] for row in rows}, errores)
+
+                        libro_autores = [(f['id'], a) for f in filas for a in f['autores']]
+                        if libro_autores:
+                            psycopg2.extras.execute_values(
+                                cursor, "INSERT INTO libro_autor (libro_id, autor_id) VALUES %s",
+                                libro_autores, page_size=_BULK_PAGE)
+                        libro_generos = [(f['id'], g) for f in filas for g in f['generos']]
+                        if libro_generos:
+                            psycopg2.extras.execute_values(
+                                cursor, "INSERT INTO libro_genero (libro_id, genero_id) VALUES %s",
+                                libro_generos, page_size=_BULK_PAGE)
+
+                    conn.commit()
+                    return [{"indice": f['indice'], "id": f['id']} for f in filas], errores
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error bulk creating libros: {e}")
+            return None
     
     @staticmethod
     def delete(libro_id):
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("DELETE FROM libro WHERE id = %s RETURNING id", (libro_id,))
-            result = cursor.fetchone()
-            conn.commit()
-            return result is not None
+            with pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    pool.execute(cursor, LIBRO_ELIMINAR, (libro_id,))
+                    result = cursor.fetchone()
+                    conn.commit()
+                    return result is not None
+        except PoolTimeoutError:
+            raise
         except Exception as e:
-            if conn:
-                conn.rollback()
             print(f"Error deleting libro: {e}")
             return False
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
     
     @staticmethod
     def add_autor(libro_id, autor_id):
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("INSERT INTO libro_autor (libro_id, autor_id) VALUES (%s, %s) ON CONFLICT DO NOTHING", 
-                          (libro_id, autor_id))
-            conn.commit()
-            return True
+            with pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    pool.execute(cursor, LIBRO_AGREGAR_AUTOR, (libro_id, autor_id))
+                    conn.commit()
+                    return True
+        except PoolTimeoutError:
+            raise
         except Exception as e:
-            if conn:
-                conn.rollback()
             print(f"Error adding autor to libro: {e}")
             return False
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
     
     @staticmethod
     def remove_autor(libro_id, autor_id):
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("DELETE FROM libro_autor WHERE libro_id = %s AND autor_id = %s", 
-                          (libro_id, autor_id))
-            conn.commit()
-            return True
+            with pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    pool.execute(cursor, LIBRO_QUITAR_AUTOR, (libro_id, autor_id))
+                    conn.commit()
+                    return True
+        except PoolTimeoutError:
+            raise
         except Exception as e:
-            if conn:
-                conn.rollback()
             print(f"Error removing autor from libro: {e}")
             return False
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
     
     @staticmethod
     def add_genero(libro_id, genero_id):
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("INSERT INTO libro_genero (libro_id, genero_id) VALUES (%s, %s) ON CONFLICT DO NOTHING", 
-                          (libro_id, genero_id))
-            conn.commit()
-            return True
+            with pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    pool.execute(cursor, LIBRO_AGREGAR_GENERO, (libro_id, genero_id))
+                    conn.commit()
+                    return True
+        except PoolTimeoutError:
+            raise
         except Exception as e:
-            if conn:
-                conn.rollback()
             print(f"Error adding genero to libro: {e}")
             return False
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
     
     @staticmethod
     def remove_genero(libro_id, genero_id):
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("DELETE FROM libro_genero WHERE libro_id = %s AND genero_id = %s", 
-                          (libro_id, genero_id))
-            conn.commit()
-            return True
+            with pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    pool.execute(cursor, LIBRO_QUITAR_GENERO, (libro_id, genero_id))
+                    conn.commit()
+                    return True
+        except PoolTimeoutError:
+            raise
         except Exception as e:
-            if conn:
-                conn.rollback()
             print(f"Error removing genero from libro: {e}")
             return False
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
 
     @staticmethod
-    def get_by_genero(genero_id):
+    def set_autores(libro_id, autor_ids):
         """
-        Obtiene todos los libros de un género específico
+        Reemplaza los autores del libro en una sola transacción
         """
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            
-            # Primero obtenemos los IDs de libros que pertenecen al género
-            cursor.execute("""
-                SELECT libro_id FROM libro_genero WHERE genero_id = %s
-            """, (genero_id,))
-            libro_ids = [row['libro_id'] for row in cursor.fetchall()]
-            
-            if not libro_ids:
-                return []
-            
-            # Construir la consulta IN de forma segura
-            placeholders = ','.join(['%s'] * len(libro_ids))
-            query = f"""
-                SELECT * FROM libro 
-                WHERE id IN ({placeholders})
-                ORDER BY titulo
-            """
-            
-            cursor.execute(query, libro_ids)
-            libros = cursor.fetchall()
-            
-            # Para cada libro, obtener sus autores y géneros
-            for libro in libros:
-                # Fetch autores
-                cursor.execute("""
-                    SELECT a.* FROM autor a
-                    JOIN libro_autor la ON a.id = la.autor_id
-                    WHERE la.libro_id = %s
-                """, (libro['id'],))
-                libro['autores'] = cursor.fetchall()
-                
-                # Fetch generos
-                cursor.execute("""
-                    SELECT g.* FROM genero g
-                    JOIN libro_genero lg ON g.id = lg.genero_id
-                    WHERE lg.libro_id = %s
-                """, (libro['id'],))
-                libro['generos'] = cursor.fetchall()
-            
-            return libros
+            with pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("DELETE FROM libro_autor WHERE libro_id = %s", (libro_id,))
+                    for autor_id in autor_ids:
+                        pool.execute(cursor, LIBRO_AGREGAR_AUTOR, (libro_id, autor_id))
+                    conn.commit()
+                    return True
+        except PoolTimeoutError:
+            raise
         except Exception as e:
-            print(f"Error getting books by genre: {e}")
-            return []
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
+            print(f"Error updating libro-autor relationships: {e}")
+            return False
 
     @staticmethod
-    def get_by_autor(autor_id):
+    def set_generos(libro_id, genero_ids):
         """
-        Obtiene todos los libros de un autor específico
+        Reemplaza los géneros del libro en una sola transacción
         """
-        pool = None
-        conn = None
-        cursor = None
-        
         try:
             pool = PostgreSQLConnectionPool.get_instance()
-            conn = pool.get_connection()
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            
-            # Primero obtenemos los IDs de libros que pertenecen al autor
-            cursor.execute("""
-                SELECT libro_id FROM libro_autor WHERE autor_id = %s
-            """, (autor_id,))
-            libro_ids = [row['libro_id'] for row in cursor.fetchall()]
-            
-            if not libro_ids:
-                return []
-            
-            # Construir la consulta IN de forma segura
-            placeholders = ','.join(['%s'] * len(libro_ids))
-            query = f"""
-                SELECT * FROM libro 
-                WHERE id IN ({placeholders})
-                ORDER BY titulo
-            """
-            
-            cursor.execute(query, libro_ids)
-            libros = cursor.fetchall()
-            
-            # Para cada libro, obtener sus autores y géneros
-            for libro in libros:
-                # Fetch autores
-                cursor.execute("""
-                    SELECT a.* FROM autor a
-                    JOIN libro_autor la ON a.id = la.autor_id
-                    WHERE la.libro_id = %s
-                """, (libro['id'],))
-                libro['autores'] = cursor.fetchall()
-                
-                # Fetch generos
-                cursor.execute("""
-                    SELECT g.* FROM genero g
-                    JOIN libro_genero lg ON g.id = lg.genero_id
-                    WHERE lg.libro_id = %s
-                """, (libro['id'],))
-                libro['generos'] = cursor.fetchall()
-            
+            with pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("DELETE FROM libro_genero WHERE libro_id = %s", (libro_id,))
+                    for genero_id in genero_ids:
+                        pool.execute(cursor, LIBRO_AGREGAR_GENERO, (libro_id, genero_id))
+                    conn.commit()
+                    return True
+        except PoolTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error updating libro-genero relationships: {e}")
+            return False
+
+    @staticmethod
+    def _cargar_relaciones(pool, cursor, libros, include=tuple(LIBRO_RELACIONES)):
+        """
+        Agrega a cada libro las relaciones de include (autores, generos) con
+        una consulta por relación, sin importar cuántos libros sean
+        """
+        if not libros:
             return libros
+        por_id = {libro['id']: libro for libro in libros}
+        ids = list(por_id)
+        for relacion in include:
+            for libro in libros:
+                libro[relacion] = []
+            pool.execute(cursor, LIBRO_RELACIONES[relacion], (ids,))
+            for row in cursor.fetchall():
+                por_id[row.pop('libro_id')][relacion].append(row)
+        return libros
+
+    @staticmethod
+    def __get_by(name, value, error):
+        try:
+            pool = PostgreSQLConnectionPool.get_instance()
+            with pool.read_connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    pool.execute(cursor, name, (value,))
+                    return Libro._cargar_relaciones(pool, cursor, cursor.fetchall())
+        except PoolTimeoutError:
+            raise
         except Exception as e:
-            print(f"Error getting books by author: {e}")
+            print(f"{error}: {e}")
             return []
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and pool:
-                pool.release_connection(conn)
\ No newline at end of file
+
+    @staticmethod
+    def get_by_genero(genero_id):
+        """
+        Obtiene todos los libros de un género específico
+        """
+        return Libro.__get_by(LIBRO_POR_GENERO, genero_id, "Error getting books by genre")
+
+    @staticmethod
+    def get_by_autor(autor_id):
+        """
+        Obtiene todos los libros de un autor específico
+        """
+        return Libro.__get_by(LIBRO_POR_AUTOR, autor_id, "Error getting books by author")
@@ -0,0 +1,129 @@
+from db.connection_pool import PostgreSQLConnectionPool
+from werkzeug.security import generate_password_hash
+import psycopg2.extras
+
+DEFAULT_CLIENT_SCOPES = "libros:leer libros:escribir autores:leer autores:escribir generos:leer generos:escribir"
+
+class OAuthClient:
+    def __init__(self, id=None, client_id=None, client_secret=None, token_lifetime=3600, activo=True, scopes=None):
+        self.id = id
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_lifetime = token_lifetime
+        self.activo = activo
+        self.scopes = scopes
+
+    @staticmethod
+    def get_all_activos():
+        pool = None
+        conn = None
+        cursor = None
+
+        try:
+            pool = PostgreSQLConnectionPool.get_instance()
+            conn = pool.get_connection()
+            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+
+            cursor.execute("""
+            SELECT client_id, secret_hash, token_lifetime, scopes FROM oauth_client WHERE activo
+            """)
+            return cursor.fetchall()
+        except Exception as e:
+            print(f"Error fetching oauth clients: {e}")
+            return []
+        finally:
+            if cursor:
+                cursor.close()
+            if conn and pool:
+                pool.release_connection(conn)
+
+    @staticmethod
+    def get_by_client_id(client_id):
+        pool = None
+        conn = None
+        cursor = None
+
+        # Sin except: un error de base no debe confundirse con un cliente inexistente
+        try:
+            pool = PostgreSQLConnectionPool.get_instance()
+            conn = pool.get_connection()
+            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+
+            cursor.execute("""
+            SELECT client_id, secret_hash, token_lifetime, scopes FROM oauth_client
+            WHERE client_id = %s AND activo
+            """, (client_id,))
+            return cursor.fetchone()
+        finally:
+            if cursor:
+                cursor.close()
+            if conn and pool:
+                pool.release_connection(conn)
+
+    def save(self):
+        """
+        Crea o actualiza el cliente por client_id. El secreto solo se guarda
+        hasheado.
+        """
+        pool = None
+        conn = None
+        cursor = None
+
+        try:
+            pool = PostgreSQLConnectionPool.get_instance()
+            conn = pool.get_connection()
+            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+
+            cursor.execute("""
+            INSERT INTO oauth_client (client_id, secret_hash, token_lifetime, activo, scopes)
+            VALUES (%s, %s, %s, %s, COALESCE(%s, %s))
+            ON CONFLICT (client_id) DO UPDATE SET secret_hash = EXCLUDED.secret_hash,
+            token_lifetime = EXCLUDED.token_lifetime, activo = EXCLUDED.activo,
+            scopes = EXCLUDED.scopes, updated_at = CURRENT_TIMESTAMP
+            RETURNING id, client_id, token_lifetime, activo, scopes
+            """, (self.client_id, generate_password_hash(self.client_secret),
+                  self.token_lifetime, self.activo, self.scopes, DEFAULT_CLIENT_SCOPES))
+
+            conn.commit()
+            return cursor.fetchone()
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            print(f"Error saving oauth client: {e}")
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+            if conn and pool:
+                pool.release_connection(conn)
+
+    @staticmethod
+    def ensure(client_id, client_secret, token_lifetime=3600, scopes=DEFAULT_CLIENT_SCOPES):
+        """
+        Registra el cliente solo si todavía no existe
+        """
+        pool = None
+        conn = None
+        cursor = None
+
+        try:
+            pool = PostgreSQLConnectionPool.get_instance()
+            conn = pool.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("""
+            INSERT INTO oauth_client (client_id, secret_hash, token_lifetime, scopes)
+            VALUES (%s, %s, %s, %s) ON CONFLICT (client_id) DO NOTHING
+            """, (client_id, generate_password_hash(client_secret), token_lifetime, scopes))
+            conn.commit()
+            return True
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            print(f"Error registering oauth client: {e}")
+            return False
+        finally:
+            if cursor:
+                cursor.close()
+            if conn and pool:
+                pool.release_connection(conn)
@@ -0,0 +1,139 @@
+from db.connection_pool import PostgreSQLConnectionPool
+import hashlib
+import secrets
+import uuid
+from config import Config
+
+REFRESH_TOKEN_LIFETIME = Config.REFRESH_TOKEN_LIFETIME
+
+def _hash(token):
+    return hashlib.sha256(token.encode('utf-8')).digest()
+
+class RefreshToken:
+    # Resultados de rotar()
+    OK = "ok"
+    INVALIDO = "invalido"
+    REUTILIZADO = "reutilizado"
+
+    @staticmethod
+    def _insert(cursor, client_id, familia, scope):
+        token = secrets.token_urlsafe(32)
+        cursor.execute("""
+        INSERT INTO refresh_token (token_hash, client_id, familia, scope, expira_en)
+        VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP + %s * INTERVAL '1 second')
+        """, (_hash(token), client_id, familia, scope, REFRESH_TOKEN_LIFETIME))
+        return token
+
+    @staticmethod
+    def crear(client_id, scope=None):
+        """
+        Emite un refresh token que inicia una familia de rotación nueva
+        """
+        pool = None
+        conn = None
+        cursor = None
+
+        try:
+            pool = PostgreSQLConnectionPool.get_instance()
+            conn = pool.get_connection()
+            cursor = conn.cursor()
+
+            token = RefreshToken._insert(cursor, client_id, str(uuid.uuid4()), scope)
+            conn.commit()
+            return token
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            print(f"Error creating refresh token: {e}")
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+            if conn and pool:
+                pool.release_connection(conn)
+
+    @staticmethod
+    def rotar(token, client_id):
+        """
+        Consume el refresh token de client_id y emite el siguiente de la
+        misma familia. Devuelve (resultado, scope, nuevo_token). Un token de
+        otro cliente es inválido y no se toca; si ya había sido usado se
+        asume robado y se elimina toda la familia.
+        """
+        pool = None
+        conn = None
+        cursor = None
+
+        try:
+            pool = PostgreSQLConnectionPool.get_instance()
+            conn = pool.get_connection()
+            cursor = conn.cursor()
+
+            token_hash = _hash(token)
+            cursor.execute("""
+            UPDATE refresh_token SET usado = TRUE
+            WHERE token_hash = %s AND client_id = %s AND NOT usado AND expira_en > CURRENT_TIMESTAMP
+            RETURNING familia, scope
+            """, (token_hash, client_id))
+            row = cursor.fetchone()
+
+            if row:
+                familia, scope = row
+                nuevo = RefreshToken._insert(cursor, client_id, familia, scope)
+                conn.commit()
+                return RefreshToken.OK, scope, nuevo
+
+            cursor.execute("SELECT usado, familia FROM refresh_token WHERE token_hash = %s AND client_id = %s",
+                           (token_hash, client_id))
+            row = cursor.fetchone()
+            if row and row[0]:
+                # Reuse detection: a rotated token came back
+                cursor.execute("DELETE FROM refresh_token WHERE familia = %s", (row[1],))
+                conn.commit()
+                return RefreshToken.REUTILIZADO, None, None
+
+            conn.commit()
+            return RefreshToken.INVALIDO, None, None
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            print(f"Error rotating refresh token: {e}")
+            return RefreshToken.INVALIDO, None, None
+        finally:
+            if cursor:
+                cursor.close()
+            if conn and pool:
+                pool.release_connection(conn)
+
+    @staticmethod
+    def purge_expired(batch_size=1000):
+        """
+        Elimina hasta batch_size filas expiradas y devuelve cuántas borró
+        """
+        pool = None
+        conn = None
+        cursor = None
+
+        try:
+            pool = PostgreSQLConnectionPool.get_instance()
+            conn = pool.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("""
+            DELETE FROM refresh_token WHERE id IN (
+                SELECT id FROM refresh_token WHERE expira_en < CURRENT_TIMESTAMP LIMIT %s
+            )
+            """, (batch_size,))
+            deleted = cursor.rowcount
+            conn.commit()
+            return deleted
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            print(f"Error purging refresh tokens: {e}")
+            return 0
+        finally:
+            if cursor:
+                cursor.close()
+            if conn and pool:
+                pool.release_connection(conn)
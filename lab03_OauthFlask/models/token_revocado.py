@@ -0,0 +1,88 @@
+from db.connection_pool import PostgreSQLConnectionPool
+import psycopg2.extras
+
+class TokenRevocado:
+    @staticmethod
+    def revocar(jti, expira_en=None):
+        pool = None
+        conn = None
+        cursor = None
+
+        try:
+            pool = PostgreSQLConnectionPool.get_instance()
+            conn = pool.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("""
+            INSERT INTO token_revocado (jti, expira_en) VALUES (%s, %s)
+            ON CONFLICT (jti) DO NOTHING
+            """, (jti, expira_en))
+            conn.commit()
+            return True
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            print(f"Error revoking token: {e}")
+            return False
+        finally:
+            if cursor:
+                cursor.close()
+            if conn and pool:
+                pool.release_connection(conn)
+
+    @staticmethod
+    def esta_revocado(jti):
+        """
+        Búsqueda exacta por jti. Ante un error se asume revocado para no
+        aceptar un token que podría no ser válido.
+        """
+        pool = None
+        conn = None
+        cursor = None
+
+        try:
+            pool = PostgreSQLConnectionPool.get_instance()
+            conn = pool.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT 1 FROM token_revocado WHERE jti = %s", (jti,))
+            return cursor.fetchone() is not None
+        except Exception as e:
+            print(f"Error checking revoked token: {e}")
+            return True
+        finally:
+            if cursor:
+                cursor.close()
+            if conn and pool:
+                pool.release_connection(conn)
+
+    @staticmethod
+    def get_desde(ultimo_id, limite=10000):
+        """
+        Devuelve los jti revocados y todavía vigentes con id mayor a
+        ultimo_id, en orden, para refrescar o rearmar el filtro. None si
+        la consulta falló.
+        """
+        pool = None
+        conn = None
+        cursor = None
+
+        try:
+            pool = PostgreSQLConnectionPool.get_instance()
+            conn = pool.get_connection()
+            cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+
+            cursor.execute("""
+            SELECT id, jti FROM token_revocado
+            WHERE id > %s AND (expira_en IS NULL OR expira_en > CURRENT_TIMESTAMP)
+            ORDER BY id LIMIT %s
+            """, (ultimo_id, limite))
+            return cursor.fetchall()
+        except Exception as e:
+            print(f"Error fetching revoked tokens: {e}")
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+            if conn and pool:
+                pool.release_connection(conn)
@@ -1,10 +1,13 @@
 from app import create_app
-from db.schema import create_tables
+from config import Config
+from services import init_services
 
 if __name__ == "__main__":
-    # Create database tables if they don't exist
-    create_tables()
+    # Warm-up: base y servicios listos antes de aceptar solicitudes. Si la base
+    # no está disponible la app arranca igual y reintenta en la primera solicitud
+    if Config.WARM_UP:
+        init_services()
     
     # Create and run the Flask app
     app = create_app()
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
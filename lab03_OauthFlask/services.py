@@ -0,0 +1,53 @@
+import threading
+import time
+from config import Config
+from db.migrations import migrate
+from db.schema import MIGRATIONS
+from db.sweeper import ExpiredTokenSweeper
+from models.oauth_client import OAuthClient
+from middlewares.client_registry import ClientRegistry
+
+_ready = threading.Event()
+_lock = threading.Lock()
+# Momento (monotonic) del último intento fallido
+_failed_at = None
+
+def services_ready():
+    return _ready.is_set()
+
+def init_services(config=Config):
+    """
+    Migra la base, registra el cliente por defecto, carga el índice de
+    clientes y arranca el sweeper, una sola vez por proceso. Devuelve False
+    sin esperar si otro hilo ya lo está intentando o si el último intento
+    falló hace menos de INIT_RETRY_SECONDS; así, con la base caída, cada
+    solicitud responde 503 enseguida en lugar de hacer cola detrás de los
+    DB_CONNECT_TIMEOUT de las anteriores.
+    """
+    global _failed_at
+    if _ready.is_set():
+        return True
+    if _failed_at is not None and time.monotonic() - _failed_at < config.INIT_RETRY_SECONDS:
+        return False
+    if not _lock.acquire(blocking=False):
+        return False
+    try:
+        if _ready.is_set():
+            return True
+        try:
+            migrate(MIGRATIONS)
+        except Exception as e:
+            print(f"Error creating tables: {e}")
+            _failed_at = time.monotonic()
+            return False
+        if not OAuthClient.ensure(config.CLIENT_ID, config.CLIENT_SECRET):
+            _failed_at = time.monotonic()
+            return False
+        ClientRegistry.get_instance()
+        # Purge expired refresh tokens in the background
+        ExpiredTokenSweeper.get_instance().start()
+        _failed_at = None
+        _ready.set()
+        return True
+    finally:
+        _lock.release()
@@ -1,4 +1,5 @@
 const API_BASE_URL = "http://localhost:5000/api"
+const PAGE_SIZE = 200
 
 export interface Autor {
   id?: number
@@ -40,12 +41,25 @@ class ApiService {
     return response.json()
   }
 
+  // Los listados vienen paginados: cada página trae el cursor de la siguiente en X-Siguiente-Cursor
+  private async getAllPages<T>(path: string, token: string, query: Record<string, string> = {}): Promise<T[]> {
+    const items: T[] = []
+    let cursor: string | null = null
+    do {
+      const params = new URLSearchParams({ ...query, limite: String(PAGE_SIZE) })
+      if (cursor) params.set("despues_de", cursor)
+      const response = await fetch(`${API_BASE_URL}${path}?${params}`, {
+        headers: this.getHeaders(token),
+      })
+      items.push(...(await this.handleResponse(response)))
+      cursor = response.headers.get("X-Siguiente-Cursor")
+    } while (cursor)
+    return items
+  }
+
   // Autores
   async getAutores(token: string): Promise<Autor[]> {
-    const response = await fetch(`${API_BASE_URL}/autores/`, {
-      headers: this.getHeaders(token),
-    })
-    return this.handleResponse(response)
+    return this.getAllPages<Autor>("/autores/", token)
   }
 
   async getAutor(token: string, id: number): Promise<Autor> {
@@ -83,10 +97,7 @@ class ApiService {
 
   // Géneros
   async getGeneros(token: string): Promise<Genero[]> {
-    const response = await fetch(`${API_BASE_URL}/generos/`, {
-      headers: this.getHeaders(token),
-    })
-    return this.handleResponse(response)
+    return this.getAllPages<Genero>("/generos/", token)
   }
 
   async getGenero(token: string, id: number): Promise<Genero> {
@@ -124,10 +135,8 @@ class ApiService {
 
   // Libros
   async getLibros(token: string): Promise<Libro[]> {
-    const response = await fetch(`${API_BASE_URL}/libros/`, {
-      headers: this.getHeaders(token),
-    })
-    return this.handleResponse(response)
+    // Autores y géneros vienen en la misma respuesta, sin pedir cada libro aparte
+    return this.getAllPages<Libro>("/libros/", token, { include: "autores,generos" })
   }
 
   async getLibro(token: string, id: number): Promise<Libro> {